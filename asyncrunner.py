@@ -0,0 +1,148 @@
+# asyncrunner.py
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from parser import Parser
+from optimizer import Optimizer
+from resolver import Resolver
+from typechecker import TypeChecker
+from memo import Memoizer
+from compiler import Compiler
+from vm import VM, DEFAULT_SLICE_STEPS
+from console import AsyncConsole
+from batch import collect_programs, write_output
+
+def prepare(code, optimize=False, memo_size=1024):
+    # Programa compilado para a VM (as fases de análise são síncronas)
+    ast = Parser.run(code)
+    if optimize:
+        ast, _ = Optimizer.run(ast)
+    global_scope = Resolver.run(ast)
+    TypeChecker.run(ast)
+    if memo_size > 0:
+        Memoizer.run(ast, memo_size)
+    return Compiler.run(ast, global_scope)
+
+async def run_script(code, reader, writer, slice_steps=DEFAULT_SLICE_STEPS, optimize=False):
+    # Executa um programa no laço de eventos atual, com LEIA e IMPRIME nos
+    # fluxos recebidos. Vários programas podem rodar ao mesmo tempo: cada um
+    # tem sua VM e seu console, e cede a vez a cada slice_steps passos.
+    # Erros do programa sobem como exceções.
+    console = AsyncConsole(reader, writer)
+    try:
+        await VM(prepare(code, optimize)).run_async(console, slice_steps)
+    finally:
+        await console.flush()
+
+class MemoryWriter:
+    # Destino de saída em memória com a interface de asyncio.StreamWriter
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    async def drain(self):
+        pass
+
+    def getvalue(self):
+        return b''.join(self.chunks).decode('utf-8')
+
+async def run_program(path, options):
+    # Entrada de LEIA vem de <programa>.in, se existir (senão, vazia)
+    reader = asyncio.StreamReader()
+    input_path = os.path.splitext(path)[0] + '.in'
+    if os.path.isfile(input_path):
+        with open(input_path, 'rb') as input_file:
+            reader.feed_data(input_file.read())
+    reader.feed_eof()
+    writer = MemoryWriter()
+
+    status = 'ok'
+    error = None
+    start = time.perf_counter()
+    try:
+        with open(path, 'rb') as program:
+            code = program.read()
+        script = run_script(code, reader, writer, options.passos, options.otimizar)
+        if options.tempo_limite > 0:
+            await asyncio.wait_for(script, options.tempo_limite)
+        else:
+            await script
+    except asyncio.TimeoutError:
+        status = 'tempo'
+        error = f"Tempo limite de {options.tempo_limite:g}s excedido"
+    except FileNotFoundError:
+        status = 'erro'
+        error = "Arquivo não encontrado"
+    except Exception as e:
+        status = 'erro'
+        error = str(e)
+    return {
+        'path': path,
+        'status': status,
+        'error': error,
+        'output': writer.getvalue(),
+        'seconds': time.perf_counter() - start,
+    }
+
+async def run_all(programs, options, base):
+    # Todos os programas no mesmo laço de eventos; o relatório sai na ordem de término
+    counts = {'ok': 0, 'erro': 0, 'tempo': 0}
+    for finished in asyncio.as_completed([run_program(path, options) for path in programs]):
+        result = await finished
+        counts[result['status']] += 1
+        line = f"{result['status']:5} {result['seconds']:8.3f}s  {result['path']}"
+        if result['error'] is not None:
+            line += f"  ({result['error']})"
+        print(line)
+        if options.saida:
+            write_output(result, options.saida, base)
+    return counts
+
+def parse_args(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog='asyncrunner.py',
+        usage="python asyncrunner.py [opções] <diretório ou manifesto>",
+        description='Executa vários programas ao mesmo tempo em um único laço de eventos (VM assíncrona).')
+    arg_parser.add_argument('target', help='diretório com programas ou manifesto (um caminho por linha)')
+    arg_parser.add_argument('--passos', type=int, default=DEFAULT_SLICE_STEPS, metavar='N',
+                            help='voltas de laço e chamadas entre pausas de cada programa')
+    arg_parser.add_argument('--tempo-limite', type=float, default=10.0, metavar='S',
+                            help='segundos por programa (0 desliga)')
+    arg_parser.add_argument('--saida', metavar='DIR',
+                            help='grava a saída de cada programa em DIR/<caminho>.out '
+                                 '(relativo ao diretório comum dos programas)')
+    arg_parser.add_argument('-O', '--otimizar', action='store_true', help='otimiza a AST')
+    return arg_parser.parse_args(argv)
+
+def main_async():
+    options = parse_args(sys.argv[1:])
+    if options.passos < 1:
+        sys.stderr.write("Erro: número de passos deve ser positivo\n")
+        return 1
+    try:
+        programs = collect_programs(options.target)
+    except OSError as e:
+        sys.stderr.write(f"Erro: {e}\n")
+        return 1
+    base = None
+    if options.saida:
+        os.makedirs(options.saida, exist_ok=True)
+        if programs:
+            base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in programs])
+
+    start = time.perf_counter()
+    counts = asyncio.run(run_all(programs, options, base))
+    elapsed = time.perf_counter() - start
+
+    total = len(programs)
+    print(f"{total} programas em {elapsed:.3f}s (um laço de eventos, {options.passos} passos por fatia): "
+          f"{counts['ok']} ok, {counts['erro']} com erro, {counts['tempo']} por tempo limite")
+    return 0 if counts['ok'] == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main_async())
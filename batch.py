@@ -0,0 +1,194 @@
+# batch.py
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import argparse
+import io
+import os
+import signal
+import sys
+import time
+
+import main
+
+# Extensões aceitas quando a entrada é um diretório
+PROGRAM_EXTENSIONS = ('.txt', '.lc')
+
+class ProgramTimeout(BaseException):
+    # BaseException: não pode ser engolida por um 'except Exception' do interpretador
+    pass
+
+def on_alarm(signum, frame):
+    raise ProgramTimeout()
+
+def collect_programs(target):
+    # Diretório: todos os programas dele (ordem alfabética).
+    # Manifesto: um caminho por linha, relativo ao manifesto; '#' comenta.
+    if os.path.isdir(target):
+        return [os.path.join(target, name) for name in sorted(os.listdir(target))
+                if name.endswith(PROGRAM_EXTENSIONS) and os.path.isfile(os.path.join(target, name))]
+    base = os.path.dirname(os.path.abspath(target))
+    programs = []
+    with open(target, encoding='utf-8') as manifest:
+        for line in manifest:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                programs.append(os.path.join(base, line))
+    return programs
+
+def run_program(path, flags, timeout):
+    # Executado no processo trabalhador: a saída do programa é capturada e
+    # a entrada de LEIA vem de <programa>.in, se existir (senão, vazia)
+    input_path = os.path.splitext(path)[0] + '.in'
+    stdin = io.StringIO()
+    if os.path.isfile(input_path):
+        with open(input_path, encoding='utf-8') as input_file:
+            stdin = io.StringIO(input_file.read())
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    saved = sys.stdin, sys.stdout, sys.stderr
+    sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+
+    status = 'ok'
+    error = None
+    use_alarm = timeout > 0 and hasattr(signal, 'setitimer')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
+    try:
+        main.run(main.parse_args(flags + [path]))
+    except ProgramTimeout:
+        status = 'tempo'
+        error = f"Tempo limite de {timeout:g}s excedido"
+    except FileNotFoundError:
+        status = 'erro'
+        error = "Arquivo não encontrado"
+    except RecursionError:
+        status = 'erro'
+        error = "Recursão profunda demais"
+    except Exception as e:
+        status = 'erro'
+        error = str(e)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        elapsed = time.perf_counter() - start
+        sys.stdin, sys.stdout, sys.stderr = saved
+
+    return {
+        'path': path,
+        'status': status,
+        'error': error,
+        'output': stdout.getvalue(),
+        'stderr': stderr.getvalue(),
+        'seconds': elapsed,
+    }
+
+def run_isolated(path, flags, timeout):
+    # Roda um programa sozinho em um processo novo: se o processo morrer,
+    # o programa é o culpado
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(run_program, path, flags, timeout).result()
+        except BrokenProcessPool:
+            return {'path': path, 'status': 'erro', 'error': "Processo trabalhador terminou",
+                    'output': '', 'stderr': '', 'seconds': 0.0}
+
+def output_path(path, directory, base):
+    # DIR/<caminho relativo a base, sem extensão>.out: programas de mesmo
+    # nome em diretórios diferentes (manifesto) não se sobrescrevem
+    relative = os.path.relpath(os.path.abspath(path), base)
+    return os.path.join(directory, os.path.splitext(relative)[0] + '.out')
+
+def write_output(result, directory, base):
+    path = output_path(result['path'], directory, base)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as output:
+        output.write(result['output'])
+        if result['error'] is not None:
+            output.write(f"Erro: {result['error']}\n")
+
+def parse_args(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog='batch.py',
+        usage="python batch.py [opções] <diretório ou manifesto>")
+    arg_parser.add_argument('target', help='diretório com programas ou manifesto (um caminho por linha)')
+    arg_parser.add_argument('-j', '--processos', type=int, default=os.cpu_count() or 1, metavar='N',
+                            help='processos trabalhadores (padrão: número de CPUs)')
+    arg_parser.add_argument('--tempo-limite', type=float, default=10.0, metavar='S',
+                            help='segundos por programa (0 desliga)')
+    arg_parser.add_argument('--saida', metavar='DIR',
+                            help='grava a saída de cada programa em DIR/<caminho>.out '
+                                 '(relativo ao diretório comum dos programas)')
+    arg_parser.add_argument('--vm', action='store_true', help='executa na máquina virtual')
+    arg_parser.add_argument('-O', '--otimizar', action='store_true', help='otimiza a AST')
+    arg_parser.add_argument('--jit', action='store_true', help='compila para Python os trechos mais executados')
+    arg_parser.add_argument('--sem-cache', action='store_true', help='não usa o cache de AST')
+    return arg_parser.parse_args(argv)
+
+def main_batch():
+    options = parse_args(sys.argv[1:])
+    if options.processos < 1:
+        sys.stderr.write("Erro: número de processos deve ser positivo\n")
+        return 1
+    try:
+        programs = collect_programs(options.target)
+    except OSError as e:
+        sys.stderr.write(f"Erro: {e}\n")
+        return 1
+
+    flags = []
+    if options.vm:
+        flags.append('--vm')
+    if options.otimizar:
+        flags.append('-O')
+    if options.jit:
+        flags.append('--jit')
+    if options.sem_cache:
+        flags.append('--sem-cache')
+    base = None
+    if options.saida:
+        os.makedirs(options.saida, exist_ok=True)
+        if programs:
+            base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in programs])
+
+    counts = {'ok': 0, 'erro': 0, 'tempo': 0}
+
+    def report(result):
+        counts[result['status']] += 1
+        line = f"{result['status']:5} {result['seconds']:8.3f}s  {result['path']}"
+        if result['error'] is not None:
+            line += f"  ({result['error']})"
+        print(line)
+        if options.saida:
+            write_output(result, options.saida, base)
+
+    start = time.perf_counter()
+    pending = programs
+    while pending:
+        with ProcessPoolExecutor(max_workers=options.processos) as pool:
+            futures = [pool.submit(run_program, path, flags, options.tempo_limite) for path in pending]
+            for index, future in enumerate(futures):
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    # Um processo morreu (falha do Python, falta de memória) e levou
+                    # o pool junto. O primeiro programa sem resultado roda sozinho,
+                    # para falhar só se for ele o culpado; os seguintes vão para
+                    # um pool novo.
+                    report(run_isolated(pending[index], flags, options.tempo_limite))
+                    pending = pending[index + 1:]
+                    break
+                report(result)
+            else:
+                pending = []
+    elapsed = time.perf_counter() - start
+
+    total = len(programs)
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"{total} programas em {elapsed:.3f}s ({rate:.1f} programas/s, {options.processos} processos): "
+          f"{counts['ok']} ok, {counts['erro']} com erro, {counts['tempo']} por tempo limite")
+    return 0 if counts['ok'] == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main_batch())
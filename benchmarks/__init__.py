@@ -0,0 +1,3 @@
+# benchmarks/__init__.py
+# Cargas de trabalho e medição por fase do interpretador.
+# Uso (na raiz do repositório): python -m benchmarks --help
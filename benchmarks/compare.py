@@ -0,0 +1,45 @@
+# benchmarks/compare.py
+import json
+import sys
+
+from benchmarks.runner import PHASES
+
+# Variações da mediana abaixo deste limite são tratadas como ruído
+DEFAULT_THRESHOLD = 0.05
+
+def load(path):
+    with open(path, encoding='utf-8') as report:
+        return json.load(report)
+
+def compare(base, new, threshold=DEFAULT_THRESHOLD):
+    # Razão novo/base da mediana de cada fase, por carga presente nos dois
+    lines = [f"base: {base['meta'].get('revisao')}  novo: {new['meta'].get('revisao')}",
+             f"{'carga':<22}{'fase':<12}{'base':>12}{'novo':>12}{'razão':>9}"]
+    for name, result in new['cargas'].items():
+        if name not in base['cargas']:
+            continue
+        for phase in PHASES + ('total',):
+            before = base['cargas'][name]['fases'][phase]['mediana']
+            after = result['fases'][phase]['mediana']
+            ratio = after / before if before > 0 else float('inf')
+            if ratio > 1 + threshold:
+                verdict = 'mais lento'
+            elif ratio < 1 - threshold:
+                verdict = 'mais rápido'
+            else:
+                verdict = ''
+            lines.append(f"{name:<22}{phase:<12}{before * 1000:>10.2f}ms{after * 1000:>10.2f}ms"
+                         f"{ratio:>8.2f}x  {verdict}")
+    return '\n'.join(lines)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) not in (2, 3):
+        sys.stderr.write("Uso: python -m benchmarks.compare base.json novo.json [limite]\n")
+        return 1
+    threshold = float(argv[2]) if len(argv) == 3 else DEFAULT_THRESHOLD
+    print(compare(load(argv[0]), load(argv[1]), threshold))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
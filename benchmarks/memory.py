@@ -0,0 +1,93 @@
+# benchmarks/memory.py
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from parser import Parser
+from node import FuncDecNode, walk
+from benchmarks.workloads import WORKLOADS
+
+def count_nodes(ast):
+    # Todos os nós, inclusive os corpos de função (que walk não visita)
+    count = 0
+    pending = [ast]
+    while pending:
+        for current in walk(pending.pop()):
+            count += 1
+            if isinstance(current, FuncDecNode):
+                pending.append(current.block)
+    return count
+
+def measure(source, repetitions):
+    code = source.encode('utf-8')  # o main.py entrega bytes (mmap) ao Parser
+    times = []
+    for _ in range(repetitions):
+        gc.collect()
+        start = time.perf_counter()
+        ast = Parser.run(code)
+        times.append(time.perf_counter() - start)
+        del ast
+
+    # Memória que continua alocada depois da análise: só a AST (os tokens
+    # são liberados com o Parser)
+    gc.collect()
+    tracemalloc.start()
+    ast = Parser.run(code)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nodes = count_nodes(ast)
+    build = statistics.median(times)
+    return {
+        'bytes': len(code),
+        'nos': nodes,
+        'construcao_s': build,
+        'us_por_no': build / nodes * 1_000_000,
+        'memoria_bytes': retained,
+        'pico_bytes': peak,
+        'bytes_por_no': retained / nodes,
+    }
+
+def parse_args(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.memory',
+        description='Memória por nó e tempo de construção da AST para programas gerados grandes.')
+    arg_parser.add_argument('--comandos', default='20000,100000,300000', metavar='LISTA',
+                            help='tamanhos (comandos) de fonte_grande, separados por vírgula')
+    arg_parser.add_argument('-n', '--repeticoes', type=int, default=3, metavar='N',
+                            help='construções medidas por tamanho')
+    arg_parser.add_argument('--saida', metavar='ARQUIVO', help='grava os resultados em JSON')
+    return arg_parser.parse_args(argv)
+
+def main(argv=None):
+    options = parse_args(sys.argv[1:] if argv is None else argv)
+    try:
+        sizes = [int(size) for size in options.comandos.split(',') if size.strip()]
+    except ValueError:
+        sys.stderr.write("Erro: tamanhos devem ser inteiros\n")
+        return 1
+    if options.repeticoes < 1 or not sizes or min(sizes) < 1:
+        sys.stderr.write("Erro: tamanhos e número de repetições devem ser positivos\n")
+        return 1
+
+    results = {}
+    for size in sizes:
+        source, _ = WORKLOADS['fonte_grande'](size)
+        results[size] = measure(source, options.repeticoes)
+        sys.stderr.write(f"  {size} comandos: {results[size]['construcao_s'] * 1000:.1f}ms\n")
+
+    print(f"{'comandos':>10}{'nós':>10}{'construção':>13}{'µs/nó':>8}{'AST':>10}{'bytes/nó':>10}")
+    for size, result in results.items():
+        print(f"{size:>10}{result['nos']:>10}{result['construcao_s'] * 1000:>11.1f}ms{result['us_por_no']:>8.2f}"
+              f"{result['memoria_bytes'] / (1024 * 1024):>8.1f}MB{result['bytes_por_no']:>10.1f}")
+    if options.saida:
+        with open(options.saida, 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
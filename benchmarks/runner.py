@@ -0,0 +1,183 @@
+# benchmarks/runner.py
+import argparse
+import datetime
+import gc
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from prepro import PrePro
+from parser import Parser
+from optimizer import Optimizer
+from resolver import Resolver
+from typechecker import TypeChecker
+from memo import Memoizer
+from jit import Jit
+from compiler import Compiler
+from vm import VM
+from symboltable import Frame
+from console import Console, DEFAULT_BUFFER_SIZE
+from benchmarks.workloads import WORKLOADS
+
+# Fases do caminho do main.py, somadas no 'total'
+PHASES = ('tokenizer', 'parser', 'analise', 'execucao')
+# Medidas só para comparação, fora do 'total': o PrePro não faz mais parte
+# do caminho do main.py (o Tokenizer já descarta comentários)
+SEPARATE_PHASES = ('prepro',)
+
+def run_once(source, stdin_text, options):
+    # Uma execução completa; devolve o tempo (segundos) de cada fase
+    timings = {}
+    clock = time.perf_counter
+
+    start = clock()
+    PrePro.filter(source)
+    timings['prepro'] = clock() - start
+
+    code = source.encode('utf-8')  # o main.py entrega bytes (mmap) ao Tokenizer
+    start = clock()
+    parser = Parser(code)
+    timings['tokenizer'] = clock() - start
+
+    start = clock()
+    ast = parser.parse()
+    timings['parser'] = clock() - start
+
+    start = clock()
+    if options.otimizar:
+        ast, _ = Optimizer.run(ast)
+    global_scope = Resolver.run(ast)
+    TypeChecker.run(ast)
+    if options.memo_tamanho > 0:
+        Memoizer.run(ast, options.memo_tamanho)
+    if options.vm:
+        program = Compiler.run(ast, global_scope)
+    elif options.jit:
+        Jit().install(ast)
+    timings['analise'] = clock() - start
+
+    previous_console = Console.current
+    Console.current = Console(io.StringIO(stdin_text), io.StringIO(), DEFAULT_BUFFER_SIZE)
+    try:
+        start = clock()
+        if options.vm:
+            VM(program).run()
+        else:
+            ast.evaluate(Frame(global_scope.size))
+        Console.current.flush()
+        timings['execucao'] = clock() - start
+    finally:
+        Console.current = previous_console
+    return timings
+
+def summarize(samples):
+    return {
+        'min': min(samples),
+        'mediana': statistics.median(samples),
+        'media': statistics.fmean(samples),
+        'desvio': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'amostras': samples,
+    }
+
+def benchmark(name, options):
+    source, stdin_text = WORKLOADS[name]()
+    for _ in range(options.aquecimento):
+        run_once(source, stdin_text, options)
+    samples = {phase: [] for phase in PHASES + SEPARATE_PHASES}
+    samples['total'] = []
+    for _ in range(options.repeticoes):
+        gc.collect()
+        timings = run_once(source, stdin_text, options)
+        for phase in PHASES + SEPARATE_PHASES:
+            samples[phase].append(timings[phase])
+        samples['total'].append(sum(timings[phase] for phase in PHASES))
+    return {
+        'bytes': len(source.encode('utf-8')),
+        'fases': {phase: summarize(values) for phase, values in samples.items()},
+    }
+
+def revision():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+def format_table(results):
+    # As colunas depois do 'total' não entram na soma
+    columns = PHASES + ('total',) + SEPARATE_PHASES
+    header = f"{'carga':<22}" + ''.join(f"{phase:>12}" for phase in columns)
+    lines = [header, '-' * len(header)]
+    for name, result in results.items():
+        phases = result['fases']
+        lines.append(f"{name:<22}" + ''.join(f"{phases[phase]['mediana'] * 1000:>10.2f}ms"
+                                             for phase in columns))
+    return '\n'.join(lines)
+
+def parse_args(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Mede o tempo de cada fase do interpretador (mediana em ms).')
+    arg_parser.add_argument('--cargas', default=','.join(WORKLOADS), metavar='LISTA',
+                            help=f"cargas separadas por vírgula ({', '.join(WORKLOADS)})")
+    arg_parser.add_argument('-n', '--repeticoes', type=int, default=5, metavar='N',
+                            help='execuções medidas por carga')
+    arg_parser.add_argument('--aquecimento', type=int, default=1, metavar='N',
+                            help='execuções descartadas antes da medição')
+    arg_parser.add_argument('--vm', action='store_true', help='executa na máquina virtual')
+    arg_parser.add_argument('-O', '--otimizar', action='store_true', help='otimiza a AST')
+    arg_parser.add_argument('--jit', action='store_true', help='compila para Python os trechos mais executados')
+    arg_parser.add_argument('--memo-tamanho', type=int, default=1024, metavar='N',
+                            help='entradas do cache LRU de cada função pura (0 desliga a memoização)')
+    arg_parser.add_argument('--saida', metavar='ARQUIVO', help='grava os resultados em JSON')
+    arg_parser.add_argument('--comparar', metavar='ARQUIVO',
+                            help='compara com um JSON gravado antes (ex.: outra revisão)')
+    return arg_parser.parse_args(argv)
+
+def main(argv=None):
+    options = parse_args(sys.argv[1:] if argv is None else argv)
+    names = [name.strip() for name in options.cargas.split(',') if name.strip()]
+    for name in names:
+        if name not in WORKLOADS:
+            sys.stderr.write(f"Erro: carga desconhecida: {name}\n")
+            return 1
+    if options.repeticoes < 1:
+        sys.stderr.write("Erro: número de repetições deve ser positivo\n")
+        return 1
+
+    # O evaluate e as análises são recursivos: expressões profundas precisam de pilha
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+    results = {}
+    for name in names:
+        results[name] = benchmark(name, options)
+        sys.stderr.write(f"  {name}: {results[name]['fases']['total']['mediana'] * 1000:.2f}ms\n")
+
+    report = {
+        'meta': {
+            'revisao': revision(),
+            'data': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'repeticoes': options.repeticoes,
+            'vm': options.vm,
+            'otimizar': options.otimizar,
+            'memo_tamanho': options.memo_tamanho,
+            'jit': options.jit,
+        },
+        'cargas': results,
+    }
+    print(format_table(results))
+    if options.saida:
+        with open(options.saida, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+    if options.comparar:
+        from benchmarks.compare import load, compare
+        print()
+        print(compare(load(options.comparar), report))
+    return 0
@@ -0,0 +1,131 @@
+# benchmarks/server.py
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from protocol import send_message, receive_message
+from benchmarks.workloads import WORKLOADS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_processes(commands, stdin_text):
+    # Um processo por requisição, em sequência; devolve requisições/s
+    start = time.perf_counter()
+    for command in commands:
+        result = subprocess.run(command, input=stdin_text, capture_output=True, text=True, cwd=ROOT)
+        if result.returncode != 0 or 'Erro' in result.stderr:
+            raise Exception(f"Falha ao executar {' '.join(command)}: {result.stderr.strip()}")
+    return len(commands) / (time.perf_counter() - start)
+
+def run_connections(socket_path, request, total, clients):
+    # clients conexões simultâneas (uma por thread), cada uma com várias
+    # requisições; mede só o servidor, sem iniciar processos
+    per_client = [total // clients + (1 if index < total % clients else 0) for index in range(clients)]
+    failures = []
+
+    def client(count):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(socket_path)
+            for _ in range(count):
+                send_message(connection, request)
+                response = receive_message(connection)
+                if response is None or response['status'] != 'ok':
+                    failures.append(response)
+                    return
+
+    threads = [threading.Thread(target=client, args=(count,)) for count in per_client]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if failures:
+        raise Exception(f"Requisição falhou: {failures[0]}")
+    return total / elapsed
+
+def wait_for_server(socket_path, process, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise Exception("Servidor terminou ao iniciar")
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(socket_path)
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise Exception("Servidor não respondeu a tempo")
+
+def parse_args(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.server',
+        description='Compara requisições por segundo: main.py a cada programa, client.py com o servidor '
+                    'e conexões diretas ao servidor.')
+    arg_parser.add_argument('--carga', default='programa_exemplo', choices=list(WORKLOADS),
+                            help='programa executado em cada requisição')
+    arg_parser.add_argument('-n', '--requisicoes', type=int, default=50, metavar='N',
+                            help='requisições por modo (as diretas usam 10 vezes mais)')
+    arg_parser.add_argument('-j', '--processos', type=int, default=os.cpu_count() or 1, metavar='N',
+                            help='trabalhadores do servidor e conexões simultâneas')
+    arg_parser.add_argument('--saida', metavar='ARQUIVO', help='grava os resultados em JSON')
+    return arg_parser.parse_args(argv)
+
+def main(argv=None):
+    options = parse_args(sys.argv[1:] if argv is None else argv)
+    if options.requisicoes < 1 or options.processos < 1:
+        sys.stderr.write("Erro: números de requisições e de processos devem ser positivos\n")
+        return 1
+    source, stdin_text = WORKLOADS[options.carga]()
+    try:
+        results = measure(source, stdin_text, options)
+    except Exception as e:
+        sys.stderr.write(f"Erro: {e}\n")
+        return 1
+
+    print(f"carga: {options.carga}, {options.processos} trabalhadores")
+    print(f"{'modo':<10}{'req/s':>10}{'razão':>9}")
+    for mode, rate in results.items():
+        print(f"{mode:<10}{rate:>10.1f}{rate / results['cli']:>8.1f}x")
+    if options.saida:
+        with open(options.saida, 'w', encoding='utf-8') as output:
+            json.dump({'carga': options.carga, 'processos': options.processos, 'req_por_segundo': results},
+                      output, indent=2)
+    return 0
+
+def measure(source, stdin_text, options):
+    with tempfile.TemporaryDirectory() as directory:
+        program = os.path.join(directory, 'programa.txt')
+        with open(program, 'w', encoding='utf-8') as output:
+            output.write(source)
+        socket_path = os.path.join(directory, 'servidor.sock')
+        total = options.requisicoes
+
+        results = {}
+        sys.stderr.write("  main.py (um processo por programa)...\n")
+        results['cli'] = run_processes([[sys.executable, 'main.py', program]] * total, stdin_text)
+
+        server = subprocess.Popen([sys.executable, 'server.py', '--socket', socket_path,
+                                   '-j', str(options.processos)],
+                                  cwd=ROOT, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_server(socket_path, server)
+            sys.stderr.write("  client.py (um processo cliente por programa)...\n")
+            results['cliente'] = run_processes(
+                [[sys.executable, 'client.py', '--socket', socket_path, program]] * total, stdin_text)
+            sys.stderr.write(f"  conexões diretas ({options.processos} simultâneas)...\n")
+            request = {'caminho': program, 'entrada': stdin_text}
+            results['direto'] = run_connections(socket_path, request, total * 10, options.processos)
+        finally:
+            server.terminate()
+            server.wait()
+    return results
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# benchmarks/workloads.py
+import os
+
+# Cada carga é uma função que devolve (código-fonte, entrada para LEIA)
+
+def recursion():
+    return """
+FUNCAO INT fib(INT n) {
+    SE n MENOR 2 ENTAO { RETORNA n; } FIMSE
+    RETORNA fib(n - 1) + fib(n - 2);
+}
+FUNCAO INT acumula(INT n) {
+    SE n IGUAL 0 ENTAO { RETORNA 0; } FIMSE
+    RETORNA n + acumula(n - 1);
+}
+IMPRIME fib(18);
+IMPRIME acumula(300);
+""", ''
+
+def nested_loops():
+    return """
+INT total RECEBE 0, INT i RECEBE 0;
+ENQUANTO i MENOR 150 FACA {
+    PARA INT j DE 1 ATE 150 FACA {
+        SE j MAIOR i ENTAO { total RECEBE total + i * j; } SENAO { total RECEBE total - j; } FIMSE
+    }
+    FIMPARA
+    i RECEBE i + 1;
+}
+FIMENQUANTO
+IMPRIME total;
+""", ''
+
+def strings():
+    return """
+STR texto RECEBE "";
+PARA INT i DE 1 ATE 5000 FACA {
+    texto RECEBE texto + "x" + i;
+}
+FIMPARA
+IMPRIME "fim";
+""", ''
+
+def large_source(statements=20000):
+    # Programa gerado: muitas declarações, comentários e expressões curtas
+    lines = ["# programa gerado para medir tokenizer e parser"]
+    for index in range(statements):
+        lines.append(f"INT v{index} RECEBE {index} * 2 + ({index} - 1); # linha {index}")
+    lines.append(f"IMPRIME v{statements - 1};")
+    return '\n'.join(lines) + '\n', ''
+
+def deep_expressions(depth=150, count=200):
+    # Expressões com parênteses aninhados: exercita a recursão do parser e do evaluate
+    expression = '1'
+    for level in range(depth):
+        expression = f"({expression} + {level % 7})"
+    lines = ["INT r RECEBE 0;"]
+    lines.extend(f"r RECEBE {expression};" for _ in range(count))
+    lines.append("IMPRIME r;")
+    return '\n'.join(lines) + '\n', ''
+
+def io_bound(lines=20000):
+    source = f"""
+INT n RECEBE 0, INT x RECEBE 0;
+ENQUANTO n MENOR {lines} FACA {{ LEIA x; IMPRIME x * 2; n RECEBE n + 1; }}
+FIMENQUANTO
+"""
+    return source, ''.join(f"{index}\n" for index in range(lines))
+
+def example_program():
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'programa.txt')
+    with open(path, encoding='utf-8') as program:
+        return program.read(), ''
+
+WORKLOADS = {
+    'recursao': recursion,
+    'lacos_aninhados': nested_loops,
+    'concatenacao': strings,
+    'fonte_grande': large_source,
+    'expressoes_profundas': deep_expressions,
+    'entrada_saida': io_bound,
+    'programa_exemplo': example_program,
+}
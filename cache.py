@@ -0,0 +1,196 @@
+# cache.py
+from collections import OrderedDict
+import gc
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+
+CACHE_DIR_NAME = '__lcache__'
+
+# Cabeçalho de cada entrada: marca, versão do interpretador e hash do código
+MAGIC = b'LCA1'
+DIGEST_SIZE = 32
+HEADER_SIZE = len(MAGIC) + 2 * DIGEST_SIZE
+
+# Limite padrão do diretório de cache (as entradas menos usadas saem primeiro)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Módulos que definem o formato da AST: qualquer mudança neles invalida o cache
+VERSION_MODULES = ('tokens.py', 'tokenizer.py', 'parser.py', 'node.py', 'cache.py')
+
+_version = None
+
+def interpreter_version():
+    # Hash do código-fonte dos módulos que produzem a AST, calculado uma vez
+    global _version
+    if _version is None:
+        digest = hashlib.sha256(f"{sys.version_info[:2]}".encode())
+        base = os.path.dirname(os.path.abspath(__file__))
+        for name in VERSION_MODULES:
+            with open(os.path.join(base, name), 'rb') as module:
+                digest.update(module.read())
+        _version = digest.digest()
+    return _version
+
+class ProgramCache:
+    # Cache em disco da AST já analisada, no estilo do __pycache__: uma
+    # entrada por conteúdo de programa, em <diretório do programa>/__lcache__.
+    # A AST é guardada antes do otimizador e do Resolver, que a modificam.
+    # Entradas inválidas (cabeçalho errado, arquivo truncado) são apagadas e
+    # o programa é analisado de novo; falhas de escrita são ignoradas.
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def for_source(path, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        if directory is None:
+            directory = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+        return ProgramCache(directory, max_bytes)
+
+    @staticmethod
+    def digest(source):
+        return hashlib.sha256(source).digest()
+
+    def entry_path(self, digest):
+        return os.path.join(self.directory, digest.hex() + '.ast')
+
+    def header(self, digest):
+        return MAGIC + interpreter_version() + digest
+
+    def load(self, digest):
+        path = self.entry_path(digest)
+        try:
+            with open(path, 'rb') as entry:
+                data = entry.read()
+        except OSError:
+            return None
+        try:
+            if data[:HEADER_SIZE] != self.header(digest):
+                raise ValueError("cabeçalho inválido")
+            # A AST é só uma árvore (sem ciclos): o coletor de lixo, disparado
+            # a cada poucos milhares de objetos criados, só atrasaria a leitura
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                ast = pickle.loads(memoryview(data)[HEADER_SIZE:])
+            finally:
+                if enabled:
+                    gc.enable()
+        except Exception:
+            self.discard(path)
+            return None
+        # Marca a entrada como usada recentemente (a poda remove as mais antigas)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return ast
+
+    def store(self, digest, ast):
+        try:
+            payload = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, RecursionError, TypeError):
+            return False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Escrita atômica: outro processo nunca vê uma entrada pela metade
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(handle, 'wb') as entry:
+                entry.write(self.header(digest))
+                entry.write(payload)
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, self.entry_path(digest))
+        except OSError:
+            return False
+        self.prune()
+        return True
+
+    def entries(self):
+        found = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return found
+        for name in names:
+            if not name.endswith('.ast'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                status = os.stat(path)
+            except OSError:
+                continue
+            found.append((status.st_mtime, status.st_size, path))
+        return found
+
+    def prune(self):
+        # Remove as entradas usadas há mais tempo até caber no limite
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self.discard(path)
+            total -= size
+
+    def clear(self):
+        # Apaga o diretório de cache inteiro; retorna quantas entradas havia
+        count = len(self.entries())
+        shutil.rmtree(self.directory, ignore_errors=True)
+        return count
+
+    @staticmethod
+    def discard(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+class MemoryCache:
+    # Cache em memória com a interface de ProgramCache (load/store), para
+    # processos que executam muitos programas (servidor). Guarda a AST
+    # serializada: cada load devolve uma cópia nova, que o otimizador e o
+    # Resolver podem modificar. Não depende da versão do interpretador, que
+    # não muda durante a vida do processo.
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, digest):
+        payload = self.entries.get(digest)
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(digest)
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.loads(payload)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def store(self, digest, ast):
+        try:
+            payload = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, RecursionError, TypeError):
+            return False
+        if len(payload) > self.max_bytes:
+            return False
+        previous = self.entries.pop(digest, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self.entries[digest] = payload
+        self.size += len(payload)
+        # Remove as entradas usadas há mais tempo até caber no limite
+        while self.size > self.max_bytes:
+            _, removed = self.entries.popitem(last=False)
+            self.size -= len(removed)
+        return True
@@ -0,0 +1,80 @@
+# client.py
+import argparse
+import os
+import socket
+import sys
+
+from protocol import DEFAULT_SOCKET, send_message, receive_message
+
+def parse_args(argv):
+    # Opções desconhecidas são repassadas ao main.py no servidor (ex.: --vm, -O)
+    arg_parser = argparse.ArgumentParser(
+        prog='client.py',
+        allow_abbrev=False,
+        usage="python client.py [opções] [opções do main.py] <arquivo.txt>",
+        description='Executa um programa em um servidor (server.py) já iniciado, '
+                    'sem o custo de iniciar o interpretador.')
+    arg_parser.add_argument('--socket', default=DEFAULT_SOCKET, metavar='CAMINHO',
+                            help=f"caminho do socket do servidor (padrão: {DEFAULT_SOCKET})")
+    arg_parser.add_argument('--enviar-fonte', action='store_true',
+                            help='envia o código do programa (servidor sem acesso ao arquivo)')
+    arg_parser.add_argument('--entrada', metavar='ARQUIVO',
+                            help='entrada para LEIA (padrão: stdin, se não for um terminal)')
+    arg_parser.add_argument('--tempo-limite', type=float, metavar='S',
+                            help='segundos para o programa (padrão: o do servidor)')
+    arg_parser.add_argument('--tempo', action='store_true',
+                            help='mostra no stderr o tempo gasto no servidor e se a AST veio do cache')
+    options, extra = arg_parser.parse_known_args(argv)
+    if not extra or extra[-1].startswith('-'):
+        arg_parser.error("informe o arquivo do programa")
+    options.file_path = extra[-1]
+    options.flags = extra[:-1]
+    return options
+
+def build_request(options):
+    request = {'caminho': os.path.abspath(options.file_path), 'opcoes': options.flags}
+    if options.enviar_fonte:
+        with open(options.file_path, 'r', encoding='utf-8') as program:
+            request['fonte'] = program.read()
+    if options.entrada:
+        with open(options.entrada, 'r', encoding='utf-8') as input_file:
+            request['entrada'] = input_file.read()
+    elif not sys.stdin.isatty():
+        request['entrada'] = sys.stdin.read()
+    if options.tempo_limite is not None:
+        request['tempo_limite'] = options.tempo_limite
+    return request
+
+def main_client():
+    options = parse_args(sys.argv[1:])
+    try:
+        request = build_request(options)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            try:
+                connection.connect(options.socket)
+            except OSError:
+                raise Exception(f"Nenhum servidor em {options.socket} (inicie com python server.py)")
+            send_message(connection, request)
+            response = receive_message(connection)
+        if response is None:
+            raise Exception("Servidor encerrou a conexão sem resposta")
+    except FileNotFoundError:
+        sys.stderr.write("Erro: Arquivo não encontrado\n")
+        return 1
+    except Exception as e:
+        sys.stderr.write(f"Erro: {e}\n")
+        return 1
+
+    sys.stdout.write(response['saida'])
+    sys.stdout.flush()
+    sys.stderr.write(response['erros'])
+    if response['erro'] is not None:
+        sys.stderr.write(f"Erro: {response['erro']}\n")
+    if options.tempo:
+        origin = 'cache' if response['cache'] else 'análise'
+        sys.stderr.write(f"Servidor: {response['segundos'] * 1000:.2f}ms "
+                         f"(trabalhador {response['trabalhador']}, AST: {origin})\n")
+    return 0 if response['status'] == 'ok' else 1
+
+if __name__ == "__main__":
+    sys.exit(main_client())
@@ -0,0 +1,42 @@
+# closedform.py
+from math import comb
+
+# Grau máximo dos polinômios somados em forma fechada
+MAX_DEGREE = 4
+
+def for_iterations(start, end, step):
+    # Número de voltas de PARA (mesma regra de ForNode.evaluate); None se infinito
+    if step > 0:
+        return (end - start) // step + 1 if start <= end else 0
+    if step < 0:
+        return (start - end) // -step + 1 if start >= end else 0
+    return None
+
+def while_iterations(op, counter, bound, step):
+    # Voltas de 'ENQUANTO contador op limite' com contador += step a cada
+    # volta; None quando o laço não termina ou o caso não é tratado
+    if op == 'MENOR' and step > 0:
+        return max(0, -((counter - bound) // step))
+    if op == 'MENORIGUAL' and step > 0:
+        return (bound - counter) // step + 1 if counter <= bound else 0
+    if op == 'MAIOR' and step < 0:
+        return max(0, -((bound - counter) // -step))
+    if op == 'MAIORIGUAL' and step < 0:
+        return (counter - bound) // -step + 1 if counter >= bound else 0
+    return None
+
+def progression_sum(samples, count):
+    # Soma de count termos E(x0), E(x0 + p), ... sabendo que E é polinômio
+    # de grau len(samples) - 1 e samples são os primeiros termos. As somas
+    # parciais formam um polinômio em count, reconstruído pelas diferenças
+    # progressivas de Newton; só há aritmética inteira, então o resultado é
+    # idêntico ao da soma termo a termo.
+    partial = [0]
+    for value in samples:
+        partial.append(partial[-1] + value)
+    total = 0
+    differences = partial
+    for order in range(len(partial)):
+        total += comb(count, order) * differences[0]
+        differences = [after - before for before, after in zip(differences, differences[1:])]
+    return total
@@ -0,0 +1,419 @@
+# compiler.py
+import operator
+from node import *
+
+# Códigos de operação da máquina virtual, agrupados pela frequência com que
+# são executados: a VM escolhe o grupo pela faixa de valores e só compara
+# o código com as instruções daquele grupo, das mais comuns às mais raras.
+# Laços e variáveis locais (as superinstruções levam os operandos, variável
+# local ou constante, no próprio argumento, sem passar pela pilha)
+FOR_NEXT = 0
+LOOP_IF_LOCAL_CONST = 1
+ASSIGN_LOCAL_CONST = 2
+LOAD_LOCAL = 3
+BINARY_LOCAL_CONST = 4
+LOAD_CONST = 5
+STORE_LOCAL = 6
+ASSIGN_LOCAL_LOCAL = 7
+BINARY_CONST = 8
+ASSIGN_CONST = 9
+ASSIGN_LOCAL_BINARY = 10
+BINARY_LOCAL_LOCAL = 11
+LOOP_IF_LOCAL_LOCAL = 12
+LOOP_IF_TRUE = 13
+# Saltos, operações especializadas, textos e vetores
+JUMP_UNLESS_LOCAL_CONST = 13
+ADD_INT = 14
+JUMP = 15
+JUMP_IF_FALSE = 16
+JUMP_UNLESS_LOCAL_LOCAL = 17
+APPEND_SIMPLE = 18
+APPEND = 19
+CONCAT = 20
+LOAD_BUILDER = 21
+LOAD_INDEX = 22
+STORE_INDEX = 23
+POP = 24
+LOAD_CACHED = 25
+# Chamadas, variáveis globais, entrada e saída
+LOAD_FUNC = 26
+CALL = 27
+RETURN = 28
+RETURN_NONE = 29
+LOAD_GLOBAL = 30
+STORE_GLOBAL = 31
+PRINT = 32
+READ_INT = 33
+READ_STR = 34
+READ = 35
+# Operações genéricas (código sem verificação de tipos)
+ADD = 36
+SUB = 37
+MUL = 38
+CMP_LT = 39
+CMP_LE = 40
+CMP_GT = 41
+CMP_GE = 42
+CMP_EQ = 43
+CMP_NE = 44
+DIV = 45
+NEG = 46
+NOT = 47
+POS = 48
+# Instruções executadas poucas vezes
+DECLARE = 49
+FOR_PREP = 50
+STORE_CACHED = 51
+CLEAR_LOCAL = 52
+MAKE_FUNCTION = 53
+CLOSED_FORM = 54
+NEW_ARRAY = 55
+ARRAY_OP = 56
+
+OPNAMES = {value: name for name, value in list(globals().items())
+           if name.isupper() and isinstance(value, int)}
+
+BINARY_OPS = {'+': ADD, '-': SUB, '*': MUL, '/': DIV}
+# Nós especializados pelo TypeChecker com instrução própria
+SPECIALIZED_OPS = {IntAddNode: ADD_INT, StrConcatNode: CONCAT}
+UNARY_OPS = {'+': POS, '-': NEG, '!': NOT}
+RELATIONAL_OPS = {
+    'IGUAL': CMP_EQ, 'DIFERENTE': CMP_NE, 'MAIOR': CMP_GT,
+    'MENOR': CMP_LT, 'MAIORIGUAL': CMP_GE, 'MENORIGUAL': CMP_LE,
+}
+
+def add_values(left, right):
+    # '+' sem tipos conhecidos: concatena se um dos lados é texto
+    if isinstance(left, str) or isinstance(right, str):
+        return str(left) + str(right)
+    return left + right
+
+def divide(left, right):
+    if right == 0:
+        raise Exception("Erro: Divisão por zero")
+    return left / right
+
+def concat(left, right):
+    return f"{left}{right}"
+
+# Função de cada operação binária, para as superinstruções
+BINARY_FUNCTIONS = {
+    ADD: add_values, SUB: operator.sub, MUL: operator.mul, DIV: divide,
+    ADD_INT: operator.add, CONCAT: concat,
+}
+
+def is_literal(node):
+    return isinstance(node, (NumberNode, StringNode, BoolNode))
+
+class Code:
+    # Sequência linear de instruções: dois vetores paralelos (opcode, argumento)
+    def __init__(self, name, names):
+        self.name = name
+        self.names = names  # slot -> nome, para mensagens de erro
+        self.ops = []
+        self.args = []
+
+    def emit(self, op, arg=None):
+        self.ops.append(op)
+        self.args.append(arg)
+        return len(self.ops) - 1
+
+    def patch(self, index, arg):
+        self.args[index] = arg
+
+    def patch_target(self, index, target):
+        # Destino de um salto: o argumento inteiro ou o último item da tupla
+        arg = self.args[index]
+        self.args[index] = arg[:-1] + (target,) if isinstance(arg, tuple) else target
+
+    def here(self):
+        return len(self.ops)
+
+    def disassemble(self):
+        lines = []
+        for pc, (op, arg) in enumerate(zip(self.ops, self.args)):
+            if isinstance(arg, Code):
+                arg = f"<código {arg.name}>"
+            elif isinstance(arg, tuple):
+                arg = tuple(f"<código {a.name}>" if isinstance(a, Code) else
+                            a.__name__ if callable(a) else a for a in arg)
+            lines.append(f"{pc:5d} {OPNAMES[op]:<14} {'' if arg is None else arg}")
+        return '\n'.join(lines)
+
+class Compiler:
+    # Traduz a AST produzida por Parser.run para instruções da VM
+    @staticmethod
+    def run(ast, global_scope):
+        code = Code('<programa>', global_scope.names)
+        Compiler.compile_node(ast, code)
+        code.emit(RETURN_NONE)
+        return code
+
+    @staticmethod
+    def compile_function(node):
+        code = Code(node.func_name, node.slot_names)
+        Compiler.compile_node(node.block, code)
+        code.emit(RETURN_NONE)
+        return code
+
+    @staticmethod
+    def compile_statement(node, code):
+        Compiler.compile_node(node, code)
+        # Chamadas (e operações de vetor) usadas como comando deixam um valor na pilha
+        if isinstance(node, (FuncCallNode, ArrayOpNode)):
+            code.emit(POP)
+
+    @staticmethod
+    def compile_node(node, code):
+        if isinstance(node, (NumberNode, StringNode, BoolNode)):
+            code.emit(LOAD_CONST, node.value)
+        elif isinstance(node, StrBuilderReadNode):
+            code.emit(LOAD_BUILDER, (node.depth, node.slot))
+        elif isinstance(node, IdentifierNode):
+            code.emit(LOAD_LOCAL if node.depth == 0 else LOAD_GLOBAL, node.slot)
+        elif isinstance(node, BinOpNode):
+            operation = Compiler.binary_operation(node)
+            operands = Compiler.simple_operands(node)
+            if operands is not None:
+                left, right, constant = operands
+                code.emit(BINARY_LOCAL_CONST if constant else BINARY_LOCAL_LOCAL,
+                          (BINARY_FUNCTIONS[operation], left, right))
+            elif is_literal(node.right):
+                Compiler.compile_node(node.left, code)
+                code.emit(BINARY_CONST, (BINARY_FUNCTIONS[operation], node.right.value))
+            else:
+                Compiler.compile_node(node.left, code)
+                Compiler.compile_node(node.right, code)
+                code.emit(operation)
+        elif isinstance(node, UnOpNode):
+            if node.op not in UNARY_OPS:
+                raise Exception(f"Operador unário desconhecido: {node.op}")
+            Compiler.compile_node(node.node, code)
+            code.emit(UNARY_OPS[node.op])
+        elif isinstance(node, RelationalOpNode):
+            if node.op not in RELATIONAL_OPS:
+                raise Exception(f"Operador relacional desconhecido: {node.op}")
+            Compiler.compile_node(node.left, code)
+            Compiler.compile_node(node.right, code)
+            code.emit(RELATIONAL_OPS[node.op])
+        elif isinstance(node, StrAppendNode):
+            parts = [Compiler.append_part(part) for part in node.parts]
+            if None not in parts:
+                # Só literais e variáveis locais: uma instrução, sem passar pela pilha
+                code.emit(APPEND_SIMPLE, (node.depth, node.slot, tuple(parts)))
+            else:
+                # Como na concatenação original, a variável é conferida antes das
+                # partes (que podem falhar), sem juntar o texto
+                code.emit(LOAD_LOCAL if node.depth == 0 else LOAD_GLOBAL, node.slot)
+                code.emit(POP)
+                for part in node.parts:
+                    Compiler.compile_node(part, code)
+                code.emit(APPEND, (node.depth, node.slot, len(node.parts)))
+        elif isinstance(node, AssignmentNode):
+            operands = nested = None
+            if node.depth == 0 and isinstance(node.expr, BinOpNode):
+                operands = Compiler.simple_operands(node.expr)
+                if operands is None:
+                    nested = Compiler.nested_operands(node.expr)
+            if operands is not None:
+                # 'x RECEBE a op b' com a local e b local ou constante: uma instrução
+                left, right, constant = operands
+                function = BINARY_FUNCTIONS[Compiler.binary_operation(node.expr)]
+                code.emit(ASSIGN_LOCAL_CONST if constant else ASSIGN_LOCAL_LOCAL,
+                          (function, node.slot, left, right))
+            elif nested is not None:
+                # 'x RECEBE a op (b op c)': também uma instrução
+                function = BINARY_FUNCTIONS[Compiler.binary_operation(node.expr)]
+                code.emit(ASSIGN_LOCAL_BINARY, (function, node.slot) + nested)
+            elif node.depth == 0 and isinstance(node.expr, BinOpNode) and is_literal(node.expr.right):
+                # 'x RECEBE <expressão> op constante': operação e atribuição juntas
+                Compiler.compile_node(node.expr.left, code)
+                code.emit(ASSIGN_CONST, (BINARY_FUNCTIONS[Compiler.binary_operation(node.expr)],
+                                         node.slot, node.expr.right.value))
+            else:
+                Compiler.compile_node(node.expr, code)
+                code.emit(STORE_LOCAL if node.depth == 0 else STORE_GLOBAL, node.slot)
+        elif isinstance(node, ArrayDecNode):
+            Compiler.compile_node(node.expression, code)
+            code.emit(NEW_ARRAY, node.element)
+            code.emit(DECLARE, node.slot)
+        elif isinstance(node, IndexNode):
+            Compiler.compile_node(node.index, code)
+            code.emit(LOAD_INDEX, (node.depth, node.slot))
+        elif isinstance(node, IndexAssignNode):
+            Compiler.compile_node(node.index, code)
+            Compiler.compile_node(node.expr, code)
+            code.emit(STORE_INDEX, (node.depth, node.slot))
+        elif isinstance(node, ArrayOpNode):
+            for arg in node.args:
+                Compiler.compile_node(arg, code)
+            code.emit(ARRAY_OP, (node.op, len(node.args)))
+        elif isinstance(node, VarDecNode):
+            if node.expression:
+                Compiler.compile_node(node.expression, code)
+            else:
+                default = {'INT': 0, 'STR': '', 'BOOL': 0}[node.var_type]
+                code.emit(LOAD_CONST, default)
+            code.emit(DECLARE, node.slot)
+        elif isinstance(node, PrintNode):
+            Compiler.compile_node(node.expr, code)
+            code.emit(PRINT)
+        elif isinstance(node, ReadIntNode):
+            code.emit(READ_INT, (node.depth, node.slot))
+        elif isinstance(node, ReadStrNode):
+            code.emit(READ_STR, (node.depth, node.slot))
+        elif isinstance(node, ReadNode):
+            code.emit(READ, (node.depth, node.slot, node.var_type))
+        elif isinstance(node, BlockNode):
+            for statement in node.statements:
+                Compiler.compile_statement(statement, code)
+        elif isinstance(node, IfNode):
+            jump_false = Compiler.compile_jump_unless(node.condition, code)
+            Compiler.compile_statement(node.true_block, code)
+            if node.false_block:
+                jump_end = code.emit(JUMP)
+                code.patch_target(jump_false, code.here())
+                Compiler.compile_statement(node.false_block, code)
+                code.patch(jump_end, code.here())
+            else:
+                code.patch_target(jump_false, code.here())
+        elif isinstance(node, InvariantNode):
+            # Se o valor já foi calculado nesta entrada do laço, pula a expressão
+            skip = code.emit(LOAD_CACHED)
+            Compiler.compile_node(node.expr, code)
+            code.emit(STORE_CACHED, node.slot)
+            code.patch(skip, (node.slot, code.here()))
+        elif isinstance(node, (ReductionWhileNode, ReductionForNode)):
+            # Tenta a forma fechada; se não der, executa o laço comum em seguida
+            closed_form = code.emit(CLOSED_FORM)
+            Compiler.compile_loop(node, code)
+            code.patch(closed_form, (node, code.here()))
+        elif isinstance(node, (WhileNode, ForNode)):
+            Compiler.compile_loop(node, code)
+        elif isinstance(node, FuncDecNode):
+            function_code = Compiler.compile_function(node)
+            code.emit(MAKE_FUNCTION, (node.slot, node.func_name, node.func_type,
+                                      node.param_slots, node.frame_size, function_code, node.memo,
+                                      node.shadow_slots))
+        elif isinstance(node, FuncCallNode):
+            # A função é resolvida (e a aridade conferida) antes de avaliar os argumentos
+            # O nome é lido do frame em que foi resolvido (um parâmetro ou variável
+            # local pode esconder a função global). O último item guarda a
+            # função já conferida por este ponto de chamada (preenchido pela VM).
+            code.emit(LOAD_FUNC, [node.depth, node.slot, len(node.args), None])
+            for arg in node.args:
+                Compiler.compile_node(arg, code)
+            code.emit(CALL, len(node.args))
+        elif isinstance(node, ReturnNode):
+            Compiler.compile_node(node.expr, code)
+            code.emit(RETURN)
+        else:
+            raise Exception(f"Nó não suportado pelo compilador: {type(node).__name__}")
+
+    @staticmethod
+    def binary_operation(node):
+        if node.op not in BINARY_OPS:
+            raise Exception(f"Operador desconhecido: {node.op}")
+        return SPECIALIZED_OPS.get(type(node), BINARY_OPS[node.op])
+
+    @staticmethod
+    def local_slot(node):
+        # Slot de uma leitura simples de variável do frame atual, senão None
+        if type(node) is IdentifierNode and node.depth == 0:
+            return node.slot
+        return None
+
+    @staticmethod
+    def append_part(node):
+        # (slot, None) para uma variável local, (None, texto) para um literal;
+        # None para as demais partes
+        if is_literal(node):
+            return None, f"{node.value}"
+        slot = Compiler.local_slot(node)
+        if slot is None:
+            return None
+        return slot, None
+
+    @staticmethod
+    def simple_operands(node):
+        # (slot da esquerda, slot ou valor da direita, direita é constante)
+        # quando a esquerda é uma variável local e a direita uma variável
+        # local ou um literal; senão None
+        left = Compiler.local_slot(node.left)
+        if left is None:
+            return None
+        if is_literal(node.right):
+            return left, node.right.value, True
+        right = Compiler.local_slot(node.right)
+        if right is None:
+            return None
+        return left, right, False
+
+    @staticmethod
+    def nested_operands(node):
+        # (slot da esquerda, função, esquerda, direita, constante) quando a
+        # esquerda é uma variável local e a direita uma operação com
+        # operandos simples; senão None
+        left = Compiler.local_slot(node.left)
+        if left is None or not isinstance(node.right, BinOpNode):
+            return None
+        operands = Compiler.simple_operands(node.right)
+        if operands is None:
+            return None
+        return (left, BINARY_FUNCTIONS[Compiler.binary_operation(node.right)]) + operands
+
+    @staticmethod
+    def comparison(node):
+        # Operandos de uma condição 'a op b' que cabe em uma superinstrução de salto
+        if not isinstance(node, RelationalOpNode) or node.op not in RELATIONAL_OPS:
+            return None
+        operands = Compiler.simple_operands(node)
+        if operands is None:
+            return None
+        return (INT_COMPARISONS[node.op],) + operands
+
+    @staticmethod
+    def compile_jump_unless(condition, code):
+        # Salto para quando a condição é falsa; o destino é preenchido
+        # depois com code.patch_target
+        comparison = Compiler.comparison(condition)
+        if comparison is None:
+            Compiler.compile_node(condition, code)
+            return code.emit(JUMP_IF_FALSE)
+        compare, left, right, constant = comparison
+        return code.emit(JUMP_UNLESS_LOCAL_CONST if constant else JUMP_UNLESS_LOCAL_LOCAL,
+                         (compare, left, right, None))
+
+    @staticmethod
+    def compile_loop(node, code):
+        # Os laços são compilados com o teste no fim: cada volta executa
+        # uma única instrução de controle (LOOP_IF_* ou FOR_NEXT), que
+        # também conta os passos do modo assíncrono
+        for slot in node.hoisted_slots:
+            code.emit(CLEAR_LOCAL, slot)
+        if isinstance(node, WhileNode):
+            enter = code.emit(JUMP)
+            body = code.here()
+            Compiler.compile_statement(node.block, code)
+            code.patch(enter, code.here())
+            comparison = Compiler.comparison(node.condition)
+            if comparison is None:
+                Compiler.compile_node(node.condition, code)
+                code.emit(LOOP_IF_TRUE, body)
+            else:
+                compare, left, right, constant = comparison
+                code.emit(LOOP_IF_LOCAL_CONST if constant else LOOP_IF_LOCAL_LOCAL,
+                          (compare, left, right, body))
+            return
+        # Pilha durante o laço: [..., fim, passo]
+        Compiler.compile_node(node.start_expr, code)
+        Compiler.compile_node(node.end_expr, code)
+        if node.step_expr:
+            Compiler.compile_node(node.step_expr, code)
+        else:
+            code.emit(LOAD_CONST, 1)
+        prepare = code.emit(FOR_PREP, (node.slot, None))
+        body = code.here()
+        Compiler.compile_statement(node.block, code)
+        code.emit(FOR_NEXT, (node.slot, body))
+        code.patch_target(prepare, code.here())
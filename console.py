@@ -0,0 +1,141 @@
+# console.py
+import codecs
+import sys
+
+# Tamanho padrão do buffer de saída (caracteres) e dos blocos lidos da entrada
+DEFAULT_BUFFER_SIZE = 1 << 16
+READ_SIZE = 1 << 16
+
+class Console:
+    # Camada de E/S do interpretador (IMPRIME e LEIA, na AST e na VM).
+    # A saída é acumulada e escrita de uma vez quando passa de buffer_size
+    # caracteres, em flush() e no fim da execução; buffer_size 0 escreve a
+    # cada linha, e None escolhe pelo destino: cada linha num terminal (como
+    # o print(), para o progresso aparecer na hora), DEFAULT_BUFFER_SIZE em
+    # arquivos e pipes. A entrada é lida em blocos grandes e separada em linhas
+    # sob demanda. Sem fluxos explícitos usa sys.stdin/sys.stdout do momento.
+    current = None  # Console usado pelos nós e pela VM
+
+    def __init__(self, input_stream=None, output_stream=None, buffer_size=0):
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+        if buffer_size is None:
+            buffer_size = 0 if (output_stream or sys.stdout).isatty() else DEFAULT_BUFFER_SIZE
+        self.buffer_size = buffer_size
+        self.pending = []
+        self.pending_size = 0
+        self.lines = []
+        self.line_index = 0
+        self.partial = ''
+        self.decoder = None
+        self.at_eof = False
+
+    def write_line(self, value):
+        text = str(value)
+        self.pending.append(text)
+        self.pending_size += len(text) + 1
+        if self.pending_size > self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        stream = self.output_stream or sys.stdout
+        text = '\n'.join(self.pending) + '\n'
+        self.pending = []
+        self.pending_size = 0
+        stream.write(text)
+        stream.flush()
+
+    def read_line(self):
+        while self.line_index >= len(self.lines):
+            if not self.fill():
+                raise Exception("Entrada terminou antes do LEIA")
+        line = self.lines[self.line_index]
+        self.line_index += 1
+        if line.endswith('\r'):
+            line = line[:-1]
+        return line
+
+    def fill(self):
+        # Lê o próximo bloco da entrada; a última linha incompleta fica para depois
+        if self.at_eof:
+            return False
+        stream = self.input_stream or sys.stdin
+        if stream.isatty():
+            # Interativo: o que já foi impresso (perguntas) aparece antes da leitura
+            self.flush()
+            chunk = stream.readline()
+        else:
+            chunk = self.read_chunk(stream)
+        if not chunk:
+            self.at_eof = True
+            if not self.partial:
+                return False
+            self.lines = [self.partial]
+            self.partial = ''
+        else:
+            self.lines = (self.partial + chunk).split('\n')
+            self.partial = self.lines.pop()
+        self.line_index = 0
+        return True
+
+    def read_chunk(self, stream):
+        # Em arquivos e pipes lê bytes do que já estiver disponível (read1),
+        # sem esperar um bloco completo; fluxos em memória são lidos direto
+        raw = getattr(stream, 'buffer', None)
+        if raw is None or not hasattr(raw, 'read1'):
+            return stream.read(READ_SIZE)
+        if self.decoder is None:
+            self.decoder = codecs.getincrementaldecoder(stream.encoding or 'utf-8')()
+        while True:
+            data = raw.read1(READ_SIZE)
+            text = self.decoder.decode(data, final=not data)
+            if text or not data:
+                return text
+
+Console.current = Console()
+
+class AsyncConsole:
+    # Console de uma execução assíncrona (VM.run_async). IMPRIME e LEIA
+    # aguardam os fluxos da própria execução: reader com readline()
+    # (asyncio.StreamReader) e writer com write() e drain()
+    # (asyncio.StreamWriter). A saída é acumulada como no Console e enviada
+    # ao passar de buffer_size, em flush() e antes de cada LEIA, para que
+    # perguntas cheguem antes da espera pela resposta.
+    def __init__(self, reader, writer, buffer_size=DEFAULT_BUFFER_SIZE, encoding='utf-8'):
+        self.reader = reader
+        self.writer = writer
+        self.buffer_size = buffer_size
+        self.encoding = encoding
+        self.pending = []
+        self.pending_size = 0
+
+    async def write_line(self, value):
+        text = str(value)
+        self.pending.append(text)
+        self.pending_size += len(text) + 1
+        if self.pending_size > self.buffer_size:
+            await self.flush()
+
+    async def flush(self):
+        if not self.pending:
+            return
+        text = '\n'.join(self.pending) + '\n'
+        self.pending = []
+        self.pending_size = 0
+        self.writer.write(text.encode(self.encoding))
+        await self.writer.drain()
+
+    async def read_line(self):
+        await self.flush()
+        line = await self.reader.readline() if self.reader is not None else b''
+        if not line:
+            raise Exception("Entrada terminou antes do LEIA")
+        if isinstance(line, bytes):
+            line = line.decode(self.encoding)
+        if line.endswith('\n'):
+            line = line[:-1]
+        if line.endswith('\r'):
+            line = line[:-1]
+        return line
@@ -0,0 +1,610 @@
+# jit.py
+from time import perf_counter
+from node import *
+
+# Execuções (chamadas de uma função ou voltas de um laço) antes de compilar
+DEFAULT_THRESHOLD = 1000
+
+# Operadores relacionais em Python
+PYTHON_COMPARISONS = {'IGUAL': '==', 'DIFERENTE': '!=', 'MAIOR': '>', 'MENOR': '<',
+                      'MAIORIGUAL': '>=', 'MENORIGUAL': '<='}
+
+# Funções auxiliares do código gerado: repetem exatamente o evaluate dos nós
+
+def undefined(message):
+    raise Exception(message)
+
+def add(left, right):
+    # BinOpNode '+' sem tipos conhecidos
+    if isinstance(left, str) or isinstance(right, str):
+        return str(left) + str(right)
+    return left + right
+
+def divide(left, right):
+    if right == 0:
+        raise Exception("Erro: Divisão por zero")
+    return left / right
+
+def store(values, slot, value):
+    # Primeira avaliação de um InvariantNode
+    values[slot] = value
+    return value
+
+def read_builder(values, slot, name):
+    value = values[slot]
+    if type(value) is StrBuilder:
+        value = ''.join(value.pieces)
+        values[slot] = value
+    elif value is UNDEFINED:
+        raise Exception(f"Variável '{name}' não definida")
+    return value
+
+def append(values, slot, texts):
+    current = values[slot]
+    if type(current) is StrBuilder:
+        current.pieces.extend(texts)
+    else:
+        values[slot] = StrBuilder([f"{current}"] + texts)
+
+def load_index(index, items, name):
+    items = array_value(items, name)
+    check_index(items, index, name)
+    return items[index]
+
+def store_index(index, value, items, name):
+    store_element(array_value(items, name), index, value, name)
+
+def resolve(node, function):
+    node.resolve(function)
+    return function
+
+def call(node, function, arg_values):
+    # FuncCallNode.evaluate depois de avaliar os argumentos
+    memo = function.memo
+    if memo is not None:
+        key = memo.key(arg_values)
+        if key is not None:
+            found, value = memo.lookup(key)
+            if found:
+                return value
+            value = FuncCallNode.call(function, arg_values)
+            memo.store(key, value)
+            return value
+    return FuncCallNode.call(function, arg_values)
+
+def counting(values, slot, end, step):
+    # Voltas de um PARA quando range() não serve (valores não inteiros ou
+    # passo zero): mesma regra de ForNode.evaluate, com o contador no frame
+    if step > 0:
+        while values[slot] <= end:
+            yield values[slot]
+            values[slot] = values[slot] + step
+    else:
+        while values[slot] >= end:
+            yield values[slot]
+            values[slot] = values[slot] + step
+
+HELPERS = {
+    'UNDEFINED': UNDEFINED, 'RETURN_SIGNAL': RETURN_SIGNAL, 'Console': Console,
+    'undefined': undefined, 'add': add, 'divide': divide, 'store': store,
+    'read_builder': read_builder, 'append': append, 'load_index': load_index,
+    'store_index': store_index, 'new_array': new_array, 'array_operation': array_operation,
+    'resolve': resolve, 'call': call, 'counting': counting,
+}
+
+class Resume:
+    # Resultado do laço interpretado que atingiu o limite: continua no código
+    # compilado a partir do estado atual (state vai para a função compilada)
+    def __init__(self, state):
+        self.state = state
+
+class JitUnit:
+    # Um trecho candidato: corpo de função ou laço
+    def __init__(self, kind, label, line):
+        self.kind = kind  # 'FUNCAO', 'PARA' ou 'ENQUANTO'
+        self.label = label
+        self.line = line
+        self.count = 0          # execuções interpretadas (chamadas ou voltas)
+        self.source = None      # código Python gerado
+        self.failure = None     # motivo quando não foi possível compilar
+        self.compile_time = 0.0
+        self.interpreted = [0, 0.0]  # [execuções, tempo próprio] antes de compilar
+        self.native = [0, 0.0]       # [execuções, tempo próprio] já compilado
+
+class HotBlockNode(BlockNode):
+    # Corpo de uma FUNCAO: conta as chamadas e passa a usar o código compilado
+    __slots__ = ('declaration', 'jit', 'unit', 'compiled')
+
+    def __init__(self, declaration, jit, unit):
+        super().__init__(declaration.block.statements)
+        self.declaration = declaration
+        self.jit = jit
+        self.unit = unit
+        self.compiled = None
+
+    def evaluate(self, symbol_table):
+        compiled = self.compiled
+        if compiled is not None:
+            return compiled(symbol_table)
+        return self.jit.interpret_call(self, symbol_table)
+
+class HotWhileNode(WhileNode):
+    __slots__ = ('jit', 'unit', 'global_level', 'compiled')
+
+    def __init__(self, loop, jit, unit, global_level):
+        super().__init__(loop.condition, loop.block)
+        self.position, self.line = loop.position, loop.line
+        self.hoisted, self.hoisted_slots = loop.hoisted, loop.hoisted_slots
+        self.jit = jit
+        self.unit = unit
+        self.global_level = global_level
+        self.compiled = None
+
+    def evaluate(self, symbol_table):
+        compiled = self.compiled
+        if compiled is not None:
+            return compiled(symbol_table)
+        return self.jit.interpret_loop(self, symbol_table)
+
+    def interpret(self, symbol_table):
+        # WhileNode.evaluate contando as voltas
+        for slot in self.hoisted_slots:
+            symbol_table.values[slot] = UNDEFINED
+        unit = self.unit
+        jit = self.jit
+        while self.condition.evaluate(symbol_table):
+            if self.block.evaluate(symbol_table) is RETURN_SIGNAL:
+                return RETURN_SIGNAL
+            unit.count += 1
+            if unit.count == jit.threshold and jit.compile(self):
+                return Resume(True)
+
+class HotForNode(ForNode):
+    __slots__ = ('jit', 'unit', 'global_level', 'compiled')
+
+    def __init__(self, loop, jit, unit, global_level):
+        super().__init__(loop.var_name, loop.start_expr, loop.end_expr, loop.step_expr, loop.block)
+        self.position, self.line = loop.position, loop.line
+        self.slot = loop.slot
+        self.hoisted, self.hoisted_slots = loop.hoisted, loop.hoisted_slots
+        self.jit = jit
+        self.unit = unit
+        self.global_level = global_level
+        self.compiled = None
+
+    def evaluate(self, symbol_table):
+        compiled = self.compiled
+        if compiled is not None:
+            return compiled(symbol_table)
+        return self.jit.interpret_loop(self, symbol_table)
+
+    def interpret(self, symbol_table):
+        # ForNode.evaluate contando as voltas
+        values = symbol_table.values
+        for slot in self.hoisted_slots:
+            values[slot] = UNDEFINED
+        start_value = self.start_expr.evaluate(symbol_table)
+        end_value = self.end_expr.evaluate(symbol_table)
+        step_value = self.step_expr.evaluate(symbol_table) if self.step_expr else 1
+        slot = self.slot
+        values[slot] = start_value
+        ascending = step_value > 0
+        unit = self.unit
+        jit = self.jit
+        while values[slot] <= end_value if ascending else values[slot] >= end_value:
+            if self.block.evaluate(symbol_table) is RETURN_SIGNAL:
+                return RETURN_SIGNAL
+            current_value = values[slot]
+            values[slot] = current_value + step_value
+            unit.count += 1
+            if unit.count == jit.threshold and jit.compile(self):
+                return Resume((end_value, step_value))
+
+class Translator:
+    # Gera o código Python de um trecho. Todo o estado continua nos frames
+    # (values[slot]), então qualquer nó sem tradução pode ser executado pelo
+    # próprio evaluate no meio do código gerado, e o que vem depois segue
+    # valendo. A função gerada devolve RETURN_SIGNAL como os nós.
+    def __init__(self, unit, root, iterations):
+        self.unit = unit
+        self.root = root
+        self.iterations = iterations  # conta as voltas do laço raiz (estatísticas)
+        self.lines = []
+        self.namespace = dict(HELPERS)
+        self.depths = set()
+        self.defined = set()  # slots locais que certamente têm valor
+        self.loops = 0
+        self.in_function = isinstance(root, HotBlockNode)
+
+    def source(self):
+        root = self.root
+        body = []
+        self.lines = body
+        if self.in_function:
+            self.defined = set(root.declaration.param_slots)
+            self.block(root, 1)
+            signature = "def unit(frame):"
+        elif isinstance(root, ForNode):
+            self.for_loop(root, 1, resumable=True)
+            signature = "def unit(frame, state=None):"
+        else:
+            self.while_loop(root, 1, resumable=True)
+            signature = "def unit(frame, state=None):"
+        header = [signature, "    values = frame.values"]
+        header.extend(f"    values{depth} = frame.at({depth}).values" for depth in sorted(self.depths))
+        if self.iterations:
+            # Voltas do laço raiz, somadas mesmo quando o laço termina por RETORNA ou erro
+            self.namespace['record'] = self.unit.native
+            body = ["    " + line for line in body]
+            return '\n'.join(header + ["    iterations = 0", "    try:"] + body +
+                             ["    finally:", "        record[0] += iterations"]) + '\n'
+        return '\n'.join(header + body) + '\n'
+
+    def emit(self, indent, text):
+        self.lines.append("    " * indent + text)
+
+    def constant(self, value):
+        # Objeto usado pelo código gerado (nó, mensagem de erro...)
+        name = f"c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def values(self, depth):
+        if depth == 0:
+            return "values"
+        self.depths.add(depth)
+        return f"values{depth}"
+
+    def load(self, depth, slot, message):
+        # Leitura de variável; o teste de UNDEFINED é omitido quando o slot
+        # certamente já tem valor
+        values = self.values(depth)
+        if depth == 0 and slot in self.defined:
+            return f"{values}[{slot}]"
+        return f"(t if (t := {values}[{slot}]) is not UNDEFINED else undefined({message!r}))"
+
+    # Comandos
+
+    def block(self, block, indent):
+        start = len(self.lines)
+        defined = set(self.defined)
+        for statement in block.statements:
+            self.statement(statement, indent)
+        self.defined = defined
+        if len(self.lines) == start:
+            self.emit(indent, "pass")
+
+    def statement(self, node, indent):
+        kind = type(node)
+        if kind is HotBlockNode or kind is BlockNode:
+            self.block(node, indent)
+        elif kind is VarDecNode:
+            if node.expression:
+                value = self.expression(node.expression)
+            else:
+                value = "''" if node.var_type == 'STR' else "0"
+            self.emit(indent, f"values[{node.slot}] = {value}")
+            self.defined.add(node.slot)
+        elif kind is ArrayDecNode:
+            self.emit(indent, f"values[{node.slot}] = new_array({node.element!r}, {self.expression(node.expression)})")
+            self.defined.add(node.slot)
+        elif kind is AssignmentNode:
+            self.assignment(node, indent)
+        elif kind is StrAppendNode:
+            values = self.values(node.depth)
+            if not (node.depth == 0 and node.slot in self.defined):
+                self.emit(indent, f"if {values}[{node.slot}] is UNDEFINED:")
+                message = f"Variável '{node.var_name}' não definida"
+                self.emit(indent + 1, f"undefined({message!r})")
+            texts = ', '.join(f"str({self.expression(part)})" for part in node.parts)
+            self.emit(indent, f"append({values}, {node.slot}, [{texts}])")
+        elif kind is IndexAssignNode:
+            index = self.expression(node.index)
+            value = self.expression(node.expr)
+            values = self.values(node.depth)
+            self.emit(indent, f"store_index({index}, {value}, {values}[{node.slot}], {node.name!r})")
+        elif kind is PrintNode:
+            self.emit(indent, f"Console.current.write_line({self.expression(node.expr)})")
+        elif kind is IfNode:
+            self.emit(indent, f"if {self.condition(node.condition)}:")
+            self.block(node.true_block, indent + 1)
+            if node.false_block:
+                self.emit(indent, "else:")
+                self.block(node.false_block, indent + 1)
+        elif kind is WhileNode or kind is HotWhileNode:
+            self.while_loop(node, indent)
+        elif kind is ForNode or kind is HotForNode:
+            self.for_loop(node, indent)
+        elif kind is ReturnNode:
+            if not self.in_function:
+                self.emit(indent, "if frame.parent is None:")
+                self.emit(indent + 1, "undefined('RETORNA fora de função')")
+            self.emit(indent, f"frame.return_value = {self.expression(node.expr)}")
+            self.emit(indent, "return RETURN_SIGNAL")
+        elif kind is FuncCallNode or kind is ArrayOpNode:
+            self.emit(indent, self.expression(node))
+        else:
+            # LEIA, FUNCAO, laços em forma fechada...: o próprio nó executa
+            self.emit(indent, f"if {self.constant(node)}.evaluate(frame) is RETURN_SIGNAL:")
+            self.emit(indent + 1, "return RETURN_SIGNAL")
+
+    def assignment(self, node, indent):
+        value = self.expression(node.expr)
+        values = self.values(node.depth)
+        if node.depth == 0 and node.slot in self.defined:
+            self.emit(indent, f"{values}[{node.slot}] = {value}")
+            return
+        self.emit(indent, f"t = {value}")
+        self.emit(indent, f"if {values}[{node.slot}] is UNDEFINED:")
+        message = f"Variável '{node.var_name}' não declarada"
+        self.emit(indent + 1, f"undefined({message!r})")
+        self.emit(indent, f"{values}[{node.slot}] = t")
+
+    def reset_hoisted(self, loop, indent):
+        for slot in loop.hoisted_slots:
+            self.emit(indent, f"values[{slot}] = UNDEFINED")
+
+    def loop_body(self, loop, indent, root):
+        if root and self.iterations:
+            self.emit(indent, "iterations += 1")
+        self.block(loop.block, indent)
+
+    def while_loop(self, loop, indent, resumable=False):
+        if resumable and loop.hoisted_slots:
+            # state: o laço interpretado já reiniciou os içados
+            self.emit(indent, "if state is None:")
+            self.reset_hoisted(loop, indent + 1)
+        elif not resumable:
+            self.reset_hoisted(loop, indent)
+        self.emit(indent, f"while {self.condition(loop.condition)}:")
+        self.loop_body(loop, indent + 1, resumable)
+
+    def for_loop(self, loop, indent, resumable=False):
+        self.loops += 1
+        number = self.loops
+        start, end, step, items = f"start{number}", f"end{number}", f"step{number}", f"items{number}"
+        counter = f"values[{loop.slot}]"
+        if resumable:
+            # state: (fim, passo) do laço interpretado, que já está no meio
+            self.emit(indent, "if state is None:")
+            self.reset_hoisted(loop, indent + 1)
+            self.for_header(loop, indent + 1, start, end, step)
+            self.emit(indent, "else:")
+            self.emit(indent + 1, f"{end}, {step} = state")
+            self.emit(indent + 1, f"{start} = {counter}")
+        else:
+            self.reset_hoisted(loop, indent)
+            self.for_header(loop, indent, start, end, step)
+        if self.counter_untouched(loop):
+            # range() quando o corpo não altera o contador; no fim, o contador
+            # fica com o primeiro valor que não passou no teste, como no laço comum
+            self.emit(indent, f"if type({start}) is int and type({end}) is int and type({step}) is int and {step}:")
+            self.emit(indent + 1, f"{items} = range({start}, {end} + 1, {step}) if {step} > 0 "
+                                  f"else range({start}, {end} - 1, {step})")
+            self.emit(indent, "else:")
+            self.emit(indent + 1, f"{items} = counting(values, {loop.slot}, {end}, {step})")
+        else:
+            self.emit(indent, f"{items} = counting(values, {loop.slot}, {end}, {step})")
+        defined = set(self.defined)
+        self.defined.add(loop.slot)
+        self.emit(indent, f"for {counter} in {items}:")
+        self.loop_body(loop, indent + 1, resumable)
+        self.defined = defined
+        self.defined.add(loop.slot)
+        self.emit(indent, f"if type({items}) is range:")
+        self.emit(indent + 1, f"{counter} = {start} + len({items}) * {step}")
+
+    def for_header(self, loop, indent, start, end, step):
+        self.emit(indent, f"{start} = {self.expression(loop.start_expr)}")
+        self.emit(indent, f"{end} = {self.expression(loop.end_expr)}")
+        self.emit(indent, f"{step} = {self.expression(loop.step_expr) if loop.step_expr else '1'}")
+        self.emit(indent, f"values[{loop.slot}] = {start}")
+
+    def counter_untouched(self, loop):
+        # O corpo não escreve no contador. Chamadas podem escrever em
+        # variáveis globais, então só contam quando o frame é de uma função.
+        global_frame = not self.in_function and self.root.global_level
+        for current in walk(loop.block):
+            if isinstance(current, (AssignmentNode, ReadNode)) and current.depth == 0 and current.slot == loop.slot:
+                return False
+            if isinstance(current, (VarDecNode, ForNode)) and current.slot == loop.slot:
+                return False
+            if isinstance(current, FuncCallNode) and global_frame:
+                return False
+        return True
+
+    # Expressões
+
+    def condition(self, node):
+        # Em SE e ENQUANTO só a verdade importa: comparações ficam sem int()
+        if isinstance(node, RelationalOpNode) and node.op in PYTHON_COMPARISONS:
+            return f"{self.expression(node.left)} {PYTHON_COMPARISONS[node.op]} {self.expression(node.right)}"
+        return self.expression(node)
+
+    def expression(self, node):
+        kind = type(node)
+        if kind is NumberNode or kind is StringNode or kind is BoolNode:
+            return repr(node.value)
+        if kind is IdentifierNode:
+            return self.load(node.depth, node.slot, f"Variável '{node.name}' não definida")
+        if kind is StrBuilderReadNode:
+            return f"read_builder({self.values(node.depth)}, {node.slot}, {node.name!r})"
+        if kind is IntAddNode:
+            return f"({self.expression(node.left)} + {self.expression(node.right)})"
+        if kind is IntSubNode:
+            return f"({self.expression(node.left)} - {self.expression(node.right)})"
+        if kind is IntMulNode:
+            return f"({self.expression(node.left)} * {self.expression(node.right)})"
+        if kind is StrConcatNode:
+            return f"(str({self.expression(node.left)}) + str({self.expression(node.right)}))"
+        if kind is BinOpNode and node.op in ('+', '-', '*', '/'):
+            left = self.expression(node.left)
+            right = self.expression(node.right)
+            if node.op == '+':
+                return f"add({left}, {right})"
+            if node.op == '/':
+                return f"divide({left}, {right})"
+            return f"({left} {node.op} {right})"
+        if kind is UnOpNode and node.op in ('+', '-', '!'):
+            value = self.expression(node.node)
+            return f"(0 if {value} else 1)" if node.op == '!' else f"({node.op}{value})"
+        if (kind is RelationalOpNode or kind is IntCompareNode) and node.op in PYTHON_COMPARISONS:
+            return f"(1 if {self.condition(node)} else 0)"
+        if kind is InvariantNode:
+            return (f"(t if (t := values[{node.slot}]) is not UNDEFINED "
+                    f"else store(values, {node.slot}, {self.expression(node.expr)}))")
+        if kind is FuncCallNode:
+            call_node = self.constant(node)
+            function = (f"(t if (t := {self.values(node.depth)}[{node.slot}]) is {call_node}.cached_function "
+                        f"else resolve({call_node}, t))")
+            args = ''.join(f"{self.expression(arg)}, " for arg in node.args)
+            return f"call({call_node}, {function}, [{args}])"
+        if kind is IndexNode:
+            index = self.expression(node.index)
+            return f"load_index({index}, {self.values(node.depth)}[{node.slot}], {node.name!r})"
+        if kind is ArrayOpNode:
+            args = ''.join(f"{self.expression(arg)}, " for arg in node.args)
+            return f"array_operation({node.op!r}, [{args}])"
+        # Sem tradução: avaliado pelo próprio nó
+        return f"{self.constant(node)}.evaluate(frame)"
+
+class Jit:
+    # Compilação em camadas: corpos de FUNCAO e laços (PARA, ENQUANTO)
+    # começam interpretados pelos nós e contam suas execuções; no limite,
+    # o trecho é traduzido para Python, compilado com compile() e passa a
+    # rodar como função Python. Laços longos trocam de camada no meio, entre
+    # uma volta e outra. Se a tradução ou a compilação falham, o trecho
+    # continua interpretado. Só vale para a execução pela AST.
+    def __init__(self, threshold=DEFAULT_THRESHOLD, measure=False):
+        if threshold < 1:
+            raise Exception("Limite do JIT deve ser positivo")
+        self.threshold = threshold
+        self.measure = measure  # mede tempos para estimar a economia
+        self.units = []
+        # Ativações medidas em curso: tempo gasto em trechos internos
+        self.stack = [[0.0]]
+
+    def install(self, ast):
+        # Troca corpos de função e laços pelas versões que contam execuções
+        pending = [(ast, True)]
+        while pending:
+            root, global_level = pending.pop()
+            for current in walk(root):
+                if isinstance(current, BlockNode):
+                    current.statements = [self.wrap(statement, global_level) for statement in current.statements]
+                elif isinstance(current, FuncDecNode):
+                    unit = self.unit('FUNCAO', f"FUNCAO {current.func_name}", current.line)
+                    current.block = HotBlockNode(current, self, unit)
+                    pending.append((current.block, False))
+
+    def wrap(self, statement, global_level):
+        kind = type(statement)
+        if kind is WhileNode:
+            return HotWhileNode(statement, self, self.unit('ENQUANTO', "ENQUANTO", statement.line), global_level)
+        if kind is ForNode:
+            unit = self.unit('PARA', f"PARA {statement.var_name}", statement.line)
+            return HotForNode(statement, self, unit, global_level)
+        return statement
+
+    def unit(self, kind, label, line):
+        unit = JitUnit(kind, label, line)
+        self.units.append(unit)
+        return unit
+
+    def compile(self, node):
+        # Traduz e compila o trecho de node; False se não for possível
+        unit = node.unit
+        start = perf_counter()
+        translator = Translator(unit, node, self.measure and unit.kind != 'FUNCAO')
+        try:
+            unit.source = translator.source()
+            code = compile(unit.source, f"<jit {unit.label}>", 'exec')
+        except (SyntaxError, RecursionError, MemoryError) as e:
+            unit.failure = str(e) or type(e).__name__
+            return False
+        finally:
+            unit.compile_time += perf_counter() - start
+        namespace = translator.namespace
+        exec(code, namespace)
+        compiled = namespace['unit']
+        if self.measure:
+            compiled = self.measured(compiled, unit.native, unit.kind == 'FUNCAO')
+        node.compiled = compiled
+        return True
+
+    def interpret_call(self, node, symbol_table):
+        unit = node.unit
+        unit.count += 1
+        if unit.count == self.threshold and self.compile(node):
+            return node.compiled(symbol_table)
+        if self.measure:
+            unit.interpreted[0] += 1
+            return self.timed(unit.interpreted, BlockNode.evaluate, node, symbol_table)
+        return BlockNode.evaluate(node, symbol_table)
+
+    def interpret_loop(self, node, symbol_table):
+        unit = node.unit
+        if self.measure:
+            before = unit.count
+            result = self.timed(unit.interpreted, node.interpret, symbol_table)
+            unit.interpreted[0] += unit.count - before
+        else:
+            result = node.interpret(symbol_table)
+        if type(result) is Resume:
+            return node.compiled(symbol_table, result.state)
+        return result
+
+    def timed(self, record, method, *args):
+        # Executa method somando o tempo próprio (sem os trechos internos) em record
+        stack = self.stack
+        frame = [0.0]
+        stack.append(frame)
+        start = perf_counter()
+        try:
+            return method(*args)
+        finally:
+            elapsed = perf_counter() - start
+            stack.pop()
+            stack[-1][0] += elapsed
+            record[1] += elapsed - frame[0]
+
+    def measured(self, compiled, record, count_calls):
+        def run(*args):
+            if count_calls:
+                record[0] += 1
+            return self.timed(record, compiled, *args)
+        return run
+
+    def report(self):
+        compiled = [unit for unit in self.units if unit.source is not None and unit.failure is None]
+        failed = [unit for unit in self.units if unit.failure is not None]
+        compile_time = sum(unit.compile_time for unit in self.units)
+        lines = [f"JIT: {len(compiled)} trechos compilados, {len(failed)} não compiláveis "
+                 f"(limite {self.threshold} execuções), compilação {compile_time * 1000:.2f}ms"]
+        saved_total = 0.0
+        for unit in compiled + failed:
+            where = f" (linha {unit.line})" if unit.line is not None else ""
+            if unit.failure is not None:
+                lines.append(f"  {unit.label}{where}: não compilável, continua interpretado: {unit.failure}")
+                continue
+            line = f"  {unit.label}{where}: compilado"
+            if self.measure:
+                (slow_count, slow_time), (fast_count, fast_time) = unit.interpreted, unit.native
+                runs = "chamadas" if unit.kind == 'FUNCAO' else "voltas"
+                line += (f"; {slow_count} {runs} interpretadas ({self.per_run(slow_time, slow_count)}), "
+                         f"{fast_count} compiladas ({self.per_run(fast_time, fast_count)})")
+                if slow_count and fast_count:
+                    saved = fast_count * slow_time / slow_count - fast_time
+                    saved_total += saved
+                    line += f", economia ~{saved * 1000:.2f}ms"
+            lines.append(line)
+        if self.measure and compiled:
+            # Por trecho: execuções compiladas pelo custo médio interpretado, menos o tempo que levaram
+            lines.append(f"  economia estimada: {(saved_total - compile_time) * 1000:.2f}ms (descontada a compilação)")
+        return '\n'.join(lines)
+
+    @staticmethod
+    def per_run(seconds, count):
+        if not count:
+            return "-"
+        return f"{seconds / count * 1_000_000:.2f}µs cada"
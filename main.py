@@ -1,29 +1,243 @@
 # main.py
 from parser import Parser
-from prepro import PrePro
-from symboltable import SymbolTable
+from source import SourceFile
+from cache import ProgramCache, CACHE_DIR_NAME, DEFAULT_MAX_BYTES
+from symboltable import Frame
+from resolver import Resolver
+from typechecker import TypeChecker
+from optimizer import Optimizer
+from memo import Memoizer
+from jit import Jit, DEFAULT_THRESHOLD
+from parallel import Parallelizer, LoopPool, DEFAULT_MIN_ITERATIONS
+from compiler import Compiler
+from vm import VM, DEFAULT_MAX_DEPTH
+from tokenizer import Tokenizer
+from profiler import Profiler, SORT_KEYS
+from tracer import Tracer, parse_level, parse_sink, OFF
+from console import Console, DEFAULT_BUFFER_SIZE
+import argparse
+import os
+import signal
 import sys
 
-def main():
-    if len(sys.argv) != 2:
-        sys.stderr.write("Uso: python main.py 'caminho_para_o_arquivo.txt'\n")
-        return
+def parse_args(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog='main.py',
+        usage="python main.py [opções] 'caminho_para_o_arquivo.txt'")
+    arg_parser.add_argument('file_path', nargs='?', help='programa a ser executado')
+    arg_parser.add_argument('--vm', action='store_true',
+                            help='compila para bytecode e executa na máquina virtual de pilha')
+    arg_parser.add_argument('--vm-profundidade', type=int, default=DEFAULT_MAX_DEPTH, metavar='N',
+                            help='chamadas aninhadas permitidas na máquina virtual')
+    arg_parser.add_argument('-O', '--otimizar', action='store_true',
+                            help='dobra constantes, remove ramos mortos e iça invariantes de laços')
+    arg_parser.add_argument('--relatorio-otimizacao', action='store_true',
+                            help='lista no stderr as transformações feitas pelo otimizador')
+    arg_parser.add_argument('--memo-tamanho', type=int, default=1024, metavar='N',
+                            help='entradas do cache LRU de cada função pura (0 desliga a memoização)')
+    arg_parser.add_argument('--memo-estatisticas', action='store_true',
+                            help='mostra no stderr acertos e falhas dos caches de funções puras')
+    arg_parser.add_argument('--jit', action='store_true',
+                            help='compila para Python as funções e laços executados muitas vezes')
+    arg_parser.add_argument('--jit-limite', type=int, default=DEFAULT_THRESHOLD, metavar='N',
+                            help='chamadas ou voltas antes de compilar um trecho')
+    arg_parser.add_argument('--jit-estatisticas', action='store_true',
+                            help='mostra no stderr o que foi compilado e o tempo economizado')
+    arg_parser.add_argument('--paralelo', type=int, default=0, metavar='N',
+                            help='divide entre N processos os laços PARA com voltas independentes (0 desliga)')
+    arg_parser.add_argument('--paralelo-minimo', type=int, default=DEFAULT_MIN_ITERATIONS, metavar='N',
+                            help='voltas mínimas para executar um laço em paralelo')
+    arg_parser.add_argument('--trace', default='desligado', metavar='NIVEL',
+                            help='rastreamento: desligado, funcoes, comandos ou expressoes (0-3)')
+    arg_parser.add_argument('--trace-destino', default='stderr', metavar='DESTINO',
+                            help="destino dos eventos: stderr, arquivo:<caminho> ou memoria:<capacidade>")
+    arg_parser.add_argument('--trace-amostra', type=int, default=1, metavar='N',
+                            help='emite apenas um a cada N eventos')
+    arg_parser.add_argument('--buffer-saida', type=int, metavar='N',
+                            help='caracteres acumulados antes de escrever a saída (0 escreve a cada IMPRIME; '
+                                 f'padrão: 0 num terminal, {DEFAULT_BUFFER_SIZE} nos demais destinos)')
+    arg_parser.add_argument('--sem-tipos', action='store_true',
+                            help='não verifica tipos antes da execução (nós genéricos)')
+    arg_parser.add_argument('--perfil', action='store_true',
+                            help='mede tempo e execuções de cada comando e função (relatório no stderr)')
+    arg_parser.add_argument('--perfil-ordem', choices=sorted(SORT_KEYS), default='total',
+                            help='ordenação do relatório de perfil')
+    arg_parser.add_argument('--perfil-pilhas', metavar='ARQUIVO',
+                            help='grava as pilhas do perfil no formato "collapsed" (flamegraph)')
+    arg_parser.add_argument('--sem-cache', action='store_true',
+                            help='não lê nem grava a AST em cache (__lcache__)')
+    arg_parser.add_argument('--cache-dir', metavar='DIR',
+                            help='diretório do cache (padrão: __lcache__ ao lado do programa)')
+    arg_parser.add_argument('--cache-max', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), metavar='MB',
+                            help='tamanho máximo do cache em MB')
+    arg_parser.add_argument('--limpar-cache', action='store_true',
+                            help='apaga o cache (do programa indicado ou do diretório atual) e sai')
+    options = arg_parser.parse_args(argv)
+    if options.file_path is None and not options.limpar_cache:
+        arg_parser.error("informe o caminho do programa")
+    if options.perfil_pilhas:
+        options.perfil = True
+    if options.perfil and options.vm:
+        arg_parser.error("--perfil mede a execução pela AST; não pode ser usado com --vm")
+    if options.jit_estatisticas:
+        options.jit = True
+    if options.jit and options.vm:
+        arg_parser.error("--jit compila trechos da AST; não pode ser usado com --vm")
+    if options.jit and options.perfil:
+        arg_parser.error("--jit não pode ser usado com --perfil")
+    if options.paralelo < 0:
+        arg_parser.error("--paralelo deve ser positivo (0 desliga)")
+    if options.paralelo and (options.vm or options.jit or options.perfil):
+        arg_parser.error("--paralelo executa laços da AST; não pode ser usado com --vm, --jit ou --perfil")
+    return options
+
+def load_program(file_path, cache, source=None):
+    # AST do cache quando a entrada é válida; senão analisa e grava.
+    # source: código já em memória (servidor); senão o arquivo é mapeado
+    if source is not None:
+        return parse_cached(source, cache)
+    with SourceFile(file_path) as code:
+        return parse_cached(code, cache)
+
+def parse_cached(code, cache):
+    if cache is None:
+        return Parser.run(code)
+    digest = ProgramCache.digest(code)
+    ast = cache.load(digest)
+    if ast is None:
+        ast = Parser.run(code)
+        cache.store(digest, ast)
+    return ast
+
+def clear_cache(options):
+    if options.cache_dir is not None:
+        directory = options.cache_dir
+    else:
+        base = os.path.dirname(os.path.abspath(options.file_path)) if options.file_path else os.getcwd()
+        directory = os.path.join(base, CACHE_DIR_NAME)
+    count = ProgramCache(directory).clear()
+    print(f"Cache limpo: {count} entradas removidas de {directory}")
 
-    file_path = sys.argv[1]
+def run(options, source=None, program_cache=None):
+    # Executa o programa de options.file_path (ou o código em source, com
+    # file_path só como nome); erros sobem como exceções. program_cache
+    # substitui o cache em disco (o servidor usa um cache em memória).
+    file_path = options.file_path
+    tracer = None
+    profiler = None
+    jit = None
+    caches = []
+    previous_console = Console.current
+    previous_pool = LoopPool.current
+    Console.current = Console(sys.stdin, sys.stdout, options.buffer_saida)
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            code = file.read()
+        # Parsing direto do arquivo mapeado em memória (ou AST do cache);
+        # comentários e espaços são descartados pelo próprio Tokenizer
+        cache = None
+        if not options.sem_cache:
+            cache = program_cache
+            if cache is None:
+                cache = ProgramCache.for_source(file_path, options.cache_dir, options.cache_max * 1024 * 1024)
+        ast = load_program(file_path, cache, source)
+
+        # Linhas dos comandos, para os relatórios de perfil e do JIT
+        if options.perfil or options.jit_estatisticas:
+            if source is not None:
+                Parser.assign_lines(ast, Tokenizer(source))
+            else:
+                with SourceFile(file_path) as code:
+                    Parser.assign_lines(ast, Tokenizer(code))
+
+        # Otimização da AST
+        if options.otimizar:
+            ast, report = Optimizer.run(ast)
+            if options.relatorio_otimizacao:
+                sys.stderr.write(f"Otimizador: {len(report)} transformações\n")
+                for line in report:
+                    sys.stderr.write(f"  {line}\n")
+
+        # Resolução de nomes para slots
+        global_scope = Resolver.run(ast)
+
+        # Verificação de tipos e especialização dos nós
+        if not options.sem_tipos:
+            TypeChecker.run(ast)
 
-        # Pré-processamento
-        filtered_code = PrePro.filter(code)
+        # Memoização de funções puras
+        if options.memo_tamanho > 0:
+            caches = Memoizer.run(ast, options.memo_tamanho)
 
-        # Parsing
-        ast = Parser.run(filtered_code)
+        # Rastreamento (só é instalado quando ligado)
+        level = parse_level(options.trace)
+        if level != OFF and options.jit:
+            raise Exception("--jit não pode ser usado com --trace")
+        if level != OFF and options.paralelo:
+            raise Exception("--paralelo não pode ser usado com --trace")
+        if level != OFF:
+            if options.trace_amostra < 1:
+                raise Exception("Amostragem do rastreamento deve ser positiva")
+            tracer = Tracer(level, parse_sink(options.trace_destino), options.trace_amostra)
+            tracer.install()
+
+        # Compilação dos trechos executados muitas vezes
+        if options.jit:
+            jit = Jit(options.jit_limite, options.jit_estatisticas)
+            jit.install(ast)
+
+        # Laços PARA com voltas independentes divididos entre processos
+        if options.paralelo:
+            report = Parallelizer.run(ast)
+            if options.relatorio_otimizacao:
+                sys.stderr.write(f"Paralelização: {len(report)} laços\n")
+                for line in report:
+                    sys.stderr.write(f"  {line}\n")
+            LoopPool.current = LoopPool(options.paralelo, options.paralelo_minimo)
+
+        if options.perfil:
+            profiler = Profiler()
+            profiler.install(ast)
 
         # Execução
-        symbol_table = SymbolTable()
-        ast.evaluate(symbol_table)
+        if options.vm:
+            VM(Compiler.run(ast, global_scope), options.vm_profundidade).run()
+        else:
+            symbol_table = Frame(global_scope.size)
+            ast.evaluate(symbol_table)
+
+    finally:
+        # A saída pendente é escrita antes de qualquer mensagem de erro
+        Console.current.flush()
+        Console.current = previous_console
+        if LoopPool.current is not previous_pool:
+            LoopPool.current.shutdown()
+            LoopPool.current = previous_pool
+        if profiler is not None:
+            profiler.uninstall()
+            sys.stderr.write(profiler.report(options.perfil_ordem) + '\n')
+            if options.perfil_pilhas:
+                profiler.write_collapsed(options.perfil_pilhas)
+        if tracer is not None:
+            tracer.uninstall()
+        if jit is not None and options.jit_estatisticas:
+            sys.stderr.write(jit.report() + '\n')
+        if options.memo_estatisticas:
+            for cache in caches:
+                sys.stderr.write(f"Memo {cache.stats()}\n")
+
+def on_terminate(signum, frame):
+    # SIGTERM (timeout, supervisor): sai pelo caminho normal, cujo finally
+    # escreve a saída ainda no buffer
+    sys.exit(128 + signum)
 
+def main():
+    signal.signal(signal.SIGTERM, on_terminate)
+    options = parse_args(sys.argv[1:])
+    if options.limpar_cache:
+        clear_cache(options)
+        return
+
+    try:
+        run(options)
     except FileNotFoundError:
         sys.stderr.write("Erro: Arquivo não encontrado\n")
     except Exception as e:
@@ -0,0 +1,113 @@
+# memo.py
+from collections import OrderedDict
+from node import *
+
+class MemoCache:
+    # Cache LRU de resultados de uma função pura, indexado pelos argumentos
+    def __init__(self, name, max_size):
+        self.name = name
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(args):
+        # Só INT e STR entram na chave: 1 e 1.0 têm o mesmo hash, mas não
+        # produzem o mesmo resultado (ex.: concatenação com texto)
+        for value in args:
+            if type(value) is not int and type(value) is not str:
+                return None
+        return tuple(args)
+
+    def lookup(self, key):
+        entries = self.entries
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return True, entries[key]
+        self.misses += 1
+        return False, None
+
+    def store(self, key, value):
+        entries = self.entries
+        entries[key] = value
+        if len(entries) > self.max_size:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = 100.0 * self.hits / total if total else 0.0
+        return (f"{self.name}: {self.hits} acertos, {self.misses} falhas ({rate:.1f}%), "
+                f"{len(self.entries)}/{self.max_size} entradas, {self.evictions} descartes")
+
+class Memoizer:
+    # Análise de pureza sobre as declarações FUNCAO. Uma função é pura se
+    # não usa IMPRIME nem LEIA, não lê nem escreve variáveis globais (nem
+    # cópias locais delas), não declara funções e só chama funções puras
+    # (declaradas uma única vez).
+    # Precisa rodar depois do Resolver, que indica o que é global (depth > 0).
+    @staticmethod
+    def run(ast, max_size):
+        declarations = Memoizer.declarations(ast)
+        pure = Memoizer.pure_declarations(declarations)
+        caches = []
+        for declaration in declarations:
+            if declaration in pure:
+                declaration.memo = MemoCache(declaration.func_name, max_size)
+                caches.append(declaration.memo)
+        return caches
+
+    @staticmethod
+    def pure_declarations(declarations):
+        by_name = {}
+        for declaration in declarations:
+            by_name.setdefault(declaration.func_name, []).append(declaration)
+
+        pure = {declaration for declaration in declarations if Memoizer.locally_pure(declaration)}
+
+        # Ponto fixo: remove funções que chamam algo impuro
+        changed = True
+        while changed:
+            changed = False
+            for declaration in list(pure):
+                for callee in Memoizer.callees(declaration):
+                    candidates = by_name.get(callee, [])
+                    if len(candidates) != 1 or candidates[0] not in pure:
+                        pure.discard(declaration)
+                        changed = True
+                        break
+        return pure
+
+    @staticmethod
+    def declarations(ast):
+        found = []
+        pending = [ast]
+        while pending:
+            for current in walk(pending.pop()):
+                if isinstance(current, FuncDecNode):
+                    found.append(current)
+                    pending.append(current.block)
+        return found
+
+    @staticmethod
+    def locally_pure(declaration):
+        # Vetores são passados por referência: o resultado depende do conteúdo
+        if any(element_type(param_type) for param_type, _ in declaration.params):
+            return False
+        # A cópia local começa com o valor global do momento da chamada
+        if declaration.shadow_slots:
+            return False
+        for current in walk(declaration.block):
+            if isinstance(current, (PrintNode, ReadNode, FuncDecNode)):
+                return False
+            if isinstance(current, (IdentifierNode, AssignmentNode, IndexNode, IndexAssignNode)) and current.depth != 0:
+                return False
+        return True
+
+    @staticmethod
+    def callees(declaration):
+        return {current.func_name for current in walk(declaration.block)
+                if isinstance(current, FuncCallNode)}
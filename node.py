@@ -1,49 +1,83 @@
 # node.py
 from abc import ABC, abstractmethod
-from symboltable import SymbolTable
+from array import array
+import operator
+from symboltable import Frame, UNDEFINED, binding_plan
+from console import Console
+from closedform import for_iterations, while_iterations, progression_sum
+
+# Resultado de um comando que executou RETORNA: o valor fica no frame
+# (return_value) e o marcador sobe pelos blocos até a chamada da função
+RETURN_SIGNAL = object()
 
 class Node(ABC):
+    # Cada classe de nó declara seus campos em __slots__: sem o __dict__ de
+    # cada instância, programas com centenas de milhares de comandos ocupam
+    # bem menos memória. Subclasses fora deste módulo também devem declarar
+    # e todas chamam Node.__init__, que preenche position e line.
+    #   position: índice do primeiro token do comando (preenchido pelo Parser)
+    #   line: linha no código-fonte (preenchida por Parser.assign_lines)
+    __slots__ = ('position', 'line')
+
+    def __init__(self):
+        self.position = None
+        self.line = None
+
     @abstractmethod
     def evaluate(self, symbol_table):
         pass
 
 class NumberNode(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
+        super().__init__()
         self.value = value
 
     def evaluate(self, symbol_table):
-        print(f"DEBUG: Avaliando NumberNode com valor {self.value}")
         return self.value
 
 class StringNode(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
+        super().__init__()
         self.value = value
 
     def evaluate(self, symbol_table):
-        print(f"DEBUG: Avaliando StringNode com valor '{self.value}'")
         return self.value
 
 class BoolNode(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
+        super().__init__()
         self.value = value  # 1 para True, 0 para False
 
     def evaluate(self, symbol_table):
-        print(f"DEBUG: Avaliando BoolNode com valor {self.value}")
         return self.value
 
 class IdentifierNode(Node):
+    __slots__ = ('name', 'depth', 'slot')
+
     def __init__(self, name):
+        super().__init__()
         self.name = name
+        self.depth = None  # preenchidos pelo Resolver
+        self.slot = None
 
     def evaluate(self, symbol_table):
-        var = symbol_table.get(self.name)
-        if var is None:
+        frame = symbol_table if self.depth == 0 else symbol_table.at(self.depth)
+        value = frame.values[self.slot]
+        if value is UNDEFINED:
             raise Exception(f"Variável '{self.name}' não definida")
-        print(f"DEBUG: Avaliando IdentifierNode '{self.name}' com valor {var['value']}")
-        return var['value']
+        return value
 
 class BinOpNode(Node):
+    __slots__ = ('left', 'op', 'right')
+
     def __init__(self, left, op, right):
+        super().__init__()
         self.left = left
         self.op = op  # '+', '-', '*', '/', 'AND', 'OR'
         self.right = right
@@ -51,7 +85,6 @@ class BinOpNode(Node):
     def evaluate(self, symbol_table):
         left_value = self.left.evaluate(symbol_table)
         right_value = self.right.evaluate(symbol_table)
-        print(f"DEBUG: Avaliando BinOpNode: {left_value} {self.op} {right_value}")
 
         if self.op == '+':
             if isinstance(left_value, str) or isinstance(right_value, str):
@@ -69,17 +102,57 @@ class BinOpNode(Node):
         else:
             raise Exception(f"Operador desconhecido: {self.op}")
 
-        print(f"DEBUG: Resultado de BinOpNode: {result}")
         return result
 
+# Variantes especializadas pelo TypeChecker: os tipos dos operandos já
+# foram verificados, então a operação é feita sem testes
+class IntAddNode(BinOpNode):
+    __slots__ = ()
+
+    def __init__(self, left, right):
+        super().__init__(left, '+', right)
+
+    def evaluate(self, symbol_table):
+        return self.left.evaluate(symbol_table) + self.right.evaluate(symbol_table)
+
+class IntSubNode(BinOpNode):
+    __slots__ = ()
+
+    def __init__(self, left, right):
+        super().__init__(left, '-', right)
+
+    def evaluate(self, symbol_table):
+        return self.left.evaluate(symbol_table) - self.right.evaluate(symbol_table)
+
+class IntMulNode(BinOpNode):
+    __slots__ = ()
+
+    def __init__(self, left, right):
+        super().__init__(left, '*', right)
+
+    def evaluate(self, symbol_table):
+        return self.left.evaluate(symbol_table) * self.right.evaluate(symbol_table)
+
+class StrConcatNode(BinOpNode):
+    # Ao menos um lado é sempre texto: equivale a str(esquerda) + str(direita)
+    __slots__ = ()
+
+    def __init__(self, left, right):
+        super().__init__(left, '+', right)
+
+    def evaluate(self, symbol_table):
+        return f"{self.left.evaluate(symbol_table)}{self.right.evaluate(symbol_table)}"
+
 class UnOpNode(Node):
+    __slots__ = ('op', 'node')
+
     def __init__(self, op, node):
+        super().__init__()
         self.op = op  # '+', '-', '!'
         self.node = node
 
     def evaluate(self, symbol_table):
         value = self.node.evaluate(symbol_table)
-        print(f"DEBUG: Avaliando UnOpNode: {self.op}{value}")
         if self.op == '+':
             result = +value
         elif self.op == '-':
@@ -88,28 +161,96 @@ class UnOpNode(Node):
             result = int(not value)
         else:
             raise Exception(f"Operador unário desconhecido: {self.op}")
-        print(f"DEBUG: Resultado de UnOpNode: {result}")
         return result
 
 class AssignmentNode(Node):
+    __slots__ = ('var_name', 'expr', 'depth', 'slot')
+
     def __init__(self, var_name, expr):
+        super().__init__()
         self.var_name = var_name
         self.expr = expr
+        self.depth = None
+        self.slot = None
 
     def evaluate(self, symbol_table):
         value = self.expr.evaluate(symbol_table)
-        var_info = symbol_table.get(self.var_name)
-        if var_info is None:
+        frame = symbol_table if self.depth == 0 else symbol_table.at(self.depth)
+        if frame.values[self.slot] is UNDEFINED:
             raise Exception(f"Variável '{self.var_name}' não declarada")
-        symbol_table.set(self.var_name, value, var_type=var_info['type'])
-        print(f"DEBUG: Atribuição: {self.var_name} = {value}")
+        frame.values[self.slot] = value
+        return value
+
+class StrBuilder:
+    # Valor de uma variável STR que cresce por 'x RECEBE x + ...': os pedaços
+    # se acumulam em uma lista e só são juntados quando a variável é lida,
+    # então montar um texto grande em um laço custa tempo linear. Nunca sai
+    # do slot da variável: toda leitura passa por StrBuilderReadNode.
+    def __init__(self, pieces):
+        self.pieces = pieces
+
+class StrBuilderReadNode(IdentifierNode):
+    # Leitura de uma variável que pode guardar um StrBuilder (ver TypeChecker)
+    __slots__ = ()
+
+    def evaluate(self, symbol_table):
+        frame = symbol_table if self.depth == 0 else symbol_table.at(self.depth)
+        value = frame.values[self.slot]
+        if type(value) is StrBuilder:
+            value = ''.join(value.pieces)
+            frame.values[self.slot] = value
+        elif value is UNDEFINED:
+            raise Exception(f"Variável '{self.name}' não definida")
         return value
 
+def appended_parts(assignment):
+    # Para 'x RECEBE x + a + b ...' (soma associada à esquerda), [a, b, ...];
+    # senão None
+    parts = []
+    expr = assignment.expr
+    while isinstance(expr, BinOpNode) and expr.op == '+':
+        parts.append(expr.right)
+        expr = expr.left
+    if not parts or not isinstance(expr, IdentifierNode) or expr.name != assignment.var_name:
+        return None
+    parts.reverse()
+    return parts
+
+class StrAppendNode(AssignmentNode):
+    # 'x RECEBE x + a + b ...' com x do tipo STR e as partes sem chamadas:
+    # acrescenta os textos ao StrBuilder de x em vez de copiar o texto inteiro
+    __slots__ = ('parts',)
+
+    def __init__(self, assignment):
+        super().__init__(assignment.var_name, assignment.expr)
+        self.depth, self.slot = assignment.depth, assignment.slot
+        self.position, self.line = assignment.position, assignment.line
+        self.parts = appended_parts(assignment)
+
+    def evaluate(self, symbol_table):
+        frame = symbol_table if self.depth == 0 else symbol_table.at(self.depth)
+        values = frame.values
+        if values[self.slot] is UNDEFINED:
+            raise Exception(f"Variável '{self.var_name}' não definida")
+        texts = [f"{part.evaluate(symbol_table)}" for part in self.parts]
+        current = values[self.slot]
+        if type(current) is StrBuilder:
+            current.pieces.extend(texts)
+        else:
+            values[self.slot] = StrBuilder([f"{current}"] + texts)
+
 class VarDecNode(Node):
+    __slots__ = ('var_type', 'name', 'expression', 'slot', 'argument')
+
     def __init__(self, var_type, name, expression=None):
+        super().__init__()
         self.var_type = var_type  # 'INT', 'STR', 'BOOL'
         self.name = name
         self.expression = expression
+        self.slot = None
+        # (parâmetro, função) quando a declaração liga um argumento de uma
+        # chamada expandida pelo Optimizer
+        self.argument = None
 
     def evaluate(self, symbol_table):
         if self.expression:
@@ -121,113 +262,310 @@ class VarDecNode(Node):
                 value = ''
             elif self.var_type == 'BOOL':
                 value = 0
-        symbol_table.set(self.name, value, self.var_type)
-        print(f"DEBUG: Declaração de variável: {self.var_type} {self.name} = {value}")
+        symbol_table.values[self.slot] = value
 
 class PrintNode(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr):
+        super().__init__()
         self.expr = expr
 
     def evaluate(self, symbol_table):
         value = self.expr.evaluate(symbol_table)
-        print(f"DEBUG: PrintNode com valor: {value}")
-        print(value)
+        Console.current.write_line(value)
 
 class ReadNode(Node):
+    __slots__ = ('name', 'depth', 'slot', 'var_type')
+
     def __init__(self, name):
+        super().__init__()
         self.name = name
+        self.depth = None
+        self.slot = None
+        self.var_type = None  # tipo declarado, resolvido antes da execução
 
     def evaluate(self, symbol_table):
-        value = input()
-        var = symbol_table.get(self.name)
-        if var is None:
+        value = Console.current.read_line()
+        frame = symbol_table if self.depth == 0 else symbol_table.at(self.depth)
+        if frame.values[self.slot] is UNDEFINED:
             raise Exception(f"Variável '{self.name}' não definida")
-        var_type = var['type']
-        if var_type == 'INT':
+        if self.var_type == 'INT':
             value = int(value)
-        elif var_type == 'BOOL':
+        elif self.var_type == 'BOOL':
             value = int(value)
-        symbol_table.set(self.name, value)
-        print(f"DEBUG: ReadNode: {self.name} = {value}")
+        frame.values[self.slot] = value
+        return value
+
+class ReadIntNode(ReadNode):
+    # LEIA em variável INT ou BOOL
+    __slots__ = ()
+
+    def evaluate(self, symbol_table):
+        value = Console.current.read_line()
+        frame = symbol_table if self.depth == 0 else symbol_table.at(self.depth)
+        if frame.values[self.slot] is UNDEFINED:
+            raise Exception(f"Variável '{self.name}' não definida")
+        value = int(value)
+        frame.values[self.slot] = value
+        return value
+
+class ReadStrNode(ReadNode):
+    # LEIA em variável STR
+    __slots__ = ()
+
+    def evaluate(self, symbol_table):
+        value = Console.current.read_line()
+        frame = symbol_table if self.depth == 0 else symbol_table.at(self.depth)
+        if frame.values[self.slot] is UNDEFINED:
+            raise Exception(f"Variável '{self.name}' não definida")
+        frame.values[self.slot] = value
         return value
 
 class IfNode(Node):
+    __slots__ = ('condition', 'true_block', 'false_block')
+
     def __init__(self, condition, true_block, false_block=None):
+        super().__init__()
         self.condition = condition
         self.true_block = true_block
         self.false_block = false_block
 
     def evaluate(self, symbol_table):
         condition_value = self.condition.evaluate(symbol_table)
-        print(f"DEBUG: IfNode condição avaliada como {condition_value}")
         if condition_value:
-            print(f"DEBUG: Executando bloco 'verdadeiro' do IfNode")
             return self.true_block.evaluate(symbol_table)
         elif self.false_block:
-            print(f"DEBUG: Executando bloco 'falso' do IfNode")
             return self.false_block.evaluate(symbol_table)
 
 class WhileNode(Node):
+    __slots__ = ('condition', 'block', 'hoisted', 'hoisted_slots')
+
     def __init__(self, condition, block):
+        super().__init__()
         self.condition = condition
         self.block = block
+        self.hoisted = []  # temporários de InvariantNode, preenchidos pelo Optimizer
+        self.hoisted_slots = []
 
     def evaluate(self, symbol_table):
-        print(f"DEBUG: Entrando no WhileNode")
+        for slot in self.hoisted_slots:
+            symbol_table.values[slot] = UNDEFINED
         while self.condition.evaluate(symbol_table):
-            self.block.evaluate(symbol_table)
-        print(f"DEBUG: Saindo do WhileNode")
+            if self.block.evaluate(symbol_table) is RETURN_SIGNAL:
+                return RETURN_SIGNAL
 
 class ForNode(Node):
+    __slots__ = ('var_name', 'start_expr', 'end_expr', 'step_expr', 'block', 'slot', 'hoisted', 'hoisted_slots')
+
     def __init__(self, var_name, start_expr, end_expr, step_expr, block):
+        super().__init__()
         self.var_name = var_name
         self.start_expr = start_expr
         self.end_expr = end_expr
         self.step_expr = step_expr
         self.block = block
+        self.slot = None
+        self.hoisted = []
+        self.hoisted_slots = []
 
     def evaluate(self, symbol_table):
+        for slot in self.hoisted_slots:
+            symbol_table.values[slot] = UNDEFINED
         start_value = self.start_expr.evaluate(symbol_table)
         end_value = self.end_expr.evaluate(symbol_table)
         if self.step_expr:
             step_value = self.step_expr.evaluate(symbol_table)
         else:
             step_value = 1
+        return self.iterate(symbol_table, start_value, end_value, step_value)
 
-        symbol_table.set(self.var_name, start_value, 'INT')
-        print(f"DEBUG: Iniciando ForNode com {self.var_name} = {start_value}, até {end_value}, passo {step_value}")
+    def iterate(self, symbol_table, start_value, end_value, step_value):
+        # As voltas do laço, com os limites já avaliados
+        values = symbol_table.values
+        slot = self.slot
+        values[slot] = start_value
 
         if step_value > 0:
-            while symbol_table.get(self.var_name)['value'] <= end_value:
-                self.block.evaluate(symbol_table)
-                current_value = symbol_table.get(self.var_name)['value']
-                symbol_table.set(self.var_name, current_value + step_value)
-                print(f"DEBUG: ForNode {self.var_name} incrementado para {current_value + step_value}")
+            while values[slot] <= end_value:
+                if self.block.evaluate(symbol_table) is RETURN_SIGNAL:
+                    return RETURN_SIGNAL
+                current_value = values[slot]
+                values[slot] = current_value + step_value
+        else:
+            while values[slot] >= end_value:
+                if self.block.evaluate(symbol_table) is RETURN_SIGNAL:
+                    return RETURN_SIGNAL
+                current_value = values[slot]
+                values[slot] = current_value + step_value
+
+def apply_reductions(reductions, symbol_table, var_values, var_slot, first, step, count):
+    # Aplica de uma vez o efeito de count voltas das acumulações do laço.
+    # Cada redução é (atribuição, tipo, lado, grau, deslocamento): tipo '+'
+    # ou '-' soma o polinômio E da variável do laço (o lado de atribuição.expr
+    # que não é o acumulador); '*' multiplica por um fator invariante. O
+    # deslocamento (0 ou 1, em passos) vale para comandos que vêm depois do
+    # avanço do contador de um ENQUANTO.
+    # Nada é alterado se algum valor não for inteiro (retorna False).
+    updates = []
+    for assignment, kind, side, degree, offset in reductions:
+        frame = symbol_table if assignment.depth == 0 else symbol_table.at(assignment.depth)
+        current = frame.values[assignment.slot]
+        if type(current) is not int:
+            return False
+        operand = getattr(assignment.expr, side)
+        if kind == '*':
+            factor = operand.evaluate(symbol_table) if count else 1
+            if type(factor) is not int:
+                return False
+            updates.append((frame.values, assignment.slot, kind, factor))
+            continue
+        samples = []
+        if count:
+            for index in range(degree + 1):
+                var_values[var_slot] = first + (offset + index) * step
+                value = operand.evaluate(symbol_table)
+                if type(value) is not int:
+                    return False
+                samples.append(value)
+        total = progression_sum(samples, count)
+        updates.append((frame.values, assignment.slot, kind, -total if kind == '-' else total))
+    for values, slot, kind, amount in updates:
+        if kind == '*':
+            values[slot] = values[slot] * amount ** count
         else:
-            while symbol_table.get(self.var_name)['value'] >= end_value:
-                self.block.evaluate(symbol_table)
-                current_value = symbol_table.get(self.var_name)['value']
-                symbol_table.set(self.var_name, current_value + step_value)
-                print(f"DEBUG: ForNode {self.var_name} decrementado para {current_value + step_value}")
+            values[slot] = values[slot] + amount
+    return True
+
+class ReductionForNode(ForNode):
+    # PARA cujo corpo só acumula, em variáveis inteiras, polinômios da
+    # variável do laço (ou multiplica por um fator invariante): executado em
+    # forma fechada, com o mesmo resultado da execução volta a volta.
+    # Com valores não inteiros, recai no laço comum.
+    __slots__ = ('reductions',)
+
+    def __init__(self, loop, reductions):
+        super().__init__(loop.var_name, loop.start_expr, loop.end_expr, loop.step_expr, loop.block)
+        self.position = loop.position
+        self.line = loop.line
+        self.reductions = reductions
 
-        print(f"DEBUG: Saindo do ForNode")
+    def evaluate(self, symbol_table):
+        if self.closed_form(symbol_table):
+            return None
+        return super().evaluate(symbol_table)
+
+    def closed_form(self, symbol_table):
+        values = symbol_table.values
+        for slot in self.hoisted_slots:
+            values[slot] = UNDEFINED
+        start = self.start_expr.evaluate(symbol_table)
+        end = self.end_expr.evaluate(symbol_table)
+        step = self.step_expr.evaluate(symbol_table) if self.step_expr else 1
+        if type(start) is not int or type(end) is not int or type(step) is not int:
+            return False
+        count = for_iterations(start, end, step)
+        if count is None:
+            return False
+        if not apply_reductions(self.reductions, symbol_table, values, self.slot, start, step, count):
+            return False
+        values[self.slot] = start + count * step
+        return True
+
+class ReductionWhileNode(WhileNode):
+    # ENQUANTO controlado por contador ('contador MENOR limite', com
+    # 'contador RECEBE contador + passo' no corpo) cujo corpo só acumula:
+    # executado em forma fechada como ReductionForNode
+    __slots__ = ('counter_side', 'step_index', 'step_side', 'reductions')
+
+    def __init__(self, loop, counter_side, step_index, step_side, reductions):
+        super().__init__(loop.condition, loop.block)
+        self.position = loop.position
+        self.line = loop.line
+        self.counter_side = counter_side  # lado da condição com o contador
+        self.step_index = step_index      # comando do corpo que avança o contador
+        self.step_side = step_side        # lado da expressão desse comando com o passo
+        self.reductions = reductions
+
+    def evaluate(self, symbol_table):
+        if self.closed_form(symbol_table):
+            return None
+        return super().evaluate(symbol_table)
+
+    def closed_form(self, symbol_table):
+        values = symbol_table.values
+        for slot in self.hoisted_slots:
+            values[slot] = UNDEFINED
+        condition = self.condition
+        counter = getattr(condition, self.counter_side)
+        counter_values = (symbol_table if counter.depth == 0 else symbol_table.at(counter.depth)).values
+        first = counter_values[counter.slot]
+        bound = (condition.right if self.counter_side == 'left' else condition.left).evaluate(symbol_table)
+        update = self.block.statements[self.step_index].expr
+        try:
+            # O laço comum só avalia o passo se entrar no corpo: um erro aqui
+            # fica para ele reportar (ou não)
+            step = getattr(update, self.step_side).evaluate(symbol_table)
+        except Exception:
+            return False
+        if type(first) is not int or type(bound) is not int or type(step) is not int:
+            return False
+        if update.op == '-':
+            step = -step
+        op = condition.op if self.counter_side == 'left' else MIRRORED_OPS[condition.op]
+        count = while_iterations(op, first, bound, step)
+        if count is None:
+            return False
+        try:
+            done = apply_reductions(self.reductions, symbol_table, counter_values, counter.slot, first, step, count)
+        finally:
+            counter_values[counter.slot] = first
+        if not done:
+            return False
+        counter_values[counter.slot] = first + count * step
+        return True
+
+# Operador equivalente com os lados trocados ('limite MAIOR contador' == 'contador MENOR limite')
+MIRRORED_OPS = {'MENOR': 'MAIOR', 'MAIOR': 'MENOR', 'MENORIGUAL': 'MAIORIGUAL',
+                'MAIORIGUAL': 'MENORIGUAL', 'IGUAL': 'IGUAL', 'DIFERENTE': 'DIFERENTE'}
+
+class InvariantNode(Node):
+    # Expressão invariante de um laço: avaliada na primeira vez que o laço
+    # precisa dela e reaproveitada até o laço ser reiniciado
+    __slots__ = ('name', 'expr', 'slot')
+
+    def __init__(self, name, expr):
+        super().__init__()
+        self.name = name
+        self.expr = expr
+        self.slot = None
+
+    def evaluate(self, symbol_table):
+        values = symbol_table.values
+        value = values[self.slot]
+        if value is UNDEFINED:
+            value = self.expr.evaluate(symbol_table)
+            values[self.slot] = value
+        return value
 
 class BlockNode(Node):
+    __slots__ = ('statements',)
+
     def __init__(self, statements):
+        super().__init__()
         self.statements = statements
 
     def evaluate(self, symbol_table):
-        print(f"DEBUG: Entrando em BlockNode")
         for statement in self.statements:
-            result = statement.evaluate(symbol_table)
-            if isinstance(result, ReturnException):
-                print(f"DEBUG: ReturnException capturada em BlockNode")
-                raise result  # Re-lança a exceção para propagar até a chamada da função
-        print(f"DEBUG: Saindo de BlockNode")
+            if statement.evaluate(symbol_table) is RETURN_SIGNAL:
+                return RETURN_SIGNAL
         return None
 
 class RelationalOpNode(Node):
+    __slots__ = ('left', 'op', 'right')
+
     def __init__(self, left, op, right):
+        super().__init__()
         self.left = left
         self.op = op  # 'IGUAL', 'DIFERENTE', 'MAIOR', etc.
         self.right = right
@@ -235,7 +573,6 @@ class RelationalOpNode(Node):
     def evaluate(self, symbol_table):
         left_value = self.left.evaluate(symbol_table)
         right_value = self.right.evaluate(symbol_table)
-        print(f"DEBUG: Avaliando RelationalOpNode: {left_value} {self.op} {right_value}")
 
         if self.op == 'IGUAL':
             result = int(left_value == right_value)
@@ -252,84 +589,331 @@ class RelationalOpNode(Node):
         else:
             raise Exception(f"Operador relacional desconhecido: {self.op}")
 
-        print(f"DEBUG: Resultado de RelationalOpNode: {result}")
         return result
 
+INT_COMPARISONS = {
+    'IGUAL': operator.eq, 'DIFERENTE': operator.ne, 'MAIOR': operator.gt,
+    'MENOR': operator.lt, 'MAIORIGUAL': operator.ge, 'MENORIGUAL': operator.le,
+}
+
+class IntCompareNode(RelationalOpNode):
+    # Comparação entre números: a função do operador é escolhida uma vez
+    __slots__ = ('compare',)
+
+    def __init__(self, left, op, right):
+        super().__init__(left, op, right)
+        self.compare = INT_COMPARISONS[op]
+
+    def evaluate(self, symbol_table):
+        return int(self.compare(self.left.evaluate(symbol_table), self.right.evaluate(symbol_table)))
+
+def bind_shadows(shadows, local_values, global_values):
+    # Cópias locais de variáveis globais atribuídas na função (ver Resolver)
+    for local_slot, global_slot in shadows:
+        value = global_values[global_slot]
+        if type(value) is StrBuilder:
+            # A cópia não pode compartilhar os pedaços com a global
+            value = ''.join(value.pieces)
+            global_values[global_slot] = value
+        local_values[local_slot] = value
+
+class Function:
+    # Valor armazenado no slot global de uma função declarada
+    def __init__(self, name, func_type, param_slots, block, frame_size, global_frame, memo=None, shadows=()):
+        self.name = name
+        self.func_type = func_type
+        self.param_slots = param_slots
+        self.block = block
+        self.frame_size = frame_size
+        self.global_frame = global_frame
+        self.memo = memo  # MemoCache quando a função é pura
+        self.shadows = shadows
+        self.padding = binding_plan(param_slots, frame_size)
+
 class FuncDecNode(Node):
+    __slots__ = ('func_type', 'func_name', 'params', 'block', 'depth', 'slot', 'param_slots', 'frame_size',
+                 'slot_names', 'shadow_slots', 'memo')
+
     def __init__(self, func_type, func_name, params, block):
+        super().__init__()
         self.func_type = func_type
         self.func_name = func_name
         self.params = params  # Lista de tuplas (tipo, nome)
         self.block = block
+        self.depth = None
+        self.slot = None
+        self.param_slots = None
+        self.frame_size = None
+        self.slot_names = None
+        self.shadow_slots = ()
+        self.memo = None
 
     def evaluate(self, symbol_table):
-        param_names = [name for _, name in self.params]
-        print(f"DEBUG: Definindo função '{self.func_name}' com parâmetros {param_names}")
-
-        # Percorre até a tabela de símbolos global
-        global_symbol_table = symbol_table
-        while global_symbol_table.parent is not None:
-            global_symbol_table = global_symbol_table.parent
-
-        # Armazena a função na tabela de símbolos global com o tipo 'FUNCTION'
-        global_symbol_table.set(self.func_name, (self.func_type, param_names, self.block, global_symbol_table), var_type='FUNCTION')
+        # Armazena a função no slot reservado no frame global
+        global_frame = symbol_table.root()
+        global_frame.values[self.slot] = Function(self.func_name, self.func_type, self.param_slots,
+                                                  self.block, self.frame_size, global_frame, self.memo,
+                                                  self.shadow_slots)
 
 class FuncCallNode(Node):
+    __slots__ = ('func_name', 'args', 'depth', 'slot', 'cached_function')
+
     def __init__(self, func_name, args):
+        super().__init__()
         self.func_name = func_name
         self.args = args
+        self.depth = None
+        self.slot = None
+        # Cache da chamada: a última Function conferida neste ponto do programa.
+        # Cada execução de FUNCAO cria outra Function, então comparar a
+        # identidade basta para perceber uma redeclaração.
+        self.cached_function = None
 
     def evaluate(self, symbol_table):
-        print(f"DEBUG: Chamando função '{self.func_name}' com argumentos {self.args}")
-        # Percorre as tabelas de símbolos para encontrar a função
-        current_table = symbol_table
-        func_info = None
-        while current_table is not None:
-            func_info = current_table.get(self.func_name)
-            if func_info is not None:
-                break
-            current_table = current_table.parent
-
-        if func_info is None:
+        frame = symbol_table if self.depth == 0 else symbol_table.at(self.depth)
+        function = frame.values[self.slot]
+        if function is not self.cached_function:
+            self.resolve(function)
+
+        # Avalia os argumentos
+        arg_values = [arg_expr.evaluate(symbol_table) for arg_expr in self.args]
+
+        # Funções puras consultam o cache antes de executar
+        memo = function.memo
+        if memo is not None:
+            key = memo.key(arg_values)
+            if key is not None:
+                found, value = memo.lookup(key)
+                if found:
+                    return value
+                value = FuncCallNode.call(function, arg_values)
+                memo.store(key, value)
+                return value
+
+        return FuncCallNode.call(function, arg_values)
+
+    def resolve(self, function):
+        # Conferências feitas só quando a função do slot muda
+        if function is UNDEFINED:
             raise Exception(f"Função '{self.func_name}' não definida")
 
-        if func_info['type'] != 'FUNCTION':
+        if not isinstance(function, Function):
             raise Exception(f"'{self.func_name}' não é uma função")
 
-        func_value = func_info['value']
-        func_type, param_names, func_block, func_table = func_value
-
-        if len(self.args) != len(param_names):
+        if len(self.args) != len(function.param_slots):
             raise Exception("Número incorreto de argumentos")
 
-        # Cria uma nova tabela de símbolos para a execução da função
-        local_table = SymbolTable(func_table)
+        self.cached_function = function
 
-        # Avalia os argumentos e atribui aos parâmetros
-        for param_name, arg_expr in zip(param_names, self.args):
-            arg_value = arg_expr.evaluate(symbol_table)
-            local_table.set(param_name, arg_value)
-            print(f"DEBUG: Parâmetro '{param_name}' da função '{self.func_name}' = {arg_value}")
+    @staticmethod
+    def call(function, arg_values):
+        # Cria um novo frame para a execução da função
+        padding = function.padding
+        if padding is not None:
+            local_table = Frame(0, function.global_frame, arg_values + padding)
+        else:
+            local_table = Frame(function.frame_size, function.global_frame)
+            local_values = local_table.values
+            for param_slot, arg_value in zip(function.param_slots, arg_values):
+                local_values[param_slot] = arg_value
+        if function.shadows:
+            bind_shadows(function.shadows, local_table.values, function.global_frame.values)
 
         # Executa o bloco da função
-        try:
-            print(f"DEBUG: Executando bloco da função '{self.func_name}'")
-            func_block.evaluate(local_table)
-            print(f"DEBUG: Função '{self.func_name}' executada sem retorno explícito")
-            return None
-        except ReturnException as ret:
-            print(f"DEBUG: Função '{self.func_name}' retornou valor {ret.value}")
-            return ret.value
-
-class ReturnException(Exception):
-    def __init__(self, value):
-        self.value = value
+        if function.block.evaluate(local_table) is RETURN_SIGNAL:
+            return local_table.return_value
+        return None
 
 class ReturnNode(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr):
+        super().__init__()
         self.expr = expr
 
     def evaluate(self, symbol_table):
+        if symbol_table.parent is None:
+            raise Exception("RETORNA fora de função")
+        symbol_table.return_value = self.expr.evaluate(symbol_table)
+        return RETURN_SIGNAL
+
+# Vetores: INT e BOOL guardados em array('q') (inteiros de 64 bits), STR em lista.
+# O valor da variável é o próprio armazenamento, passado por referência.
+ARRAY_TYPECODES = {'INT': 'q', 'BOOL': 'q'}
+
+# Operações embutidas sobre vetores e seus números de argumentos
+ARRAY_OPERATIONS = {'TAMANHO': 1, 'TOTAL': 1, 'PREENCHE': 2, 'COPIA': 5}
+
+def element_type(var_type):
+    # 'VETOR INT' -> 'INT'; None para tipos que não são vetores
+    if var_type and var_type.startswith('VETOR '):
+        return var_type[6:]
+    return None
+
+def new_array(element, size):
+    if type(size) is not int or size < 0:
+        raise Exception(f"Tamanho de vetor inválido: {size}")
+    if element in ARRAY_TYPECODES:
+        return array(ARRAY_TYPECODES[element], bytes(8 * size))
+    return [''] * size
+
+def array_value(items, name):
+    if type(items) is array or type(items) is list:
+        return items
+    if items is UNDEFINED:
+        raise Exception(f"Variável '{name}' não definida")
+    raise Exception(f"'{name}' não é um vetor")
+
+def check_index(items, index, name):
+    if type(index) is not int or not 0 <= index < len(items):
+        raise Exception(f"Índice fora do vetor '{name}': {index} (tamanho {len(items)})")
+
+def store_element(items, index, value, name):
+    check_index(items, index, name)
+    try:
+        items[index] = value
+    except (TypeError, OverflowError):
+        raise Exception(f"Valor inválido para o vetor '{name}': {value}")
+
+def array_operation(op, args):
+    # Operações em bloco: laços nativos de array/list, sem passar pelo interpretador
+    items = args[0]
+    if type(items) is not array and type(items) is not list:
+        raise Exception(f"{op} espera um vetor")
+    if op == 'TAMANHO':
+        return len(items)
+    if op == 'TOTAL':
+        if type(items) is not array:
+            raise Exception("TOTAL espera um vetor INT")
+        return sum(items)
+    if op == 'PREENCHE':
+        value = args[1]
+        if type(items) is list:
+            items[:] = [value] * len(items)
+        else:
+            try:
+                items[:] = array(items.typecode, [value]) * len(items)
+            except (TypeError, OverflowError):
+                raise Exception(f"Valor inválido para PREENCHE: {value}")
+        return None
+    # COPIA(origem, inicio, destino, posicao, quantidade)
+    source, start, target, position, count = args
+    if type(target) is not type(source) or (type(target) is array and target.typecode != source.typecode):
+        raise Exception("COPIA espera dois vetores do mesmo tipo")
+    for value in (start, position, count):
+        if type(value) is not int:
+            raise Exception(f"COPIA espera posições inteiras, encontrado {value}")
+    if count < 0 or start < 0 or position < 0 or start + count > len(source) or position + count > len(target):
+        raise Exception(f"COPIA fora dos vetores: {count} elementos de {start} para {position}")
+    target[position:position + count] = source[start:start + count]
+    return None
+
+class ArrayDecNode(VarDecNode):
+    # VETOR INT nome[tamanho]; expression é o tamanho
+    __slots__ = ('element',)
+
+    def __init__(self, element, name, size_expr):
+        super().__init__(f"VETOR {element}", name, size_expr)
+        self.element = element
+
+    def evaluate(self, symbol_table):
+        symbol_table.values[self.slot] = new_array(self.element, self.expression.evaluate(symbol_table))
+
+class IndexNode(Node):
+    # nome[indice]
+    __slots__ = ('name', 'index', 'depth', 'slot')
+
+    def __init__(self, name, index):
+        super().__init__()
+        self.name = name
+        self.index = index
+        self.depth = None
+        self.slot = None
+
+    def evaluate(self, symbol_table):
+        index = self.index.evaluate(symbol_table)
+        frame = symbol_table if self.depth == 0 else symbol_table.at(self.depth)
+        items = array_value(frame.values[self.slot], self.name)
+        check_index(items, index, self.name)
+        return items[index]
+
+class IndexAssignNode(Node):
+    # nome[indice] RECEBE expr;
+    __slots__ = ('name', 'index', 'expr', 'depth', 'slot')
+
+    def __init__(self, name, index, expr):
+        super().__init__()
+        self.name = name
+        self.index = index
+        self.expr = expr
+        self.depth = None
+        self.slot = None
+
+    def evaluate(self, symbol_table):
+        index = self.index.evaluate(symbol_table)
         value = self.expr.evaluate(symbol_table)
-        print(f"DEBUG: ReturnNode retornando valor {value}")
-        raise ReturnException(value)
+        frame = symbol_table if self.depth == 0 else symbol_table.at(self.depth)
+        store_element(array_value(frame.values[self.slot], self.name), index, value, self.name)
+
+class ArrayOpNode(Node):
+    # TAMANHO(v), TOTAL(v), PREENCHE(v, valor) e COPIA(origem, inicio, destino, posicao, quantidade)
+    __slots__ = ('op', 'args')
+
+    def __init__(self, op, args):
+        super().__init__()
+        self.op = op
+        self.args = args
+
+    def evaluate(self, symbol_table):
+        return array_operation(self.op, [arg.evaluate(symbol_table) for arg in self.args])
+
+# Filhos (subexpressões e comandos) de cada classe de nó. As variantes
+# especializadas usam a entrada da classe base mais próxima. FuncDecNode não
+# tem filhos: o corpo é outro escopo e não entra nas análises do escopo atual.
+CHILDREN = {
+    BinOpNode: lambda node: [node.left, node.right],
+    RelationalOpNode: lambda node: [node.left, node.right],
+    UnOpNode: lambda node: [node.node],
+    AssignmentNode: lambda node: [node.expr],
+    PrintNode: lambda node: [node.expr],
+    ReturnNode: lambda node: [node.expr],
+    InvariantNode: lambda node: [node.expr],
+    VarDecNode: lambda node: [node.expression] if node.expression else [],
+    BlockNode: lambda node: list(node.statements),
+    IfNode: lambda node: [node.condition, node.true_block] + ([node.false_block] if node.false_block else []),
+    WhileNode: lambda node: [node.condition, node.block],
+    ForNode: lambda node: [node.start_expr, node.end_expr] + ([node.step_expr] if node.step_expr else [])
+                          + [node.block],
+    FuncCallNode: lambda node: list(node.args),
+    ArrayOpNode: lambda node: list(node.args),
+    IndexNode: lambda node: [node.index],
+    IndexAssignNode: lambda node: [node.index, node.expr],
+}
+
+def class_entry(table, cls, default=None):
+    # Entrada da classe ou da base mais próxima presente na tabela
+    for base in cls.__mro__:
+        if base in table:
+            return table[base]
+    return default
+
+def no_children(node):
+    return []
+
+# Função de CHILDREN já resolvida para cada classe concreta: isinstance em
+# subclasses de ABC é lento, e as análises visitam todos os nós várias vezes
+children_by_class = {}
+
+def children(node):
+    cls = type(node)
+    function = children_by_class.get(cls)
+    if function is None:
+        function = children_by_class[cls] = class_entry(CHILDREN, cls, no_children)
+    return function(node)
+
+def walk(node):
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        yield current
+        pending.extend(children(current))
@@ -0,0 +1,664 @@
+# optimizer.py
+import copy
+from node import *
+from closedform import MAX_DEGREE
+from typechecker import function_declarations
+
+LITERAL_NODES = (NumberNode, StringNode, BoolNode)
+
+# Tamanho máximo (em nós da AST) do corpo de uma função expandida no local da chamada
+INLINE_MAX_NODES = 40
+
+def unparse(node):
+    # Forma textual aproximada de uma expressão, usada no relatório
+    if isinstance(node, StringNode):
+        return f'"{node.value}"'
+    if isinstance(node, LITERAL_NODES):
+        return str(node.value)
+    if isinstance(node, IdentifierNode):
+        return node.name
+    if isinstance(node, (BinOpNode, RelationalOpNode)):
+        return f"({unparse(node.left)} {node.op} {unparse(node.right)})"
+    if isinstance(node, UnOpNode):
+        return f"{node.op}{unparse(node.node)}"
+    if isinstance(node, FuncCallNode):
+        return f"{node.func_name}({', '.join(unparse(arg) for arg in node.args)})"
+    if isinstance(node, InvariantNode):
+        return unparse(node.expr)
+    if isinstance(node, IndexNode):
+        return f"{node.name}[{unparse(node.index)}]"
+    if isinstance(node, ArrayOpNode):
+        return f"{node.op}({', '.join(unparse(arg) for arg in node.args)})"
+    return type(node).__name__
+
+def literal(value):
+    if isinstance(value, str):
+        return StringNode(value)
+    return NumberNode(value)
+
+def written_names(node):
+    names = set()
+    for current in walk(node):
+        if isinstance(current, AssignmentNode):
+            names.add(current.var_name)
+        elif isinstance(current, VarDecNode):
+            names.add(current.name)
+        elif isinstance(current, ForNode):
+            names.add(current.var_name)
+        elif isinstance(current, ReadNode):
+            names.add(current.name)
+        elif isinstance(current, IndexAssignNode):
+            names.add(current.name)
+        elif isinstance(current, ArrayOpNode) and current.op in ('PREENCHE', 'COPIA'):
+            # Vetor alterado: o primeiro argumento de PREENCHE, o destino de COPIA
+            target = current.args[0 if current.op == 'PREENCHE' else 2]
+            if isinstance(target, IdentifierNode):
+                names.add(target.name)
+    return names
+
+def declared_names(node):
+    # Nomes locais de um corpo de função (mesma regra do Resolver)
+    names = set()
+    for current in walk(node):
+        if isinstance(current, VarDecNode):
+            names.add(current.name)
+        elif isinstance(current, ForNode):
+            names.add(current.var_name)
+    return names
+
+def contains_call(node):
+    return any(isinstance(current, FuncCallNode) for current in walk(node))
+
+def read_names(node):
+    return {current.name for current in walk(node) if isinstance(current, IdentifierNode)}
+
+def is_name(node, name):
+    return isinstance(node, IdentifierNode) and node.name == name
+
+def referenced_names(node):
+    # Nomes usados no escopo de node: leituras, alvos e funções chamadas
+    names = set()
+    for current in walk(node):
+        if isinstance(current, IdentifierNode):
+            names.add(current.name)
+        elif isinstance(current, AssignmentNode):
+            names.add(current.var_name)
+        elif isinstance(current, ReadNode):
+            names.add(current.name)
+        elif isinstance(current, FuncCallNode):
+            names.add(current.func_name)
+        elif isinstance(current, (IndexNode, IndexAssignNode)):
+            names.add(current.name)
+    return names
+
+def declared_types(node):
+    # Tipos declarados por nome no escopo de node (sem entrar em funções)
+    types = {}
+    for current in walk(node):
+        if isinstance(current, VarDecNode):
+            types[current.name] = current.var_type
+        elif isinstance(current, ForNode):
+            types[current.var_name] = 'INT'
+    return types
+
+def function_locals(declaration):
+    return {name for _, name in declaration.params} | declared_names(declaration.block)
+
+def rename(node, names):
+    # Troca, em toda a subárvore, os nomes de variáveis presentes em names
+    for current in walk(node):
+        if isinstance(current, IdentifierNode) and current.name in names:
+            current.name = names[current.name]
+        elif isinstance(current, AssignmentNode) and current.var_name in names:
+            current.var_name = names[current.var_name]
+        elif isinstance(current, (VarDecNode, ReadNode, IndexNode, IndexAssignNode)) and current.name in names:
+            current.name = names[current.name]
+        elif isinstance(current, ForNode) and current.var_name in names:
+            current.var_name = names[current.var_name]
+
+def substitute(node, values):
+    # Cópia de uma expressão sem chamadas com os parâmetros trocados pelos argumentos
+    if isinstance(node, IdentifierNode) and node.name in values:
+        return copy.deepcopy(values[node.name])
+    if isinstance(node, IndexNode) and node.name in values:
+        # O argumento de um parâmetro vetor é sempre uma variável
+        node = copy.copy(node)
+        node.name = values[node.name].name
+    else:
+        node = copy.copy(node)
+    for attribute in ('left', 'right', 'node', 'index'):
+        child = getattr(node, attribute, None)
+        if isinstance(child, Node):
+            setattr(node, attribute, substitute(child, values))
+    if isinstance(node, ArrayOpNode):
+        node.args = [substitute(arg, values) for arg in node.args]
+    return node
+
+def defined_before_use(declaration):
+    # Variáveis locais só são declaradas no nível principal do corpo (ou por
+    # um PARA desse nível) e não são usadas antes da declaração: expandido,
+    # o corpo não depende de começar com um frame vazio
+    params = {name for _, name in declaration.params}
+    local = declared_names(declaration.block) - params
+    defined = set(params)
+    for statement in declaration.block.statements:
+        if isinstance(statement, VarDecNode):
+            parts = [statement.expression] if statement.expression else []
+            inner = parts
+        elif isinstance(statement, ForNode):
+            parts = [statement.start_expr, statement.end_expr] + ([statement.step_expr] if statement.step_expr else [])
+            inner = parts + [statement.block]
+        else:
+            parts = inner = [statement]
+        for part in inner:
+            if any(isinstance(current, (VarDecNode, ForNode)) for current in walk(part)):
+                return False
+        for part in parts:
+            if referenced_names(part) & (local - defined):
+                return False
+        if isinstance(statement, VarDecNode):
+            defined.add(statement.name)
+        elif isinstance(statement, ForNode):
+            defined.add(statement.var_name)
+            if referenced_names(statement.block) & (local - defined):
+                return False
+    return True
+
+def polynomial_degree(expr, var, excluded):
+    # Grau de expr como polinômio inteiro em var (None se não for um:
+    # divisão, chamadas, texto ou leitura de um nome em excluded)
+    if isinstance(expr, NumberNode):
+        return 0
+    if isinstance(expr, IdentifierNode):
+        if expr.name == var:
+            return 1
+        return None if expr.name in excluded else 0
+    if isinstance(expr, UnOpNode) and expr.op in ('+', '-'):
+        return polynomial_degree(expr.node, var, excluded)
+    if isinstance(expr, BinOpNode) and expr.op in ('+', '-', '*'):
+        left = polynomial_degree(expr.left, var, excluded)
+        right = polynomial_degree(expr.right, var, excluded)
+        if left is None or right is None:
+            return None
+        return left + right if expr.op == '*' else max(left, right)
+    return None
+
+class Optimizer:
+    # Reescreve a AST antes da resolução de nomes:
+    #   - dobra operações cujos operandos são literais
+    #   - remove ramos de SE/ENQUANTO com condição constante
+    #   - expansão de chamadas a funções pequenas e não recursivas: o corpo
+    #     (com parâmetros e variáveis renomeados) entra no lugar da chamada
+    #   - laços que só acumulam polinômios da variável do laço viram nós
+    #     executados em forma fechada (ReductionForNode, ReductionWhileNode)
+    #   - içamento preguiçoso de expressões invariantes de laços: a
+    #     expressão é avaliada na primeira vez em que o laço original a
+    #     avaliaria e o valor é reaproveitado nas iterações seguintes
+    def __init__(self):
+        self.report = []
+        self.temp_counter = 0
+        self.caller_types = {}  # nome -> tipo declarado, no escopo que está sendo expandido
+
+    @staticmethod
+    def run(ast):
+        optimizer = Optimizer()
+        ast = optimizer.inline_calls(ast)
+        ast = optimizer.optimize(ast)
+        ast = optimizer.reduce_loops(ast)
+        optimizer.hoist_loops(ast, None)
+        return ast, optimizer.report
+
+    def optimize(self, node):
+        # Dobramento de constantes e remoção de ramos mortos
+        if isinstance(node, BinOpNode):
+            node.left = self.optimize(node.left)
+            node.right = self.optimize(node.right)
+            if isinstance(node.left, LITERAL_NODES) and isinstance(node.right, LITERAL_NODES):
+                return self.fold(node)
+        elif isinstance(node, RelationalOpNode):
+            node.left = self.optimize(node.left)
+            node.right = self.optimize(node.right)
+            if isinstance(node.left, LITERAL_NODES) and isinstance(node.right, LITERAL_NODES):
+                return self.fold(node)
+        elif isinstance(node, UnOpNode):
+            node.node = self.optimize(node.node)
+            if isinstance(node.node, LITERAL_NODES):
+                return self.fold(node)
+        elif isinstance(node, (AssignmentNode, PrintNode, ReturnNode)):
+            node.expr = self.optimize(node.expr)
+        elif isinstance(node, VarDecNode):
+            if node.expression:
+                node.expression = self.optimize(node.expression)
+        elif isinstance(node, (FuncCallNode, ArrayOpNode)):
+            node.args = [self.optimize(arg) for arg in node.args]
+        elif isinstance(node, IndexNode):
+            node.index = self.optimize(node.index)
+        elif isinstance(node, IndexAssignNode):
+            node.index = self.optimize(node.index)
+            node.expr = self.optimize(node.expr)
+        elif isinstance(node, BlockNode):
+            node.statements = [self.optimize(statement) for statement in node.statements]
+        elif isinstance(node, IfNode):
+            node.condition = self.optimize(node.condition)
+            if isinstance(node.condition, LITERAL_NODES):
+                if node.condition.value:
+                    self.report.append(f"SE {unparse(node.condition)}: mantido só o bloco ENTAO")
+                    return self.optimize(node.true_block)
+                self.report.append(f"SE {unparse(node.condition)}: mantido só o bloco SENAO")
+                if node.false_block:
+                    return self.optimize(node.false_block)
+                return BlockNode([])
+            node.true_block = self.optimize(node.true_block)
+            if node.false_block:
+                node.false_block = self.optimize(node.false_block)
+        elif isinstance(node, WhileNode):
+            node.condition = self.optimize(node.condition)
+            if isinstance(node.condition, LITERAL_NODES) and not node.condition.value:
+                self.report.append(f"ENQUANTO {unparse(node.condition)}: laço removido")
+                return BlockNode([])
+            node.block = self.optimize(node.block)
+        elif isinstance(node, ForNode):
+            node.start_expr = self.optimize(node.start_expr)
+            node.end_expr = self.optimize(node.end_expr)
+            if node.step_expr:
+                node.step_expr = self.optimize(node.step_expr)
+            node.block = self.optimize(node.block)
+        elif isinstance(node, FuncDecNode):
+            node.block = self.optimize(node.block)
+        return node
+
+    def inline_calls(self, ast):
+        # Só funções declaradas no nível principal do programa, com nome
+        # único, nunca atribuído nem usado como variável. Uma chamada é
+        # expandida se vier depois da declaração: em comandos seguintes do
+        # programa ou no corpo de funções declaradas depois.
+        if not isinstance(ast, BlockNode):
+            return ast
+        declarations = function_declarations(ast)
+        counts = {}
+        variables = written_names(ast)
+        for declaration in declarations:
+            counts[declaration.func_name] = counts.get(declaration.func_name, 0) + 1
+            variables |= function_locals(declaration) | written_names(declaration.block)
+        callees = {declaration.func_name: {current.func_name for current in walk(declaration.block)
+                                           if isinstance(current, FuncCallNode)}
+                   for declaration in declarations}
+
+        global_types = declared_types(ast)
+        inlinable = {}
+        statements = []
+        for statement in ast.statements:
+            if isinstance(statement, FuncDecNode):
+                self.caller_types = dict(global_types, **{name: param_type for param_type, name in statement.params})
+                self.caller_types.update(declared_types(statement.block))
+                statement.block = self.inline_block(statement.block, inlinable, function_locals(statement))
+                name = statement.func_name
+                if counts[name] == 1 and name not in variables \
+                        and not self.recursive(name, callees) and self.can_inline(statement):
+                    inlinable[name] = statement
+                statements.append(statement)
+            else:
+                self.caller_types = global_types
+                statements.append(self.inline_statement(statement, inlinable, set()))
+        ast.statements = statements
+        return ast
+
+    def inline_block(self, node, inlinable, caller_locals):
+        if isinstance(node, BlockNode):
+            node.statements = [self.inline_statement(statement, inlinable, caller_locals)
+                               for statement in node.statements]
+            return node
+        return self.inline_statement(node, inlinable, caller_locals)
+
+    def inline_statement(self, node, inlinable, caller_locals):
+        # Chamadas que são a expressão inteira de um comando podem receber o
+        # corpo completo da função; dentro de expressões, só funções de um
+        # único RETORNA (ver substitutable)
+        if not inlinable:
+            return node
+        if isinstance(node, BlockNode):
+            return self.inline_block(node, inlinable, caller_locals)
+        if isinstance(node, IfNode):
+            node.condition = self.inline_expression(node.condition, inlinable, caller_locals)
+            node.true_block = self.inline_block(node.true_block, inlinable, caller_locals)
+            if node.false_block:
+                node.false_block = self.inline_block(node.false_block, inlinable, caller_locals)
+        elif isinstance(node, WhileNode):
+            node.condition = self.inline_expression(node.condition, inlinable, caller_locals)
+            node.block = self.inline_block(node.block, inlinable, caller_locals)
+        elif isinstance(node, ForNode):
+            node.start_expr = self.inline_expression(node.start_expr, inlinable, caller_locals)
+            node.end_expr = self.inline_expression(node.end_expr, inlinable, caller_locals)
+            if node.step_expr:
+                node.step_expr = self.inline_expression(node.step_expr, inlinable, caller_locals)
+            node.block = self.inline_block(node.block, inlinable, caller_locals)
+        elif isinstance(node, FuncCallNode):
+            node.args = [self.inline_expression(arg, inlinable, caller_locals) for arg in node.args]
+            declaration = self.inline_target(node, inlinable, caller_locals)
+            if declaration is not None:
+                return self.expand(node, None, declaration, node)
+        elif isinstance(node, (AssignmentNode, PrintNode, ReturnNode, VarDecNode)):
+            attribute = 'expression' if isinstance(node, VarDecNode) else 'expr'
+            expr = getattr(node, attribute)
+            if expr is None:
+                return node
+            setattr(node, attribute, self.inline_expression(expr, inlinable, caller_locals))
+            if getattr(node, attribute) is expr and isinstance(expr, FuncCallNode):
+                declaration = self.inline_target(expr, inlinable, caller_locals)
+                if declaration is not None:
+                    return self.expand(node, attribute, declaration, expr)
+        return node
+
+    def inline_expression(self, node, inlinable, caller_locals):
+        if isinstance(node, FuncCallNode):
+            node.args = [self.inline_expression(arg, inlinable, caller_locals) for arg in node.args]
+            declaration = self.inline_target(node, inlinable, caller_locals)
+            if declaration is not None and self.substitutable(declaration, node):
+                self.report.append(f"chamada expandida: {unparse(node)}")
+                values = {name: arg for (_, name), arg in zip(declaration.params, node.args)}
+                return substitute(declaration.block.statements[0].expr, values)
+            return node
+        for attribute in ('left', 'right', 'node', 'index'):
+            child = getattr(node, attribute, None)
+            if isinstance(child, Node):
+                setattr(node, attribute, self.inline_expression(child, inlinable, caller_locals))
+        return node
+
+    @staticmethod
+    def inline_target(call, inlinable, caller_locals):
+        # Declaração a expandir no lugar de call, ou None. Nomes livres do
+        # corpo (globais e funções) não podem ser capturados por variáveis
+        # locais de quem chama; aridade errada continua sendo erro de execução.
+        declaration = inlinable.get(call.func_name)
+        if declaration is None or call.func_name in caller_locals:
+            return None
+        if len(call.args) != len(declaration.params):
+            return None
+        if (referenced_names(declaration.block) - function_locals(declaration)) & caller_locals:
+            return None
+        return declaration
+
+    def substitutable(self, declaration, call):
+        # Corpo 'RETORNA e' sem chamadas e argumentos sem efeitos (literais ou
+        # variáveis, estas usadas em e ao menos uma vez): trocar os
+        # parâmetros pelos argumentos não muda o que é avaliado nem a ordem
+        # em que algo pode falhar
+        statements = declaration.block.statements
+        if len(statements) != 1 or contains_call(statements[0].expr):
+            return False
+        used = read_names(statements[0].expr)
+        for (param_type, name), arg in zip(declaration.params, call.args):
+            if isinstance(arg, StringNode):
+                arg_type = 'STR'
+            elif isinstance(arg, LITERAL_NODES):
+                arg_type = 'INT'
+            elif isinstance(arg, IdentifierNode) and name in used:
+                arg_type = self.caller_types.get(arg.name)
+            else:
+                return False
+            # Sem a chamada, o TypeChecker não confere mais o argumento
+            if arg_type is None:
+                return False
+            if element_type(arg_type) or element_type(param_type):
+                if arg_type != param_type:
+                    return False
+            elif (arg_type == 'STR') != (param_type == 'STR'):
+                return False
+        return True
+
+    def expand(self, statement, attribute, declaration, call):
+        # Bloco com os parâmetros declarados na ordem dos argumentos, o corpo
+        # renomeado e, no lugar da chamada, a expressão do RETORNA final
+        self.temp_counter += 1
+        prefix = f"${declaration.func_name}{self.temp_counter}"
+        names = {name: f"{prefix}.{name}" for name in function_locals(declaration)}
+        body = copy.deepcopy(declaration.block.statements)
+        for current in body:
+            rename(current, names)
+        self.report.append(f"chamada expandida: {unparse(call)}")
+        statements = []
+        for (param_type, name), arg in zip(declaration.params, call.args):
+            binding = VarDecNode(param_type, names[name], arg)
+            binding.argument = (name, declaration.func_name)
+            statements.append(binding)
+        statements.extend(body[:-1])
+        result = body[-1].expr
+        if attribute is None:
+            # Chamada usada como comando: o valor é calculado e descartado
+            statements.append(VarDecNode(declaration.func_type, prefix, result))
+        else:
+            setattr(statement, attribute, result)
+            statements.append(statement)
+        return BlockNode(statements)
+
+    @staticmethod
+    def recursive(name, callees):
+        seen = set()
+        pending = list(callees.get(name, ()))
+        while pending:
+            current = pending.pop()
+            if current == name:
+                return True
+            if current not in seen:
+                seen.add(current)
+                pending.extend(callees.get(current, ()))
+        return False
+
+    @staticmethod
+    def can_inline(declaration):
+        block = declaration.block
+        if not isinstance(block, BlockNode) or not block.statements:
+            return False
+        if not isinstance(block.statements[-1], ReturnNode):
+            return False
+        size = 0
+        for current in walk(block):
+            size += 1
+            if isinstance(current, FuncDecNode):
+                return False
+            if isinstance(current, ReturnNode) and current is not block.statements[-1]:
+                return False
+        if size > INLINE_MAX_NODES:
+            return False
+        # Atribuir a uma global cria uma cópia local na função (ver Resolver);
+        # expandido no lugar da chamada, o corpo alteraria a própria global
+        assigned = {current.var_name for current in walk(block) if isinstance(current, AssignmentNode)}
+        assigned |= {current.name for current in walk(block) if isinstance(current, ReadNode)}
+        if assigned - function_locals(declaration):
+            return False
+        if referenced_names(block) & function_locals(declaration) & \
+                {current.func_name for current in walk(block) if isinstance(current, FuncCallNode)}:
+            return False
+        return defined_before_use(declaration)
+
+    def reduce_loops(self, node):
+        # Laços internos primeiro; um laço que contém outro laço não é reduzido
+        if isinstance(node, BlockNode):
+            node.statements = [self.reduce_loops(statement) for statement in node.statements]
+        elif isinstance(node, IfNode):
+            node.true_block = self.reduce_loops(node.true_block)
+            if node.false_block:
+                node.false_block = self.reduce_loops(node.false_block)
+        elif isinstance(node, FuncDecNode):
+            node.block = self.reduce_loops(node.block)
+        elif isinstance(node, ForNode):
+            node.block = self.reduce_loops(node.block)
+            return self.reduce_for(node)
+        elif isinstance(node, WhileNode):
+            node.block = self.reduce_loops(node.block)
+            return self.reduce_while(node)
+        return node
+
+    def reduce_for(self, loop):
+        bounds = [loop.start_expr, loop.end_expr] + ([loop.step_expr] if loop.step_expr else [])
+        if not isinstance(loop.block, BlockNode) or any(contains_call(bound) for bound in bounds):
+            return loop
+        written = written_names(loop.block) | {loop.var_name}
+        reductions = self.reductions(loop.block.statements, loop.var_name, written, [0] * len(loop.block.statements))
+        if reductions is None:
+            return loop
+        self.report.append(f"laço em forma fechada: PARA {loop.var_name}")
+        return ReductionForNode(loop, reductions)
+
+    def reduce_while(self, loop):
+        condition = loop.condition
+        if not isinstance(condition, RelationalOpNode) or not isinstance(loop.block, BlockNode):
+            return loop
+        if condition.op not in ('MENOR', 'MENORIGUAL', 'MAIOR', 'MAIORIGUAL'):
+            return loop
+        statements = loop.block.statements
+        written = written_names(loop.block)
+        if isinstance(condition.left, IdentifierNode) and condition.left.name in written:
+            counter_side, bound = 'left', condition.right
+        elif isinstance(condition.right, IdentifierNode) and condition.right.name in written:
+            counter_side, bound = 'right', condition.left
+        else:
+            return loop
+        counter = getattr(condition, counter_side).name
+        if contains_call(bound) or read_names(bound) & written:
+            return loop
+
+        # Exatamente um comando avança o contador: contador RECEBE contador +/- passo
+        updates = [index for index, statement in enumerate(statements)
+                   if isinstance(statement, AssignmentNode) and statement.var_name == counter]
+        if len(updates) != 1:
+            return loop
+        step_index = updates[0]
+        update = statements[step_index].expr
+        if not isinstance(update, BinOpNode):
+            return loop
+        if update.op in ('+', '-') and is_name(update.left, counter):
+            step_side = 'right'
+        elif update.op == '+' and is_name(update.right, counter):
+            step_side = 'left'
+        else:
+            return loop
+        step = getattr(update, step_side)
+        if contains_call(step) or read_names(step) & written:
+            return loop
+
+        others = statements[:step_index] + statements[step_index + 1:]
+        offsets = [0] * step_index + [1] * (len(statements) - step_index - 1)
+        reductions = self.reductions(others, counter, written, offsets)
+        if reductions is None:
+            return loop
+        self.report.append(f"laço em forma fechada: ENQUANTO {counter}")
+        return ReductionWhileNode(loop, counter_side, step_index, step_side, reductions)
+
+    def reductions(self, statements, var, written, offsets):
+        # Cada comando deve ser 'acumulador RECEBE acumulador + E', '- E' ou
+        # '* K', com E polinômio em var e K invariante; E e K não leem nada
+        # que o laço escreve (além de var). Um acumulador multiplicado não
+        # pode ter outras atualizações.
+        reductions = []
+        kinds = {}
+        excluded = written - {var}
+        for statement, offset in zip(statements, offsets):
+            if not isinstance(statement, AssignmentNode) or statement.var_name == var:
+                return None
+            expr = statement.expr
+            accumulator = statement.var_name
+            if not isinstance(expr, BinOpNode) or expr.op not in ('+', '-', '*'):
+                return None
+            if is_name(expr.left, accumulator):
+                side = 'right'
+            elif is_name(expr.right, accumulator) and expr.op != '-':
+                side = 'left'
+            else:
+                return None
+            degree = polynomial_degree(getattr(expr, side), var, excluded)
+            if degree is None or degree > MAX_DEGREE or (expr.op == '*' and degree != 0):
+                return None
+            kinds.setdefault(accumulator, []).append(expr.op)
+            reductions.append((statement, expr.op, side, degree, offset))
+        for operations in kinds.values():
+            if '*' in operations and len(operations) > 1:
+                return None
+        return reductions
+
+    def hoist_loops(self, node, local_names):
+        # Percorre os laços de fora para dentro; local_names são os nomes
+        # locais da função atual (None no escopo global)
+        if isinstance(node, WhileNode):
+            self.hoist(node, [node.condition, node.block], local_names)
+        elif isinstance(node, ForNode):
+            self.hoist(node, [node.block], local_names)
+        elif isinstance(node, FuncDecNode):
+            local_names = declared_names(node.block) | {name for _, name in node.params}
+            self.hoist_loops(node.block, local_names)
+            return
+        for child in children(node):
+            self.hoist_loops(child, local_names)
+
+    def fold(self, node):
+        # Usa o próprio evaluate do nó: o resultado é idêntico ao da execução.
+        # Se a operação falhar (divisão por zero, tipos), fica para a execução.
+        try:
+            value = node.evaluate(None)
+        except Exception:
+            return node
+        folded = literal(value)
+        self.report.append(f"dobrado: {unparse(node)} -> {unparse(folded)}")
+        return folded
+
+    def hoist(self, loop, parts, local_names):
+        # Laços com chamadas de função podem alterar globais: nesse caso só
+        # expressões sobre variáveis locais são consideradas invariantes
+        written = written_names(loop.block)
+        if isinstance(loop, ForNode):
+            written.add(loop.var_name)
+        has_calls = any(contains_call(part) for part in parts)
+        for part in parts:
+            self.hoist_in(part, loop, written, has_calls, local_names)
+
+    def is_invariant(self, node, written, has_calls, local_names):
+        if not isinstance(node, (BinOpNode, RelationalOpNode, UnOpNode)):
+            return False
+        reads_variable = False
+        for current in walk(node):
+            if isinstance(current, (FuncCallNode, InvariantNode, IndexNode, ArrayOpNode)):
+                # Elementos de vetores podem mudar por qualquer referência ao vetor
+                return False
+            if isinstance(current, IdentifierNode):
+                if current.name in written:
+                    return False
+                if has_calls and (local_names is None or current.name not in local_names):
+                    return False
+                reads_variable = True
+        return reads_variable
+
+    def hoist_in(self, node, loop, written, has_calls, local_names):
+        # Substitui, dentro de node, as maiores subexpressões invariantes
+        if isinstance(node, InvariantNode):
+            return
+        for attribute in ('left', 'right', 'node', 'expr', 'expression', 'condition',
+                          'start_expr', 'end_expr', 'step_expr'):
+            child = getattr(node, attribute, None)
+            if child is None or not isinstance(child, Node):
+                continue
+            if self.is_invariant(child, written, has_calls, local_names):
+                setattr(node, attribute, self.make_invariant(child, loop))
+            else:
+                self.hoist_in(child, loop, written, has_calls, local_names)
+        if isinstance(node, BlockNode):
+            for statement in node.statements:
+                self.hoist_in(statement, loop, written, has_calls, local_names)
+        elif isinstance(node, IfNode):
+            self.hoist_in(node.true_block, loop, written, has_calls, local_names)
+            if node.false_block:
+                self.hoist_in(node.false_block, loop, written, has_calls, local_names)
+        elif isinstance(node, (WhileNode, ForNode)):
+            self.hoist_in(node.block, loop, written, has_calls, local_names)
+        elif isinstance(node, FuncCallNode):
+            for index, arg in enumerate(node.args):
+                if self.is_invariant(arg, written, has_calls, local_names):
+                    node.args[index] = self.make_invariant(arg, loop)
+                else:
+                    self.hoist_in(arg, loop, written, has_calls, local_names)
+
+    def make_invariant(self, expr, loop):
+        self.temp_counter += 1
+        name = f"$inv{self.temp_counter}"
+        loop.hoisted.append(name)
+        self.report.append(f"içado do laço: {unparse(expr)}")
+        return InvariantNode(name, expr)
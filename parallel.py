@@ -0,0 +1,335 @@
+# parallel.py
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+from node import *
+from memo import Memoizer
+from optimizer import referenced_names, is_name
+
+# Voltas mínimas para dividir um laço entre processos: abaixo disso enviar
+# o estado custa mais do que executar em série
+DEFAULT_MIN_ITERATIONS = 2000
+
+def joined(value):
+    # Valor de uma variável STR que pode estar guardada em um StrBuilder
+    if type(value) is StrBuilder:
+        return ''.join(value.pieces)
+    return value
+
+def reduction_kind(assignment):
+    # 'acc RECEBE acc + a - b ...' -> '+' (ou '-' se houver subtração);
+    # 'acc RECEBE acc * a * b ...' -> '*'; senão None
+    operators = set()
+    expr = assignment.expr
+    while isinstance(expr, BinOpNode) and expr.op in ('+', '-', '*'):
+        operators.add(expr.op)
+        expr = expr.left
+    if not operators or not is_name(expr, assignment.var_name):
+        return None
+    if operators == {'*'}:
+        return '*'
+    if '*' in operators:
+        return None
+    return '-' if '-' in operators else '+'
+
+def reference_count(node, name):
+    # Nós de node que leem, escrevem ou declaram o nome
+    count = 0
+    for current in walk(node):
+        if isinstance(current, (IdentifierNode, VarDecNode, ReadNode, IndexNode, IndexAssignNode)):
+            count += current.name == name
+        elif isinstance(current, (AssignmentNode, ForNode)):
+            count += current.var_name == name
+    return count
+
+def declares(statement, name):
+    return (isinstance(statement, VarDecNode) and statement.name == name) or \
+        (isinstance(statement, ForNode) and statement.var_name == name)
+
+class LoopPlan:
+    # Resultado da análise de dependências de um PARA: o que cada volta
+    # escreve e como juntar o que os processos devolvem
+    def __init__(self, private, reductions, arrays, reads):
+        self.private = private        # slots escritos antes de lidos em cada volta
+        self.reductions = reductions  # (depth, slot) -> '+', '-' ou '*'
+        self.arrays = arrays          # (depth, slot) de vetores escritos só em v[var]
+        self.reads = reads            # (depth, slot) lidos no corpo
+
+    def identities(self, symbol_table):
+        # Valor inicial de cada acumulador nos processos (0, 1 ou ''); None
+        # quando o laço deve ser executado em série: acumuladores que não são
+        # INT ou STR (a soma de reais depende da ordem), vetores apelidados
+        identities = {}
+        for (depth, slot), kind in self.reductions.items():
+            value = joined(symbol_table.at(depth).values[slot])
+            if type(value) is int:
+                identities[(depth, slot)] = 1 if kind == '*' else 0
+            elif type(value) is str and kind == '+':
+                identities[(depth, slot)] = ''
+            else:
+                return None
+        for depth, slot in self.arrays:
+            items = symbol_table.at(depth).values[slot]
+            if type(items) is not array and type(items) is not list:
+                return None
+            if any(symbol_table.at(read_depth).values[read_slot] is items for read_depth, read_slot in self.reads):
+                return None
+        return identities
+
+    def run_chunk(self, block, var_slot, frame, first, step, count, identities):
+        # Executado no processo trabalhador sobre uma cópia do frame
+        values = frame.values
+        for slot in self.private:
+            values[slot] = UNDEFINED
+        for (depth, slot), identity in identities.items():
+            frame.at(depth).values[slot] = identity
+        for index in range(count):
+            values[var_slot] = first + index * step
+            block.evaluate(frame)
+
+        private = {slot: values[slot] for slot in self.private if values[slot] is not UNDEFINED}
+        partials = {key: joined(frame.at(key[0]).values[key[1]]) for key in self.reductions}
+        elements = {}
+        for depth, slot in self.arrays:
+            items = frame.at(depth).values[slot]
+            elements[(depth, slot)] = [(position, items[position])
+                                       for position in range(first, first + count * step, step)
+                                       if 0 <= position < len(items)]
+        return private, partials, elements
+
+    def merge(self, symbol_table, results):
+        # Junta os pedaços na ordem das voltas; False (nada alterado) se
+        # algum acumulador mudou de tipo no meio do laço
+        totals = {}
+        for (depth, slot), kind in self.reductions.items():
+            total = joined(symbol_table.at(depth).values[slot])
+            partials = [partials[(depth, slot)] for _, partials, _ in results]
+            if any(type(partial) is not type(total) for partial in partials):
+                return False
+            for partial in partials:
+                total = total * partial if kind == '*' else total + partial
+            totals[(depth, slot)] = total
+
+        values = symbol_table.values
+        for private, _, elements in results:
+            for slot, value in private.items():
+                values[slot] = value
+            for (depth, slot), changes in elements.items():
+                items = symbol_table.at(depth).values[slot]
+                for position, value in changes:
+                    items[position] = value
+        for (depth, slot), total in totals.items():
+            symbol_table.at(depth).values[slot] = total
+        return True
+
+def run_chunk(payload, first, step, count, identities):
+    plan, block, var_slot, frame = pickle.loads(payload)
+    return plan.run_chunk(block, var_slot, frame, first, step, count, identities)
+
+def worker_init():
+    # Nos trabalhadores os laços paralelos rodam em série
+    LoopPool.current = None
+
+class LoopPool:
+    # Processos que executam os laços paralelos da execução atual. Criado
+    # só no primeiro laço longo o bastante.
+    current = None
+
+    def __init__(self, workers, min_iterations=DEFAULT_MIN_ITERATIONS):
+        if workers < 1:
+            raise Exception("Número de processos deve ser positivo")
+        self.workers = workers
+        self.min_iterations = min_iterations
+        self.executor = None
+
+    def run(self, loop, symbol_table, start, end, step):
+        # Executa o laço nos processos; False quando deve rodar em série (o
+        # estado não foi alterado). Qualquer erro nos processos também cai na
+        # execução em série, que repete o erro exatamente como ele ocorre.
+        if type(start) is not int or type(end) is not int or type(step) is not int:
+            return False
+        count = for_iterations(start, end, step)
+        if count is None or count < self.min_iterations:
+            return False
+        plan = loop.plan
+        identities = plan.identities(symbol_table)
+        if identities is None:
+            return False
+
+        chunks = min(self.workers, count)
+        try:
+            # O estado é serializado uma vez e enviado a cada processo
+            payload = pickle.dumps((plan, loop.block, loop.slot, symbol_table), protocol=pickle.HIGHEST_PROTOCOL)
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=worker_init)
+            futures = []
+            done = 0
+            for index in range(chunks):
+                size = count // chunks + (index < count % chunks)
+                futures.append(self.executor.submit(run_chunk, payload, start + done * step, step, size, identities))
+                done += size
+            results = [future.result() for future in futures]
+        except Exception:
+            return False
+        if not plan.merge(symbol_table, results):
+            return False
+        symbol_table.values[loop.slot] = start + count * step
+        return True
+
+    def shutdown(self):
+        if self.executor is not None:
+            # Os resultados já foram todos recolhidos: esperar os processos evita
+            # que a thread de envio do pool escreva em um pipe já fechado
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+class ParallelForNode(ForNode):
+    # PARA com voltas independentes: dividido em pedaços executados por
+    # LoopPool.current. Sem processos, ou com poucas voltas, é um PARA comum.
+    __slots__ = ('plan',)
+
+    def __init__(self, loop, plan):
+        super().__init__(loop.var_name, loop.start_expr, loop.end_expr, loop.step_expr, loop.block)
+        self.position, self.line = loop.position, loop.line
+        self.slot = loop.slot
+        self.hoisted, self.hoisted_slots = loop.hoisted, loop.hoisted_slots
+        self.plan = plan
+
+    def evaluate(self, symbol_table):
+        for slot in self.hoisted_slots:
+            symbol_table.values[slot] = UNDEFINED
+        start_value = self.start_expr.evaluate(symbol_table)
+        end_value = self.end_expr.evaluate(symbol_table)
+        step_value = self.step_expr.evaluate(symbol_table) if self.step_expr else 1
+        pool = LoopPool.current
+        if pool is not None and pool.run(self, symbol_table, start_value, end_value, step_value):
+            return None
+        return self.iterate(symbol_table, start_value, end_value, step_value)
+
+class Parallelizer:
+    # Análise de dependências dos PARA. As voltas são independentes quando o
+    # corpo não usa IMPRIME, LEIA nem RETORNA, só chama funções puras e cada
+    # nome que escreve é:
+    #   - declarado no corpo e sempre escrito antes de ser lido na mesma
+    #     volta (privado; depois do laço fica o valor da última escrita)
+    #   - um acumulador: 'acc RECEBE acc + ...' (ou '-', ou só '*'), sem
+    #     outros usos no corpo; os processos somam a partir de 0 (1, '') e
+    #     as parcelas são juntadas na ordem das voltas
+    #   - um vetor escrito só na posição da variável do laço e não lido
+    # Precisa rodar depois do Resolver. Só os laços mais externos que passam
+    # na análise são trocados; os internos rodam em série nos processos.
+    def __init__(self, ast):
+        declarations = Memoizer.declarations(ast)
+        pure = Memoizer.pure_declarations(declarations)
+        counts = {}
+        for declaration in declarations:
+            counts[declaration.func_name] = counts.get(declaration.func_name, 0) + 1
+        self.pure_names = {declaration.func_name for declaration in pure if counts[declaration.func_name] == 1}
+        self.report = []
+
+    @staticmethod
+    def run(ast):
+        parallelizer = Parallelizer(ast)
+        parallelizer.install(ast)
+        return parallelizer.report
+
+    def install(self, node):
+        if isinstance(node, BlockNode):
+            node.statements = [self.install(statement) for statement in node.statements]
+        elif isinstance(node, IfNode):
+            node.true_block = self.install(node.true_block)
+            if node.false_block:
+                node.false_block = self.install(node.false_block)
+        elif isinstance(node, (WhileNode, FuncDecNode)):
+            node.block = self.install(node.block)
+        elif type(node) is ForNode:
+            plan = self.plan(node)
+            if plan is not None:
+                self.report.append(f"laço paralelo: PARA {node.var_name}" +
+                                   (f" (linha {node.line})" if node.line is not None else ""))
+                return ParallelForNode(node, plan)
+            node.block = self.install(node.block)
+        return node
+
+    def plan(self, loop):
+        body = loop.block
+        if not isinstance(body, BlockNode):
+            return None
+        declared = {}    # nome -> blocos que o declaram diretamente
+        assigned = {}    # nome -> atribuições
+        indexed = {}     # nome -> atribuições em posições de vetor
+        private = set(loop.hoisted_slots)
+        for current in walk(body):
+            if isinstance(current, (PrintNode, ReadNode, ReturnNode, FuncDecNode)):
+                return None
+            if isinstance(current, ArrayOpNode) and current.op in ('PREENCHE', 'COPIA'):
+                return None
+            if isinstance(current, FuncCallNode) and current.func_name not in self.pure_names:
+                return None
+            if isinstance(current, BlockNode):
+                for statement in current.statements:
+                    if isinstance(statement, VarDecNode):
+                        declared.setdefault(statement.name, []).append(current)
+                        private.add(statement.slot)
+                    elif isinstance(statement, ForNode):
+                        declared.setdefault(statement.var_name, []).append(current)
+                        private.add(statement.slot)
+            elif isinstance(current, AssignmentNode):
+                assigned.setdefault(current.var_name, []).append(current)
+            elif isinstance(current, IndexAssignNode):
+                indexed.setdefault(current.name, []).append(current)
+            if isinstance(current, (WhileNode, ForNode)):
+                private.update(current.hoisted_slots)
+
+        if loop.var_name in declared or loop.var_name in assigned or loop.var_name in indexed:
+            return None
+        for name, blocks in declared.items():
+            if not self.is_private(body, name, blocks):
+                return None
+
+        reductions = {}
+        for name, assignments in assigned.items():
+            if name in declared:
+                continue
+            kinds = {reduction_kind(assignment) for assignment in assignments}
+            if None in kinds or len(kinds) > 1 and '*' in kinds:
+                return None
+            # Cada atribuição usa o nome uma vez (ela mesma) e mais uma no acumulador
+            if name in indexed or reference_count(body, name) != 2 * len(assignments):
+                return None
+            kind = '-' if '-' in kinds else kinds.pop()
+            reductions[(assignments[0].depth, assignments[0].slot)] = kind
+
+        arrays = []
+        for name, assignments in indexed.items():
+            if name in declared:
+                continue
+            if not all(is_name(assignment.index, loop.var_name) for assignment in assignments):
+                return None
+            if reference_count(body, name) != len(assignments):
+                return None
+            arrays.append((assignments[0].depth, assignments[0].slot))
+
+        reads = {(current.depth, current.slot) for current in walk(body)
+                 if isinstance(current, (IdentifierNode, IndexNode)) and current.name not in declared}
+        return LoopPlan(sorted(private), reductions, arrays, sorted(reads))
+
+    @staticmethod
+    def is_private(body, name, blocks):
+        # Declarado em um único bloco, sem usos fora dele nem antes da
+        # primeira declaração (nem na própria expressão ou limites)
+        block = blocks[0]
+        if any(other is not block for other in blocks):
+            return False
+        if reference_count(block, name) != reference_count(body, name):
+            return False
+        for statement in block.statements:
+            if declares(statement, name):
+                if isinstance(statement, VarDecNode):
+                    parts = [statement.expression] if statement.expression else []
+                else:
+                    parts = [statement.start_expr, statement.end_expr] + \
+                        ([statement.step_expr] if statement.step_expr else [])
+                return not any(name in referenced_names(part) for part in parts)
+            if name in referenced_names(statement):
+                return False
+        return False
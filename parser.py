@@ -1,151 +1,180 @@
 # parser.py
 from tokenizer import Tokenizer
 from node import *
-from symboltable import SymbolTable
+
+# Precedência dos operadores binários (maior liga mais forte), todos
+# associativos à esquerda. Os relacionais só valem no nível mais externo de
+# uma condição, uma única vez.
+RELATIONAL_PRECEDENCE = 0
+PRECEDENCE = {
+    'IGUAL': 0, 'DIFERENTE': 0, 'MAIOR': 0, 'MENOR': 0, 'MAIORIGUAL': 0, 'MENORIGUAL': 0,
+    '+': 1, '-': 1,
+    '*': 2, '/': 2,
+}
+
+# Unários ligam mais forte que qualquer binário: aplicam-se só ao operando seguinte
+UNARY_OPERATORS = frozenset('+-!')
+UNARY_PRECEDENCE = 3
+
+# Quadros abertos na pilha de operadores: parênteses, argumentos, índices
+FRAME = -1
+GROUP, CALL, INDEX = range(3)
 
 class Parser:
-    tokens = None
-    current_token = None
+    # Cada instância analisa um programa, com seu próprio vetor de tokens e
+    # posição: vários programas podem ser analisados ao mesmo tempo (threads)
+    def __init__(self, code):
+        self.tokens = Tokenizer(code)
+        self.position = 0
+        self.current_token = self.tokens.tokens[0]
 
-    @staticmethod
-    def parse_program():
+    def parse_program(self):
         statements = []
-        while Parser.current_token.type != 'EOF':
-            statements.append(Parser.parse_command())
+        while self.current_token.type != 'EOF':
+            statements.append(self.parse_command())
         return BlockNode(statements)
 
-    @staticmethod
-    def parse_command():
-        if Parser.current_token.type == 'RESERVED':
-            if Parser.current_token.value == 'IMPRIME':
-                Parser.advance()
-                expr = Parser.parse_expression()
-                if Parser.current_token.value != ';':
+    def parse_command(self):
+        # Cada comando guarda o índice do seu primeiro token (linha via Tokenizer.location)
+        start = self.position
+        node = self.parse_statement()
+        node.position = start
+        if isinstance(node, BlockNode):
+            # Declaração múltipla: as declarações ficam na mesma posição
+            for declaration in node.statements:
+                declaration.position = start
+        return node
+
+    def parse_statement(self):
+        if self.current_token.type == 'RESERVED':
+            if self.current_token.value == 'IMPRIME':
+                self.advance()
+                expr = self.parse_expression()
+                if self.current_token.value != ';':
                     raise Exception("Esperado ';' após expressão")
-                Parser.advance()
+                self.advance()
                 return PrintNode(expr)
-            elif Parser.current_token.value == 'LEIA':
-                Parser.advance()
-                if Parser.current_token.type != 'IDENTIFIER':
+            elif self.current_token.value == 'LEIA':
+                self.advance()
+                if self.current_token.type != 'IDENTIFIER':
                     raise Exception("Esperado identificador após 'LEIA'")
-                var_name = Parser.current_token.value
-                Parser.advance()
-                if Parser.current_token.value != ';':
+                var_name = self.current_token.value
+                self.advance()
+                if self.current_token.value != ';':
                     raise Exception("Esperado ';' após identificador")
-                Parser.advance()
+                self.advance()
                 return ReadNode(var_name)
-            elif Parser.current_token.value == 'SE':
-                Parser.advance()
-                condition = Parser.parse_condition()
-                if Parser.current_token.value != 'ENTAO':
+            elif self.current_token.value == 'SE':
+                self.advance()
+                condition = self.parse_condition()
+                if self.current_token.value != 'ENTAO':
                     raise Exception("Esperado 'ENTAO' após condição")
-                Parser.advance()
-                true_block = Parser.parse_block()
+                self.advance()
+                true_block = self.parse_block()
                 false_block = None
-                if Parser.current_token.value == 'SENAO':
-                    Parser.advance()
-                    false_block = Parser.parse_block()
-                if Parser.current_token.value != 'FIMSE':
+                if self.current_token.value == 'SENAO':
+                    self.advance()
+                    false_block = self.parse_block()
+                if self.current_token.value != 'FIMSE':
                     raise Exception("Esperado 'FIMSE' após bloco 'SE'")
-                Parser.advance()
+                self.advance()
                 return IfNode(condition, true_block, false_block)
-            elif Parser.current_token.value == 'ENQUANTO':
-                Parser.advance()
-                condition = Parser.parse_condition()
-                if Parser.current_token.value != 'FACA':
+            elif self.current_token.value == 'ENQUANTO':
+                self.advance()
+                condition = self.parse_condition()
+                if self.current_token.value != 'FACA':
                     raise Exception("Esperado 'FACA' após condição")
-                Parser.advance()
-                block = Parser.parse_block()
-                if Parser.current_token.value != 'FIMENQUANTO':
+                self.advance()
+                block = self.parse_block()
+                if self.current_token.value != 'FIMENQUANTO':
                     raise Exception("Esperado 'FIMENQUANTO' após bloco 'ENQUANTO'")
-                Parser.advance()
+                self.advance()
                 return WhileNode(condition, block)
-            elif Parser.current_token.value == 'PARA':
-                Parser.advance()
-                if Parser.current_token.value not in ['INT', 'STR', 'BOOL']:
+            elif self.current_token.value == 'PARA':
+                self.advance()
+                if self.current_token.value not in ['INT', 'STR', 'BOOL']:
                     raise Exception("Esperado tipo após 'PARA'")
-                var_type = Parser.current_token.value
-                Parser.advance()
-                if Parser.current_token.type != 'IDENTIFIER':
+                var_type = self.current_token.value
+                self.advance()
+                if self.current_token.type != 'IDENTIFIER':
                     raise Exception("Esperado identificador após tipo em 'PARA'")
-                var_name = Parser.current_token.value
-                Parser.advance()
-                if Parser.current_token.value != 'DE':
+                var_name = self.current_token.value
+                self.advance()
+                if self.current_token.value != 'DE':
                     raise Exception("Esperado 'DE' após identificador")
-                Parser.advance()
-                start_expr = Parser.parse_expression()
-                if Parser.current_token.value != 'ATE':
+                self.advance()
+                start_expr = self.parse_expression()
+                if self.current_token.value != 'ATE':
                     raise Exception("Esperado 'ATE' após expressão inicial")
-                Parser.advance()
-                end_expr = Parser.parse_expression()
+                self.advance()
+                end_expr = self.parse_expression()
                 step_expr = None
-                if Parser.current_token.value == 'PASSO':
-                    Parser.advance()
-                    step_expr = Parser.parse_expression()
-                if Parser.current_token.value != 'FACA':
+                if self.current_token.value == 'PASSO':
+                    self.advance()
+                    step_expr = self.parse_expression()
+                if self.current_token.value != 'FACA':
                     raise Exception("Esperado 'FACA' para iniciar o bloco do 'PARA'")
-                Parser.advance()
-                block = Parser.parse_block()
-                if Parser.current_token.value != 'FIMPARA':
+                self.advance()
+                block = self.parse_block()
+                if self.current_token.value != 'FIMPARA':
                     raise Exception("Esperado 'FIMPARA' após bloco 'PARA'")
-                Parser.advance()
+                self.advance()
                 return ForNode(var_name, start_expr, end_expr, step_expr, block)
-            elif Parser.current_token.value == 'FUNCAO':
-                Parser.advance()
-                if Parser.current_token.value not in ['INT', 'STR', 'BOOL']:
+            elif self.current_token.value == 'FUNCAO':
+                self.advance()
+                if self.current_token.value not in ['INT', 'STR', 'BOOL']:
                     raise Exception("Esperado tipo após 'FUNCAO'")
-                func_type = Parser.current_token.value
-                Parser.advance()
-                if Parser.current_token.type != 'IDENTIFIER':
+                func_type = self.current_token.value
+                self.advance()
+                if self.current_token.type != 'IDENTIFIER':
                     raise Exception("Esperado identificador após tipo na declaração de função")
-                func_name = Parser.current_token.value
-                Parser.advance()
-                if Parser.current_token.value != '(':
+                func_name = self.current_token.value
+                if func_name.upper() in ARRAY_OPERATIONS:
+                    raise Exception(f"Nome reservado para operação de vetor: {func_name}")
+                self.advance()
+                if self.current_token.value != '(':
                     raise Exception("Esperado '(' após nome da função")
-                Parser.advance()
+                self.advance()
                 params = []
-                if Parser.current_token.value != ')':
+                if self.current_token.value != ')':
                     while True:
-                        param_type = Parser.current_token.value
-                        if param_type not in ['INT', 'STR', 'BOOL']:
-                            raise Exception("Tipo de parâmetro inválido")
-                        Parser.advance()
-                        if Parser.current_token.type != 'IDENTIFIER':
+                        param_type = self.parse_param_type()
+                        if self.current_token.type != 'IDENTIFIER':
                             raise Exception("Esperado identificador do parâmetro")
-                        param_name = Parser.current_token.value
-                        Parser.advance()
+                        param_name = self.current_token.value
+                        self.advance()
                         params.append((param_type, param_name))
-                        if Parser.current_token.value == ',':
-                            Parser.advance()
+                        if self.current_token.value == ',':
+                            self.advance()
                         else:
                             break
-                if Parser.current_token.value != ')':
+                if self.current_token.value != ')':
                     raise Exception("Esperado ')' após parâmetros")
-                Parser.advance()
-                block = Parser.parse_block()
+                self.advance()
+                block = self.parse_block()
                 return FuncDecNode(func_type, func_name, params, block)
-            elif Parser.current_token.value in ['INT', 'STR', 'BOOL']:
+            elif self.current_token.value in ['INT', 'STR', 'BOOL']:
                 # Declaração de variáveis (possivelmente múltiplas)
                 declarations = []
                 while True:
-                    var_type = Parser.current_token.value
-                    Parser.advance()
-                    if Parser.current_token.type != 'IDENTIFIER':
+                    var_type = self.current_token.value
+                    self.advance()
+                    if self.current_token.type != 'IDENTIFIER':
                         raise Exception("Esperado identificador após tipo")
-                    var_name = Parser.current_token.value
-                    Parser.advance()
+                    var_name = self.current_token.value
+                    self.advance()
                     expr = None
-                    if Parser.current_token.value == 'RECEBE':
-                        Parser.advance()
-                        expr = Parser.parse_expression()
+                    if self.current_token.value == 'RECEBE':
+                        self.advance()
+                        expr = self.parse_expression()
                     declarations.append(VarDecNode(var_type, var_name, expr))
-                    if Parser.current_token.value == ',':
-                        Parser.advance()
-                        if Parser.current_token.value not in ['INT', 'STR', 'BOOL']:
+                    if self.current_token.value == ',':
+                        self.advance()
+                        if self.current_token.value not in ['INT', 'STR', 'BOOL']:
                             raise Exception("Esperado tipo após ',' em declaração múltipla")
                         continue
-                    elif Parser.current_token.value == ';':
-                        Parser.advance()
+                    elif self.current_token.value == ';':
+                        self.advance()
                         break
                     else:
                         raise Exception("Esperado ',', 'RECEBE' ou ';' após declaração")
@@ -153,147 +182,289 @@ class Parser:
                     return declarations[0]
                 else:
                     return BlockNode(declarations)
-            elif Parser.current_token.value == 'RETORNA':
-                Parser.advance()
-                expr = Parser.parse_expression()
-                if Parser.current_token.value != ';':
+            elif self.current_token.value == 'VETOR':
+                self.advance()
+                element = self.current_token.value
+                if element not in ['INT', 'STR', 'BOOL']:
+                    raise Exception("Esperado tipo após 'VETOR'")
+                self.advance()
+                if self.current_token.type != 'IDENTIFIER':
+                    raise Exception("Esperado identificador após tipo do vetor")
+                var_name = self.current_token.value
+                self.advance()
+                size_expr = self.parse_index()
+                if self.current_token.value != ';':
+                    raise Exception("Esperado ';' após declaração do vetor")
+                self.advance()
+                return ArrayDecNode(element, var_name, size_expr)
+            elif self.current_token.value == 'RETORNA':
+                self.advance()
+                expr = self.parse_expression()
+                if self.current_token.value != ';':
                     raise Exception("Esperado ';' após expressão")
-                Parser.advance()
+                self.advance()
                 return ReturnNode(expr)
             else:
-                raise Exception(f"Comando desconhecido: {Parser.current_token.value}")
-        elif Parser.current_token.type == 'IDENTIFIER':
-            var_name = Parser.current_token.value
-            Parser.advance()
-            if Parser.current_token.value == 'RECEBE':
-                Parser.advance()
-                expr = Parser.parse_expression()
-                if Parser.current_token.value != ';':
+                raise Exception(f"Comando desconhecido: {self.current_token.value}")
+        elif self.current_token.type == 'IDENTIFIER':
+            var_name = self.current_token.value
+            self.advance()
+            if self.current_token.value == 'RECEBE':
+                self.advance()
+                expr = self.parse_expression()
+                if self.current_token.value != ';':
                     raise Exception("Esperado ';' após expressão")
-                Parser.advance()
+                self.advance()
                 return AssignmentNode(var_name, expr)
-            elif Parser.current_token.value == '(':
+            elif self.current_token.value == '[':
+                index = self.parse_index()
+                if self.current_token.value != 'RECEBE':
+                    raise Exception("Esperado 'RECEBE' após índice do vetor")
+                self.advance()
+                expr = self.parse_expression()
+                if self.current_token.value != ';':
+                    raise Exception("Esperado ';' após expressão")
+                self.advance()
+                return IndexAssignNode(var_name, index, expr)
+            elif self.current_token.value == '(' and var_name.upper() in ARRAY_OPERATIONS:
+                node = self.parse_array_operation(var_name.upper())
+                if self.current_token.value != ';':
+                    raise Exception(f"Esperado ';' após {node.op}")
+                self.advance()
+                return node
+            elif self.current_token.value == '(':
                 # Chamada de função
-                Parser.advance()
+                self.advance()
                 args = []
-                if Parser.current_token.value != ')':
+                if self.current_token.value != ')':
                     while True:
-                        arg_expr = Parser.parse_expression()
+                        arg_expr = self.parse_expression()
                         args.append(arg_expr)
-                        if Parser.current_token.value == ',':
-                            Parser.advance()
+                        if self.current_token.value == ',':
+                            self.advance()
                         else:
                             break
-                if Parser.current_token.value != ')':
+                if self.current_token.value != ')':
                     raise Exception("Esperado ')' após argumentos")
-                Parser.advance()
-                if Parser.current_token.value != ';':
+                self.advance()
+                if self.current_token.value != ';':
                     raise Exception("Esperado ';' após chamada de função")
-                Parser.advance()
+                self.advance()
                 return FuncCallNode(var_name, args)
             else:
-                raise Exception(f"Comando desconhecido após identificador: {Parser.current_token.value}")
+                raise Exception(f"Comando desconhecido após identificador: {self.current_token.value}")
         else:
-            raise Exception(f"Comando inválido: {Parser.current_token}")
+            raise Exception(f"Comando inválido: {self.current_token}")
 
-    @staticmethod
-    def parse_block():
-        if Parser.current_token.value != '{':
+    def parse_block(self):
+        if self.current_token.value != '{':
             raise Exception("Esperado '{' para iniciar o bloco")
-        Parser.advance()
+        self.advance()
         statements = []
-        while Parser.current_token.value != '}':
-            statements.append(Parser.parse_command())
-        Parser.advance()
+        while self.current_token.value != '}':
+            statements.append(self.parse_command())
+        self.advance()
         return BlockNode(statements)
 
-    @staticmethod
-    def parse_expression():
-        node = Parser.parse_term()
-        while Parser.current_token.value in ['+', '-']:
-            op = Parser.current_token.value
-            Parser.advance()
-            right = Parser.parse_term()
-            node = BinOpNode(node, op, right)
-        return node
+    def parse_expression(self):
+        return self.parse_operators(False)
 
-    @staticmethod
-    def parse_term():
-        node = Parser.parse_factor()
-        while Parser.current_token.value in ['*', '/']:
-            op = Parser.current_token.value
-            Parser.advance()
-            right = Parser.parse_factor()
-            node = BinOpNode(node, op, right)
-        return node
+    def parse_operators(self, relational):
+        # Precedência de operadores sem recursão: operandos e operadores
+        # pendentes ficam em pilhas explícitas. Parênteses, argumentos de
+        # chamadas e índices abrem um quadro na pilha de operadores, então a
+        # profundidade só é limitada pela memória e cada token é empilhado e
+        # desempilhado uma vez (tempo linear). relational: aceita um operador
+        # relacional no nível mais externo (condições).
+        # Entradas da pilha de operadores: (precedência, operador), ou
+        # (FRAME, (tipo do quadro, dados)) para quadros abertos; FRAME fica
+        # abaixo de todas as precedências, então nenhuma redução passa dele.
+        tokens = self.tokens.tokens
+        position = self.position
+        token = tokens[position]
+        operands = []
+        operators = []
+        frames = 0
+        while True:
+            # Operando: operadores unários e aberturas até chegar a um valor
+            kind = token.type
+            value = token.value
+            if kind == 'NUMBER':
+                operands.append(NumberNode(value))
+                position += 1
+                token = tokens[position]
+            elif kind == 'IDENTIFIER':
+                position += 1
+                token = tokens[position]
+                if token.value == '(':
+                    position += 1
+                    token = tokens[position]
+                    if token.value != ')':
+                        operators.append((FRAME, (CALL, (value, []))))
+                        frames += 1
+                        continue
+                    operands.append(self.call_node(value, []))
+                    position += 1
+                    token = tokens[position]
+                elif token.value == '[':
+                    position += 1
+                    token = tokens[position]
+                    operators.append((FRAME, (INDEX, value)))
+                    frames += 1
+                    continue
+                else:
+                    operands.append(IdentifierNode(value))
+            elif kind == 'STRING':
+                operands.append(StringNode(value))
+                position += 1
+                token = tokens[position]
+            elif kind == 'SYMBOL' and value in UNARY_OPERATORS:
+                operators.append((UNARY_PRECEDENCE, value))
+                position += 1
+                token = tokens[position]
+                continue
+            elif kind == 'SYMBOL' and value == '(':
+                operators.append((FRAME, (GROUP, None)))
+                frames += 1
+                position += 1
+                token = tokens[position]
+                continue
+            else:
+                self.position, self.current_token = position, token
+                raise Exception(f"Fator inválido: {token}")
 
-    @staticmethod
-    def parse_factor():
-        if Parser.current_token.type == 'NUMBER':
-            node = NumberNode(Parser.current_token.value)
-            Parser.advance()
-            return node
-        elif Parser.current_token.type == 'STRING':
-            node = StringNode(Parser.current_token.value)
-            Parser.advance()
-            return node
-        elif Parser.current_token.type == 'IDENTIFIER':
-            var_name = Parser.current_token.value
-            Parser.advance()
-            if Parser.current_token.value == '(':
-                # Chamada de função
-                Parser.advance()
-                args = []
-                if Parser.current_token.value != ')':
-                    while True:
-                        arg_expr = Parser.parse_expression()
-                        args.append(arg_expr)
-                        if Parser.current_token.value == ',':
-                            Parser.advance()
+            # Operador binário (volta a esperar um operando) ou fechamento de
+            # quadros. Antes, aplica os operadores do topo que ligam pelo menos
+            # tão forte quanto ele (associatividade à esquerda); um fechamento
+            # aplica todos até o quadro.
+            while True:
+                value = token.value
+                precedence = PRECEDENCE.get(value) if token.type != 'STRING' else None
+                binary = precedence is not None and (precedence > RELATIONAL_PRECEDENCE or (relational and not frames))
+                limit = precedence if binary else RELATIONAL_PRECEDENCE
+                while operators and operators[-1][0] >= limit:
+                    top, op = operators.pop()
+                    if top == UNARY_PRECEDENCE:
+                        operands.append(UnOpNode(op, operands.pop()))
+                    else:
+                        right = operands.pop()
+                        if top == RELATIONAL_PRECEDENCE:
+                            operands[-1] = RelationalOpNode(operands[-1], op, right)
                         else:
-                            break
-                if Parser.current_token.value != ')':
-                    raise Exception("Esperado ')' após argumentos")
-                Parser.advance()
-                return FuncCallNode(var_name, args)
-            else:
-                return IdentifierNode(var_name)
-        elif Parser.current_token.value == '(':
-            Parser.advance()
-            node = Parser.parse_expression()
-            if Parser.current_token.value != ')':
-                raise Exception("Esperado ')'")
-            Parser.advance()
-            return node
-        elif Parser.current_token.value in ['+', '-', '!']:
-            op = Parser.current_token.value
-            Parser.advance()
-            node = UnOpNode(op, Parser.parse_factor())
-            return node
-        else:
-            raise Exception(f"Fator inválido: {Parser.current_token}")
+                            operands[-1] = BinOpNode(operands[-1], op, right)
+                if binary:
+                    operators.append((precedence, value))
+                    position += 1
+                    token = tokens[position]
+                    if precedence == RELATIONAL_PRECEDENCE:
+                        relational = False  # não associativos: um por condição
+                    break
+                if not frames:
+                    self.position, self.current_token = position, token
+                    return operands.pop()
+                kind, frame = operators[-1][1]
+                if kind == GROUP:
+                    if value != ')':
+                        self.position, self.current_token = position, token
+                        raise Exception("Esperado ')'")
+                elif kind == CALL:
+                    frame[1].append(operands.pop())
+                    if value == ',':
+                        position += 1
+                        token = tokens[position]
+                        break
+                    if value != ')':
+                        self.position, self.current_token = position, token
+                        raise Exception("Esperado ')' após argumentos")
+                    operands.append(self.call_node(*frame))
+                else:
+                    if value != ']':
+                        self.position, self.current_token = position, token
+                        raise Exception("Esperado ']'")
+                    operands.append(IndexNode(frame, operands.pop()))
+                operators.pop()
+                frames -= 1
+                position += 1
+                token = tokens[position]
 
-    @staticmethod
-    def parse_condition():
-        left = Parser.parse_expression()
-        if Parser.current_token.value in ['IGUAL', 'DIFERENTE', 'MAIOR', 'MENOR', 'MAIORIGUAL', 'MENORIGUAL']:
-            op = Parser.current_token.value
-            Parser.advance()
-            right = Parser.parse_expression()
-            return RelationalOpNode(left, op, right)
-        else:
-            raise Exception(f"Operador relacional esperado, encontrado: {Parser.current_token.value}")
+    def call_node(self, name, args):
+        # Chamada de função ou operação de vetor (TAMANHO, TOTAL, PREENCHE,
+        # COPIA: não são palavras reservadas, valem em qualquer caixa)
+        op = name.upper()
+        if op not in ARRAY_OPERATIONS:
+            return FuncCallNode(name, args)
+        if len(args) != ARRAY_OPERATIONS[op]:
+            raise Exception(f"Número incorreto de argumentos para {op}")
+        return ArrayOpNode(op, args)
 
-    @staticmethod
-    def advance():
-        Parser.tokens.select_next()
-        Parser.current_token = Parser.tokens.next
+    def parse_param_type(self):
+        # INT, STR, BOOL ou VETOR seguido do tipo dos elementos
+        param_type = self.current_token.value
+        if param_type == 'VETOR':
+            self.advance()
+            if self.current_token.value not in ['INT', 'STR', 'BOOL']:
+                raise Exception("Esperado tipo após 'VETOR'")
+            param_type = f"VETOR {self.current_token.value}"
+        elif param_type not in ['INT', 'STR', 'BOOL']:
+            raise Exception("Tipo de parâmetro inválido")
+        self.advance()
+        return param_type
 
-    @staticmethod
-    def run(code):
-        Parser.tokens = Tokenizer(code)
-        Parser.current_token = Parser.tokens.next
-        root = Parser.parse_program()
-        if Parser.current_token.type != 'EOF':
+    def parse_index(self):
+        if self.current_token.value != '[':
+            raise Exception("Esperado '['")
+        self.advance()
+        index = self.parse_expression()
+        if self.current_token.value != ']':
+            raise Exception("Esperado ']'")
+        self.advance()
+        return index
+
+    def parse_array_operation(self, op):
+        # Operação de vetor usada como comando
+        self.advance()
+        args = []
+        if self.current_token.value != ')':
+            while True:
+                args.append(self.parse_expression())
+                if self.current_token.value == ',':
+                    self.advance()
+                else:
+                    break
+        if self.current_token.value != ')':
+            raise Exception("Esperado ')' após argumentos")
+        self.advance()
+        return self.call_node(op, args)
+
+    def parse_condition(self):
+        condition = self.parse_operators(True)
+        if not isinstance(condition, RelationalOpNode):
+            raise Exception(f"Operador relacional esperado, encontrado: {self.current_token.value}")
+        return condition
+
+    def advance(self):
+        self.position += 1
+        self.current_token = self.tokens.tokens[self.position]
+
+    def parse(self):
+        root = self.parse_program()
+        if self.current_token.type != 'EOF':
             raise Exception("Código após o final do programa")
         return root
+
+    @staticmethod
+    def run(code):
+        return Parser(code).parse()
+
+    @staticmethod
+    def assign_lines(ast, tokenizer):
+        # Converte as posições dos comandos (inclusive dentro de funções) em
+        # linhas. Fica fora do parse porque exige uma segunda varredura do
+        # código; só é usado quando alguém precisa das linhas (perfil).
+        pending = [ast]
+        while pending:
+            for current in walk(pending.pop()):
+                if current.position is not None:
+                    current.line = tokenizer.location(current.position)[0]
+                if isinstance(current, FuncDecNode):
+                    pending.append(current.block)
@@ -0,0 +1,186 @@
+# profiler.py
+from time import perf_counter
+from node import *
+
+# Comandos medidos (os que recebem posição do Parser) e seus rótulos
+STATEMENT_LABELS = {
+    'VarDecNode': lambda node: f"{node.var_type} {node.name}",
+    'AssignmentNode': lambda node: f"{node.var_name} RECEBE",
+    'IndexAssignNode': lambda node: f"{node.name}[] RECEBE",
+    'ArrayOpNode': lambda node: f"{node.op}()",
+    'PrintNode': lambda node: "IMPRIME",
+    'ReadNode': lambda node: f"LEIA {node.name}",
+    'IfNode': lambda node: "SE",
+    'WhileNode': lambda node: "ENQUANTO",
+    'ForNode': lambda node: f"PARA {node.var_name}",
+    'ReturnNode': lambda node: "RETORNA",
+    'FuncCallNode': lambda node: f"{node.func_name}()",
+    'FuncDecNode': lambda node: f"FUNCAO {node.func_name} (declaração)",
+}
+
+# Linhas do relatório textual
+REPORT_LIMIT = 40
+
+SORT_KEYS = {
+    'total': lambda item: item[1][1],
+    'proprio': lambda item: item[1][2],
+    'execucoes': lambda item: item[1][0],
+}
+
+class Profiler:
+    # Mede, para cada comando e cada função, o número de execuções, o tempo
+    # total (sem contar duas vezes as chamadas recursivas) e o tempo próprio
+    # (descontados os comandos e funções internos). Na instalação, cada nó
+    # de comando da AST (os que têm position) passa a ser de uma subclasse
+    # com o evaluate medido; expressões e nós criados por otimizações ficam
+    # com a classe original e não pagam nada. FuncCallNode.call também é
+    # trocado. Só vale para a execução pela AST.
+    def __init__(self):
+        # chave (nó ou corpo da função) -> [execuções, total, próprio, ativas]
+        self.stats = {}
+        # Árvore de chamadas para o arquivo de pilhas: [tempo próprio, {chave: filho}]
+        self.tree = [0.0, {}]
+        # Ativações em curso: [nó da árvore, tempo gasto nos filhos]
+        self.stack = [[self.tree, 0.0]]
+        self.labels = {}
+        # classe original -> subclasse medida, e os nós que trocaram de classe
+        self.measured_classes = {}
+        self.measured_nodes = []
+        self.original_call = None
+        self.started = None
+        self.elapsed = 0.0
+
+    def measure(self, method):
+        # Versão de method que mede cada execução sob a chave recebida.
+        # Tudo fica em variáveis locais: é o caminho quente do perfil.
+        stats = self.stats
+        stack = self.stack
+        def measured(key, first, second):
+            entry = stats.get(key)
+            if entry is None:
+                entry = stats[key] = [0, 0.0, 0.0, 0]
+            entry[0] += 1
+            entry[3] += 1
+            parent = stack[-1]
+            children = parent[0][1]
+            tree = children.get(key)
+            if tree is None:
+                tree = children[key] = [0.0, {}]
+            frame = [tree, 0.0]
+            stack.append(frame)
+            start = perf_counter()
+            try:
+                return method(first, second)
+            finally:
+                elapsed = perf_counter() - start
+                stack.pop()
+                entry[3] -= 1
+                if entry[3] == 0:
+                    entry[1] += elapsed
+                own = elapsed - frame[1]
+                entry[2] += own
+                tree[0] += own
+                parent[1] += elapsed
+        return measured
+
+    def wrap(self, method):
+        measured = self.measure(method)
+        def evaluate(node, symbol_table):
+            return measured(node, node, symbol_table)
+        return evaluate
+
+    def measured_class(self, cls):
+        # Subclasse sem campos novos: o nó pode trocar de classe e voltar
+        if cls not in self.measured_classes:
+            self.measured_classes[cls] = type(cls)(cls.__name__, (cls,), {
+                '__slots__': (),
+                '__module__': cls.__module__,
+                'evaluate': self.wrap(cls.evaluate),
+            })
+        return self.measured_classes[cls]
+
+    def wrap_call(self, call):
+        measured = self.measure(call)
+        def measured_call(function, arg_values):
+            return measured(function.block, function, arg_values)
+        return staticmethod(measured_call)
+
+    def install(self, ast):
+        # Rótulos das funções (o corpo, function.block, identifica a
+        # declaração) e troca de classe dos nós de comando
+        measured = set(self.measured_classes.values())
+        pending = [ast]
+        while pending:
+            for current in walk(pending.pop()):
+                if isinstance(current, FuncDecNode):
+                    self.labels[current.block] = (f"FUNCAO {current.func_name}", current.line)
+                    pending.append(current.block)
+                cls = type(current)
+                if current.position is not None and cls not in measured and self.label_for_class(cls) is not None:
+                    current.__class__ = self.measured_class(cls)
+                    self.measured_nodes.append((current, cls))
+                    measured.add(current.__class__)
+        self.original_call = FuncCallNode.__dict__['call']
+        FuncCallNode.call = self.wrap_call(FuncCallNode.call)
+        self.started = perf_counter()
+
+    def uninstall(self):
+        if self.started is not None:
+            self.elapsed = perf_counter() - self.started
+        for node, cls in self.measured_nodes:
+            node.__class__ = cls
+        self.measured_nodes = []
+        if self.original_call is not None:
+            FuncCallNode.call = self.original_call
+            self.original_call = None
+
+    @staticmethod
+    def label_for_class(cls):
+        for base in cls.__mro__:
+            if base.__name__ in STATEMENT_LABELS:
+                return STATEMENT_LABELS[base.__name__]
+        return None
+
+    def describe(self, key):
+        # (rótulo, linha) de uma chave de estatística
+        if key in self.labels:
+            return self.labels[key]
+        return self.label_for_class(type(key))(key), key.line
+
+    def frame_name(self, key):
+        label, line = self.describe(key)
+        return label if line is None else f"{label} linha {line}"
+
+    def report(self, order='total', limit=REPORT_LIMIT):
+        total = self.elapsed
+        functions = [(key, entry) for key, entry in self.stats.items() if key in self.labels]
+        statements = [(key, entry) for key, entry in self.stats.items() if key not in self.labels]
+        lines = [f"Perfil: {total * 1000:.2f}ms de execução"]
+        for title, items in (("Funções", functions), ("Comandos", statements)):
+            if not items:
+                continue
+            items.sort(key=SORT_KEYS[order], reverse=True)
+            lines.append("")
+            lines.append(f"{title} (por {order}):")
+            lines.append(f"{'linha':>6}  {'execuções':>10}  {'total ms':>10}  {'próprio ms':>10}  {'próprio %':>9}  comando")
+            for key, (count, key_total, own, _) in items[:limit]:
+                label, line = self.describe(key)
+                share = 100.0 * own / total if total > 0 else 0.0
+                lines.append(f"{'?' if line is None else line:>6}  {count:>10}  {key_total * 1000:>10.3f}  "
+                             f"{own * 1000:>10.3f}  {share:>8.1f}%  {label}")
+            if len(items) > limit:
+                lines.append(f"  ... mais {len(items) - limit}")
+        return '\n'.join(lines)
+
+    def write_collapsed(self, path):
+        # Formato "quadro;quadro;... valor" (microssegundos), lido por
+        # flamegraph.pl, speedscope e similares
+        with open(path, 'w', encoding='utf-8') as output:
+            pending = [(['programa'], self.tree)]
+            while pending:
+                frames, (own, children) = pending.pop()
+                microseconds = int(own * 1_000_000)
+                if microseconds > 0 and len(frames) > 1:
+                    output.write(f"{';'.join(frames)} {microseconds}\n")
+                for key, child in children.items():
+                    pending.append((frames + [self.frame_name(key).replace(';', ',')], child))
@@ -0,0 +1,45 @@
+# protocol.py
+import json
+import os
+import struct
+import tempfile
+
+# Socket padrão do servidor: um por usuário
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"logcomp-{os.getuid()}.sock")
+
+# Mensagens: tamanho em 4 bytes (big-endian) seguido de um objeto JSON em UTF-8.
+# Requisição: caminho ou fonte, entrada (texto para LEIA), opcoes (as do
+# main.py) e tempo_limite. Resposta: status, erro, saida, erros (stderr),
+# segundos, cache e trabalhador.
+HEADER = struct.Struct('>I')
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+def send_message(connection, message):
+    data = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    connection.sendall(HEADER.pack(len(data)) + data)
+
+def receive_message(connection):
+    # None quando a conexão termina entre mensagens
+    header = receive_exactly(connection, HEADER.size)
+    if header is None:
+        return None
+    (size,) = HEADER.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise Exception("Mensagem grande demais")
+    data = receive_exactly(connection, size)
+    if data is None:
+        raise Exception("Conexão encerrada no meio de uma mensagem")
+    return json.loads(data.decode('utf-8'))
+
+def receive_exactly(connection, size):
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = connection.recv(min(remaining, 1 << 20))
+        if not chunk:
+            if chunks:
+                raise Exception("Conexão encerrada no meio de uma mensagem")
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
@@ -0,0 +1,173 @@
+# resolver.py
+from node import *
+
+class Scope:
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.slots = {}   # nome -> índice no Frame
+        self.types = {}   # nome -> tipo declarado
+        self.names = []   # índice -> nome (mensagens de erro)
+
+    @property
+    def size(self):
+        return len(self.names)
+
+    def declare(self, name, var_type=None):
+        if name not in self.slots:
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+        if var_type is not None:
+            self.types[name] = var_type
+        return self.slots[name]
+
+    def at(self, depth):
+        scope = self
+        while depth:
+            scope = scope.parent
+            depth -= 1
+        return scope
+
+    def resolve(self, name):
+        depth = 0
+        scope = self
+        while scope is not None:
+            if name in scope.slots:
+                return depth, scope.slots[name]
+            scope = scope.parent
+            depth += 1
+        # Nome nunca declarado: reserva um slot global e deixa o erro para a execução
+        depth -= 1
+        return depth, self.at(depth).declare(name)
+
+class Resolver:
+    # Atribui a cada nome um endereço fixo (profundidade, slot) antes da execução.
+    # Escopos: o global e um por função (cujo pai é sempre o global).
+    # Atribuir (RECEBE ou LEIA) a um nome global não declarado na função cria
+    # uma cópia local dele: o slot local recebe o valor global na chamada
+    # (FuncDecNode.shadow_slots) e a variável global não muda.
+    @staticmethod
+    def run(ast):
+        global_scope = Scope()
+        Resolver.declare_names(ast, global_scope)
+        Resolver.resolve(ast, global_scope)
+        return global_scope
+
+    @staticmethod
+    def declare_names(node, scope):
+        # Declarações valem para o escopo inteiro, independente da posição
+        if isinstance(node, VarDecNode):
+            scope.declare(node.name, node.var_type)
+        elif isinstance(node, ForNode):
+            scope.declare(node.var_name, 'INT')
+            Resolver.declare_names(node.block, scope)
+        elif isinstance(node, BlockNode):
+            for statement in node.statements:
+                Resolver.declare_names(statement, scope)
+        elif isinstance(node, IfNode):
+            Resolver.declare_names(node.true_block, scope)
+            if node.false_block:
+                Resolver.declare_names(node.false_block, scope)
+        elif isinstance(node, WhileNode):
+            Resolver.declare_names(node.block, scope)
+        elif isinstance(node, FuncDecNode):
+            # Funções são sempre armazenadas no escopo global
+            scope.at(Resolver.global_depth(scope)).declare(node.func_name, 'FUNCTION')
+
+    @staticmethod
+    def declare_shadows(block, function_scope, global_scope):
+        # (slot local, slot global) dos nomes globais atribuídos na função
+        shadows = []
+        for current in walk(block):
+            if isinstance(current, AssignmentNode):
+                name = current.var_name
+            elif isinstance(current, ReadNode):
+                name = current.name
+            else:
+                continue
+            if name in function_scope.slots or name not in global_scope.slots:
+                continue
+            local_slot = function_scope.declare(name, global_scope.types.get(name))
+            shadows.append((local_slot, global_scope.slots[name]))
+        return shadows
+
+    @staticmethod
+    def global_depth(scope):
+        depth = 0
+        while scope.parent is not None:
+            scope = scope.parent
+            depth += 1
+        return depth
+
+    @staticmethod
+    def resolve(node, scope):
+        if isinstance(node, (NumberNode, StringNode, BoolNode)):
+            pass
+        elif isinstance(node, IdentifierNode):
+            node.depth, node.slot = scope.resolve(node.name)
+        elif isinstance(node, (BinOpNode, RelationalOpNode)):
+            Resolver.resolve(node.left, scope)
+            Resolver.resolve(node.right, scope)
+        elif isinstance(node, UnOpNode):
+            Resolver.resolve(node.node, scope)
+        elif isinstance(node, AssignmentNode):
+            Resolver.resolve(node.expr, scope)
+            node.depth, node.slot = scope.resolve(node.var_name)
+        elif isinstance(node, VarDecNode):
+            if node.expression:
+                Resolver.resolve(node.expression, scope)
+            node.slot = scope.declare(node.name)
+        elif isinstance(node, (PrintNode, ReturnNode)):
+            Resolver.resolve(node.expr, scope)
+        elif isinstance(node, ReadNode):
+            node.depth, node.slot = scope.resolve(node.name)
+            node.var_type = scope.at(node.depth).types.get(node.name)
+        elif isinstance(node, BlockNode):
+            for statement in node.statements:
+                Resolver.resolve(statement, scope)
+        elif isinstance(node, IfNode):
+            Resolver.resolve(node.condition, scope)
+            Resolver.resolve(node.true_block, scope)
+            if node.false_block:
+                Resolver.resolve(node.false_block, scope)
+        elif isinstance(node, WhileNode):
+            node.hoisted_slots = [scope.declare(name) for name in node.hoisted]
+            Resolver.resolve(node.condition, scope)
+            Resolver.resolve(node.block, scope)
+        elif isinstance(node, ForNode):
+            Resolver.resolve(node.start_expr, scope)
+            Resolver.resolve(node.end_expr, scope)
+            if node.step_expr:
+                Resolver.resolve(node.step_expr, scope)
+            node.slot = scope.declare(node.var_name)
+            node.hoisted_slots = [scope.declare(name) for name in node.hoisted]
+            Resolver.resolve(node.block, scope)
+        elif isinstance(node, InvariantNode):
+            Resolver.resolve(node.expr, scope)
+            node.slot = scope.declare(node.name)
+        elif isinstance(node, FuncDecNode):
+            node.depth, node.slot = scope.resolve(node.func_name)
+            global_scope = scope.at(Resolver.global_depth(scope))
+            function_scope = Scope(global_scope)
+            node.param_slots = [function_scope.declare(name, param_type)
+                                for param_type, name in node.params]
+            Resolver.declare_names(node.block, function_scope)
+            node.shadow_slots = Resolver.declare_shadows(node.block, function_scope, global_scope)
+            Resolver.resolve(node.block, function_scope)
+            node.frame_size = function_scope.size
+            node.slot_names = function_scope.names
+        elif isinstance(node, FuncCallNode):
+            node.depth, node.slot = scope.resolve(node.func_name)
+            for arg in node.args:
+                Resolver.resolve(arg, scope)
+        elif isinstance(node, IndexNode):
+            Resolver.resolve(node.index, scope)
+            node.depth, node.slot = scope.resolve(node.name)
+        elif isinstance(node, IndexAssignNode):
+            Resolver.resolve(node.index, scope)
+            Resolver.resolve(node.expr, scope)
+            node.depth, node.slot = scope.resolve(node.name)
+        elif isinstance(node, ArrayOpNode):
+            for arg in node.args:
+                Resolver.resolve(arg, scope)
+        else:
+            raise Exception(f"Nó não suportado pelo resolvedor: {type(node).__name__}")
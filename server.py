@@ -0,0 +1,210 @@
+# server.py
+import argparse
+import io
+import os
+import signal
+import socket
+import sys
+import time
+
+import main
+from batch import ProgramTimeout, on_alarm
+from cache import MemoryCache
+from protocol import DEFAULT_SOCKET, send_message, receive_message
+
+# Conexões aguardando um trabalhador livre
+BACKLOG = 128
+
+class Worker:
+    # Processo filho: aceita conexões no socket herdado do servidor (o
+    # sistema entrega cada conexão a um dos trabalhadores parados em
+    # accept) e atende as requisições de cada conexão até o cliente fechar.
+    # Os módulos do interpretador já foram importados antes do fork e as
+    # ASTs ficam em um cache em memória próprio do trabalhador.
+    def __init__(self, listener, timeout, cache_bytes):
+        self.listener = listener
+        self.timeout = timeout
+        self.cache = MemoryCache(cache_bytes)
+
+    def serve_forever(self):
+        while True:
+            connection, _ = self.listener.accept()
+            with connection:
+                try:
+                    while True:
+                        request = receive_message(connection)
+                        if request is None:
+                            break
+                        send_message(connection, self.execute(request))
+                except Exception:
+                    # Cliente desconectado ou mensagem inválida: só esta conexão acaba
+                    pass
+
+    def execute(self, request):
+        # Como batch.run_program, com a entrada e o código vindos da requisição
+        start = time.perf_counter()
+        path = request.get('caminho')
+        source = request.get('fonte')
+        flags = [str(flag) for flag in request.get('opcoes', [])]
+        timeout = float(request.get('tempo_limite', self.timeout))
+        code = None
+        if source is not None:
+            code = source.encode('utf-8')
+            path = path or '<fonte>'
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        saved = sys.stdin, sys.stdout, sys.stderr
+        sys.stdin, sys.stdout, sys.stderr = io.StringIO(request.get('entrada', '')), stdout, stderr
+        hits = self.cache.hits
+
+        status = 'ok'
+        error = None
+        use_alarm = timeout > 0
+        if use_alarm:
+            signal.signal(signal.SIGALRM, on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            if not path:
+                raise Exception("Requisição sem caminho nem fonte do programa")
+            options = main.parse_args(flags + [path])
+            if options.limpar_cache:
+                raise Exception("--limpar-cache não é aceito pelo servidor")
+            main.run(options, code, self.cache)
+        except SystemExit:
+            # argparse já escreveu o uso no stderr capturado
+            status = 'erro'
+            error = "Opções inválidas"
+        except ProgramTimeout:
+            status = 'tempo'
+            error = f"Tempo limite de {timeout:g}s excedido"
+        except FileNotFoundError:
+            status = 'erro'
+            error = "Arquivo não encontrado"
+        except RecursionError:
+            status = 'erro'
+            error = "Recursão profunda demais"
+        except Exception as e:
+            status = 'erro'
+            error = str(e)
+        finally:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+            sys.stdin, sys.stdout, sys.stderr = saved
+
+        return {
+            'status': status,
+            'erro': error,
+            'saida': stdout.getvalue(),
+            'erros': stderr.getvalue(),
+            'segundos': time.perf_counter() - start,
+            'cache': self.cache.hits > hits,
+            'trabalhador': os.getpid(),
+        }
+
+def on_terminate(signum, frame):
+    raise SystemExit(0)
+
+class Server:
+    # Servidor pré-forked: abre o socket Unix, cria os trabalhadores e só
+    # acompanha os filhos, recriando os que terminarem. SIGTERM ou Ctrl-C
+    # encerram os trabalhadores e removem o socket.
+    def __init__(self, path, workers, timeout, cache_bytes):
+        self.path = path
+        self.workers = workers
+        self.timeout = timeout
+        self.cache_bytes = cache_bytes
+        self.children = set()
+
+    def serve(self):
+        listener = self.listen()
+        signal.signal(signal.SIGTERM, on_terminate)
+        try:
+            for _ in range(self.workers):
+                self.spawn(listener)
+            sys.stderr.write(f"Servidor em {self.path} com {self.workers} trabalhadores\n")
+            while True:
+                pid, _ = os.wait()
+                if pid in self.children:
+                    self.children.discard(pid)
+                    self.spawn(listener)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for pid in self.children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
+            for pid in self.children:
+                try:
+                    os.waitpid(pid, 0)
+                except OSError:
+                    pass
+            listener.close()
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def listen(self):
+        if os.path.exists(self.path):
+            # Socket de um servidor que ainda responde não é removido
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                os.remove(self.path)
+            else:
+                raise Exception(f"Já existe um servidor em {self.path}")
+            finally:
+                probe.close()
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        listener.listen(BACKLOG)
+        return listener
+
+    def spawn(self, listener):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            status = 0
+            try:
+                Worker(listener, self.timeout, self.cache_bytes).serve_forever()
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+        self.children.add(pid)
+
+def parse_args(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog='server.py',
+        usage="python server.py [opções]",
+        description='Mantém trabalhadores prontos para executar programas recebidos por um socket Unix.')
+    arg_parser.add_argument('--socket', default=DEFAULT_SOCKET, metavar='CAMINHO',
+                            help=f"caminho do socket (padrão: {DEFAULT_SOCKET})")
+    arg_parser.add_argument('-j', '--processos', type=int, default=os.cpu_count() or 1, metavar='N',
+                            help='processos trabalhadores (padrão: número de CPUs)')
+    arg_parser.add_argument('--tempo-limite', type=float, default=10.0, metavar='S',
+                            help='segundos por requisição, se ela não indicar outro (0 desliga)')
+    arg_parser.add_argument('--cache-max', type=int, default=64, metavar='MB',
+                            help='tamanho máximo do cache de ASTs de cada trabalhador em MB')
+    return arg_parser.parse_args(argv)
+
+def main_server():
+    options = parse_args(sys.argv[1:])
+    if options.processos < 1:
+        sys.stderr.write("Erro: número de processos deve ser positivo\n")
+        return 1
+    try:
+        Server(options.socket, options.processos, options.tempo_limite, options.cache_max * 1024 * 1024).serve()
+    except Exception as e:
+        sys.stderr.write(f"Erro: {e}\n")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_server())
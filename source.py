@@ -0,0 +1,25 @@
+# source.py
+import mmap
+
+class SourceFile:
+    # Abre o programa mapeado em memória: o Tokenizer lê direto das páginas
+    # do arquivo, sem copiar o conteúdo para uma string.
+    # Arquivos que não podem ser mapeados (vazios, pipes) são lidos como bytes.
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.mapping = None
+
+    def __enter__(self):
+        self.file = open(self.path, 'rb')
+        try:
+            self.mapping = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self.mapping
+        except (ValueError, OSError):
+            return self.file.read()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.mapping is not None:
+            self.mapping.close()
+        self.file.close()
+        return False
@@ -1,16 +1,43 @@
 # symboltable.py
-class SymbolTable:
-    def __init__(self, parent=None):
-        self.table = {}
+
+# Marca de slot ainda não atribuído (variável declarada no escopo, mas sem valor)
+class Undefined:
+    def __repr__(self):
+        return 'UNDEFINED'
+
+    def __reduce__(self):
+        # Continua sendo o mesmo objeto depois de passar por pickle (frames
+        # enviados a outros processos): os testes usam 'is UNDEFINED'
+        return 'UNDEFINED'
+
+UNDEFINED = Undefined()
+
+class Frame:
+    # Registro de ativação: os nomes já foram resolvidos para índices
+    # (profundidade, slot) pelo Resolver, então o acesso é direto na lista
+    def __init__(self, size, parent=None, values=None):
+        self.values = [UNDEFINED] * size if values is None else values
         self.parent = parent
+        self.return_value = None
+
+    def at(self, depth):
+        frame = self
+        while depth:
+            frame = frame.parent
+            depth -= 1
+        return frame
 
-    def set(self, name, value, var_type=None):
-        self.table[name] = {'value': value, 'type': var_type}
+    def root(self):
+        frame = self
+        while frame.parent is not None:
+            frame = frame.parent
+        return frame
 
-    def get(self, name):
-        if name in self.table:
-            return self.table[name]
-        elif self.parent is not None:
-            return self.parent.get(name)
-        else:
-            return None
+def binding_plan(param_slots, frame_size):
+    # Como os argumentos entram no frame de uma chamada. Quando os parâmetros
+    # ocupam os primeiros slots, em ordem (o caso do Resolver), o frame é a
+    # própria lista de argumentos seguida deste complemento; None quando é
+    # preciso copiar parâmetro a parâmetro.
+    if list(param_slots) != list(range(len(param_slots))):
+        return None
+    return [UNDEFINED] * (frame_size - len(param_slots))
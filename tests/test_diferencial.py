@@ -0,0 +1,44 @@
+# test_diferencial.py
+# Executa cada programa em todos os modos de execução e compara a saída
+# com a do interpretador de árvore, que serve de referência (inclusive
+# mensagens de erro, como a divisão por zero de divisao.txt).
+
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PROGRAMAS = [ROOT / 'programa.txt'] + sorted((ROOT / 'tests' / 'programas').glob('*.txt'))
+
+MODOS = [
+    ['--vm'],
+    ['-O'],
+    ['--jit', '--jit-limite', '1'],
+    ['--paralelo', '2', '--paralelo-minimo', '1'],
+    ['--sem-tipos'],
+]
+
+
+def executar(programa, modo):
+    # Programas que usam LEIA recebem a entrada do arquivo .in de mesmo nome
+    entrada = programa.with_suffix('.in')
+    texto = entrada.read_text() if entrada.exists() else ''
+    resultado = subprocess.run(
+        [sys.executable, 'main.py', '--sem-cache', *modo, str(programa)],
+        cwd=ROOT, input=texto, capture_output=True, text=True, timeout=120,
+    )
+    return resultado.stdout + resultado.stderr
+
+
+class TestDiferencial(unittest.TestCase):
+    def test_modos_iguais_ao_interpretador(self):
+        for programa in PROGRAMAS:
+            referencia = executar(programa, [])
+            for modo in MODOS:
+                with self.subTest(programa=programa.name, modo=' '.join(modo)):
+                    self.assertEqual(executar(programa, modo), referencia)
+
+
+if __name__ == '__main__':
+    unittest.main()
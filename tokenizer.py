@@ -1,89 +1,128 @@
 # tokenizer.py
-from token import Token
+import bisect
+import re
+from array import array
+from itertools import compress
+from tokens import Token
 
-RESERVED_WORDS = [
-    'IMPRIME', 'LEIA', 'SE', 'SENÃO', 'ENTAO', 'ENQUANTO', 'PARA', 'DE', 'ATÉ', 'FAÇA',
+RESERVED_WORDS = frozenset([
+    'IMPRIME', 'LEIA', 'SE', 'ENTAO', 'ENQUANTO', 'PARA', 'DE',
     'FIMSE', 'FIMENQUANTO', 'FIMPARA', 'RECEBE', 'PASSO', 'RETORNA', 'INT', 'STR', 'BOOL', 'IGUAL', 'DIFERENTE',
-    'MAIOR', 'MENOR', 'MAIORIGUAL', 'MENORIGUAL', 'FUNCAO'
-    # Removemos 'SOMA', 'SUBTRAI', 'MULTIPLICA', 'DIVIDE' daqui
-]
+    'MAIOR', 'MENOR', 'MAIORIGUAL', 'MENORIGUAL', 'FUNCAO', 'VETOR'
+])
 
-class Tokenizer:
-    def __init__(self, source):
-        self.source = source.strip()
-        self.position = 0
-        self.next = None
-        self.select_next()
+# Operadores escritos por extenso, mapeados para os símbolos equivalentes
+WORD_OPERATORS = {'SOMA': '+', 'SUBTRAI': '-', 'MULTIPLICA': '*', 'DIVIDE': '/'}
 
-    def select_next(self):
-        while self.position < len(self.source) and self.source[self.position].isspace():
-            self.position += 1
+SYMBOLS = frozenset('+-*/(),;<>!{}[]')
 
-        if self.position >= len(self.source):
-            self.next = Token('EOF', None)
-            return
+# Um lexema por casamento; espaços ficam de fora e comentários são descartados depois
+LEXEME_PATTERN = re.compile(r'\d+|[^\W\d]\w*|"[^"]*"?|#[^\n]*|\S')
 
-        current_char = self.source[self.position]
+# Versão para bytes (arquivo mapeado em memória, UTF-8): bytes não ASCII entram
+# nos identificadores e o lexema decodificado é validado em classify
+BYTES_LEXEME_PATTERN = re.compile(rb'[0-9]+|[A-Za-z_\x80-\xff][0-9A-Za-z_\x80-\xff]*|"[^"]*"?|#[^\n]*|\S')
 
-        # Comentários
-        if current_char == '#':
-            while self.position < len(self.source) and self.source[self.position] != '\n':
-                self.position += 1
-            self.select_next()
-            return
+IDENTIFIER_PATTERN = re.compile(r'[^\W\d]\w*')
 
-        # Números
-        elif current_char.isdigit():
-            num = ''
-            while self.position < len(self.source) and self.source[self.position].isdigit():
-                num += self.source[self.position]
-                self.position += 1
-            self.next = Token('NUMBER', int(num))
-            return
+# Tamanho aproximado de cada bloco varrido por vez (sempre termina em fim de linha)
+CHUNK_SIZE = 1 << 16
 
-        # Strings
-        elif current_char == '"':
-            self.position += 1  # Consumir a aspa inicial
-            string_value = ''
-            while self.position < len(self.source) and self.source[self.position] != '"':
-                string_value += self.source[self.position]
-                self.position += 1
-            if self.position >= len(self.source):
-                raise Exception("String não terminada")
-            self.position += 1  # Consumir a aspa final
-            self.next = Token('STRING', string_value)
-            return
+EOF_TOKEN = Token('EOF', None)
 
-        # Identificadores e palavras reservadas
-        elif current_char.isalpha() or current_char == '_':
-            ident = ''
-            while (self.position < len(self.source) and
-                   (self.source[self.position].isalnum() or self.source[self.position] == '_')):
-                ident += self.source[self.position]
-                self.position += 1
-            ident_upper = ident.upper()
-            if ident_upper in ['SOMA', 'SUBTRAI', 'MULTIPLICA', 'DIVIDE']:
-                # Mapear operadores de palavra para símbolos
-                if ident_upper == 'SOMA':
-                    self.next = Token('SYMBOL', '+')
-                elif ident_upper == 'SUBTRAI':
-                    self.next = Token('SYMBOL', '-')
-                elif ident_upper == 'MULTIPLICA':
-                    self.next = Token('SYMBOL', '*')
-                elif ident_upper == 'DIVIDE':
-                    self.next = Token('SYMBOL', '/')
-                return
-            elif ident_upper in RESERVED_WORDS:
-                self.next = Token('RESERVED', ident_upper)
-            else:
-                self.next = Token('IDENTIFIER', ident)
-            return
+def classify(lexeme):
+    # Retorna o Token de um lexema (None para comentários)
+    if isinstance(lexeme, bytes):
+        try:
+            lexeme = lexeme.decode('utf-8')
+        except UnicodeDecodeError:
+            raise Exception("Arquivo não está em UTF-8")
+    first = lexeme[0]
+    if first == '#':
+        return None
+    if first == '"':
+        if len(lexeme) == 1 or lexeme[-1] != '"':
+            raise Exception("String não terminada")
+        return Token('STRING', lexeme[1:-1])
+    if first.isdigit():
+        return Token('NUMBER', int(lexeme))
+    if first.isalpha() or first == '_':
+        if not IDENTIFIER_PATTERN.fullmatch(lexeme):
+            bad = lexeme[IDENTIFIER_PATTERN.match(lexeme).end()]
+            raise Exception(f"Caractere inesperado: {bad}")
+        upper = lexeme.upper()
+        if upper in WORD_OPERATORS:
+            return Token('SYMBOL', WORD_OPERATORS[upper])
+        if upper in RESERVED_WORDS:
+            return Token('RESERVED', upper)
+        return Token('IDENTIFIER', lexeme)
+    if lexeme in SYMBOLS:
+        return Token('SYMBOL', lexeme)
+    raise Exception(f"Caractere inesperado: {first}")
 
-        # Operadores e símbolos especiais
-        elif current_char in '+-*/(),;<>!{}':
-            self.next = Token('SYMBOL', current_char)
-            self.position += 1
-            return
+class Tokenizer:
+    # Varre o código uma única vez e produz o vetor de tokens inteiro.
+    # Cada lexema distinto é classificado uma só vez; os tokens repetidos
+    # compartilham o mesmo objeto Token. Espaços e comentários são pulados
+    # aqui mesmo, sem pré-processamento. Aceita str ou bytes/mmap (UTF-8).
+    # O início de cada token no código é guardado em offsets, na mesma varredura.
+    def __init__(self, source):
+        self.source = source
+        self.tokens, self.offsets = Tokenizer.tokenize(source)
+        self.index = 0
+        self.next = self.tokens[0]
+        self.line_starts = None
+
+    @staticmethod
+    def tokenize(source):
+        # A varredura é feita em blocos terminados em '\n' para que só os
+        # lexemas de um bloco existam ao mesmo tempo; apenas strings podem
+        # atravessar linhas, e nesse caso o bloco é estendido.
+        pattern = Tokenizer.pattern(source)
+        newline, quote = ('\n', '"') if isinstance(source, str) else (b'\n', b'"')
+        length = len(source)
+        table = {}
+        tokens = []
+        offsets = array('l')
+        position = 0
+        end = 0
+        while position < length:
+            end = source.find(newline, max(end, position + CHUNK_SIZE))
+            end = length if end < 0 else end + 1
+            matches = list(pattern.finditer(source, position, end))
+            lexemes = list(map(re.Match.group, matches))
+            last = lexemes[-1] if lexemes else ''
+            if end < length and last[:1] == quote and (len(last) == 1 or last[-1:] != quote):
+                # String cortada no fim do bloco: estende até depois da aspa final
+                closing = source.find(quote, end)
+                end = length if closing < 0 else closing
+                continue
+            for lexeme in lexemes:
+                if lexeme not in table:
+                    table[lexeme] = classify(lexeme)
+            classified = list(map(table.__getitem__, lexemes))
+            tokens.extend(filter(None, classified))
+            offsets.extend(compress(map(re.Match.start, matches), classified))
+            position = end
+        tokens.append(EOF_TOKEN)
+        offsets.append(length)
+        return tokens, offsets
+
+    @staticmethod
+    def pattern(source):
+        return LEXEME_PATTERN if isinstance(source, str) else BYTES_LEXEME_PATTERN
+
+    def select_next(self):
+        if self.index < len(self.tokens) - 1:
+            self.index += 1
+        self.next = self.tokens[self.index]
 
-        else:
-            raise Exception(f"Caractere inesperado: {current_char}")
+    def location(self, index):
+        # (linha, coluna) do token, ambas a partir de 1. Os inícios de linha
+        # só são calculados na primeira consulta (mensagens de erro, perfil).
+        if self.line_starts is None:
+            newline = '\n' if isinstance(self.source, str) else b'\n'
+            self.line_starts = [0] + [match.end() for match in re.finditer(newline, self.source)]
+        offset = self.offsets[index]
+        line = bisect.bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
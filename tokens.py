@@ -1,5 +1,7 @@
-# token.py
+# tokens.py
 class Token:
+    __slots__ = ('type', 'value')
+
     def __init__(self, type_, value):
         self.type = type_
         self.value = value
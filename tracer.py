@@ -0,0 +1,184 @@
+# tracer.py
+import collections
+import sys
+from node import Node, RETURN_SIGNAL
+
+# Níveis de rastreamento: cada nível inclui os anteriores
+OFF = 0
+FUNCTIONS = 1
+STATEMENTS = 2
+EXPRESSIONS = 3
+
+LEVEL_NAMES = {
+    'desligado': OFF,
+    'funcoes': FUNCTIONS,
+    'comandos': STATEMENTS,
+    'expressoes': EXPRESSIONS,
+}
+
+# Nível mínimo em que cada tipo de nó é rastreado (os demais são expressões).
+# As versões especializadas (IntAddNode, StrAppendNode, ReductionForNode,
+# HotWhileNode, ParallelForNode...) herdam o nível da classe base.
+NODE_LEVELS = {
+    'FuncCallNode': FUNCTIONS,
+    'ReturnNode': FUNCTIONS,
+    'FuncDecNode': STATEMENTS,
+    'VarDecNode': STATEMENTS,
+    'IndexAssignNode': STATEMENTS,
+    'AssignmentNode': STATEMENTS,
+    'PrintNode': STATEMENTS,
+    'ReadNode': STATEMENTS,
+    'IfNode': STATEMENTS,
+    'WhileNode': STATEMENTS,
+    'ForNode': STATEMENTS,
+}
+
+# Atributos usados para descrever um nó, em ordem de preferência
+DESCRIBE_ATTRIBUTES = ('func_name', 'var_name', 'name', 'op', 'value')
+
+class StderrSink:
+    def write(self, line):
+        sys.stderr.write(line + '\n')
+
+    def close(self):
+        pass
+
+class FileSink:
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, line):
+        self.file.write(line + '\n')
+
+    def close(self):
+        self.file.close()
+
+class RingBufferSink:
+    # Guarda só os últimos eventos; despeja no stderr ao fechar
+    def __init__(self, capacity, output=None):
+        self.events = collections.deque(maxlen=capacity)
+        self.output = output
+
+    def write(self, line):
+        self.events.append(line)
+
+    def close(self):
+        output = self.output if self.output is not None else sys.stderr
+        for line in self.events:
+            output.write(line + '\n')
+
+def parse_level(text):
+    if text.isdigit():
+        level = int(text)
+        if OFF <= level <= EXPRESSIONS:
+            return level
+    elif text in LEVEL_NAMES:
+        return LEVEL_NAMES[text]
+    raise Exception(f"Nível de rastreamento inválido: {text}")
+
+def parse_sink(text):
+    # Destinos: 'stderr', 'arquivo:<caminho>' ou 'memoria:<capacidade>'
+    if text == 'stderr':
+        return StderrSink()
+    kind, _, argument = text.partition(':')
+    if kind == 'arquivo' and argument:
+        return FileSink(argument)
+    if kind == 'memoria' and argument.isdigit():
+        return RingBufferSink(int(argument))
+    raise Exception(f"Destino de rastreamento inválido: {text}")
+
+def describe(node):
+    for attribute in DESCRIBE_ATTRIBUTES:
+        if hasattr(node, attribute):
+            return f"{type(node).__name__} {getattr(node, attribute)!r}"
+    return type(node).__name__
+
+class Tracer:
+    # Com o rastreamento desligado nada é instalado: os métodos evaluate
+    # originais de node.py rodam sem nenhuma verificação extra.
+    # Ao instalar, os evaluate dos tipos de nó do nível escolhido são
+    # trocados por versões que emitem eventos de entrada e saída.
+    def __init__(self, level, sink, sample=1):
+        self.level = level
+        self.sink = sink
+        self.sample = sample
+        self.counter = 0
+        self.depth = 0
+        # Número de cada entrada ainda aberta (None se não foi amostrada),
+        # para que a saída de um nó seja emitida junto com a sua entrada
+        self.open = []
+        self.originals = {}
+
+    def emit(self, marker, node, result=None):
+        # A amostragem é por nó: decide-se na entrada e a saída correspondente
+        # segue a mesma decisão, mantendo '>' e '<' sempre pareados
+        if marker == '>':
+            self.counter += 1
+            number = self.counter if self.counter % self.sample == 0 else None
+            self.open.append(number)
+        else:
+            number = self.open.pop()
+        if number is None:
+            return
+        line = f"TRACE {number:>8} {'  ' * self.depth}{marker} {describe(node)}"
+        if marker == '<':
+            line += ' RETORNA' if result is RETURN_SIGNAL else f" = {result!r}"
+        self.sink.write(line)
+
+    def wrap(self, original):
+        tracer = self
+
+        def evaluate(node, symbol_table):
+            tracer.emit('>', node)
+            tracer.depth += 1
+            try:
+                result = original(node, symbol_table)
+            finally:
+                tracer.depth -= 1
+            tracer.emit('<', node, result)
+            return result
+
+        return evaluate
+
+    # Chamados pela VM a cada chamada e retorno de função
+    def enter(self, function):
+        self.emit('>', function)
+        self.depth += 1
+
+    def leave(self, function, result):
+        self.depth -= 1
+        self.emit('<', function, result)
+
+    @staticmethod
+    def level_for_class(cls):
+        for base in cls.__mro__:
+            if base.__name__ in NODE_LEVELS:
+                return NODE_LEVELS[base.__name__]
+        return EXPRESSIONS
+
+    def node_classes(self):
+        pending = [Node]
+        while pending:
+            cls = pending.pop()
+            pending.extend(cls.__subclasses__())
+            if 'evaluate' in cls.__dict__ and cls is not Node:
+                yield cls
+
+    def install(self):
+        if self.level == OFF:
+            return
+        for cls in self.node_classes():
+            if self.level_for_class(cls) <= self.level:
+                self.originals[cls] = cls.__dict__['evaluate']
+                cls.evaluate = self.wrap(cls.evaluate)
+        # Na VM só as chamadas de função são rastreadas
+        from vm import VM
+        VM.tracer = self
+
+    def uninstall(self):
+        for cls, original in self.originals.items():
+            cls.evaluate = original
+        self.originals = {}
+        from vm import VM
+        VM.tracer = None
+        self.sink.close()
@@ -0,0 +1,385 @@
+# typechecker.py
+from node import *
+
+NUMERIC = ('INT', 'BOOL')
+
+ORDERING_OPS = ('MAIOR', 'MENOR', 'MAIORIGUAL', 'MENORIGUAL')
+
+def base(value_type):
+    # 'STR?' é o tipo de uma chamada que pode terminar sem RETORNA (valor None)
+    return value_type.rstrip('?') if value_type else None
+
+def is_numeric(value_type):
+    return base(value_type) in NUMERIC
+
+def always_returns(node):
+    # Todos os caminhos do bloco terminam em RETORNA?
+    if isinstance(node, ReturnNode):
+        return True
+    if isinstance(node, BlockNode):
+        return any(always_returns(statement) for statement in node.statements)
+    if isinstance(node, IfNode):
+        return node.false_block is not None and always_returns(node.true_block) \
+            and always_returns(node.false_block)
+    return False
+
+def function_declarations(ast):
+    found = []
+    pending = [ast]
+    while pending:
+        for current in walk(pending.pop()):
+            if isinstance(current, FuncDecNode):
+                found.append(current)
+                pending.append(current.block)
+    return found
+
+def is_append_candidate(node):
+    # 'x RECEBE x + ...' com partes sem chamadas (que poderiam mudar x no meio);
+    # vira StrAppendNode se x for STR
+    parts = appended_parts(node)
+    return parts is not None and \
+        not any(isinstance(current, FuncCallNode) for part in parts for current in walk(part))
+
+# O que scan_scope guarda de cada classe de nó (ver class_entry)
+SCANNED = {VarDecNode: 'variavel', ForNode: 'laco', FuncDecNode: 'funcao', AssignmentNode: 'atribuicao'}
+scanned_by_class = {}
+
+def scan_scope(root):
+    # Uma única passada pelo escopo: variáveis declaradas (slot, nome, tipo),
+    # funções declaradas nele e atribuições candidatas a StrAppendNode
+    variables, functions, appends = [], [], []
+    for current in walk(root):
+        cls = type(current)
+        kind = scanned_by_class.get(cls)
+        if kind is None:
+            kind = scanned_by_class[cls] = class_entry(SCANNED, cls, '')
+        if kind == 'variavel':
+            variables.append((current.slot, current.name, current.var_type))
+        elif kind == 'laco':
+            variables.append((current.slot, current.var_name, 'INT'))
+        elif kind == 'funcao':
+            functions.append(current)
+        elif kind == 'atribuicao' and is_append_candidate(current):
+            appends.append(current)
+    return variables, functions, appends
+
+class TypeChecker:
+    # Verificação estática de tipos a partir das declarações (INT, STR, BOOL).
+    # Roda depois do Resolver: as variáveis são identificadas pelo slot.
+    # Erros de tipo são reportados antes da execução; erros que dependem de
+    # valores (variável não definida, aridade, divisão por zero) continuam
+    # na execução. Quando os tipos dos operandos são conhecidos, o nó é
+    # trocado por uma variante especializada que não testa tipos.
+    # Tipos: 'INT', 'STR', 'BOOL'; com '?' quando o valor pode ser None
+    # (função sem RETORNA em todos os caminhos); None quando desconhecido
+    # (nome não declarado, que falha na execução antes de produzir valor).
+    def __init__(self):
+        self.global_types = {}
+        self.functions = {}
+        self.local_types = None
+        self.function = None
+        self.appended = set()  # variáveis (função ou None, slot) com StrAppendNode
+        self.append_nodes = set()  # atribuições que viram StrAppendNode
+
+    @staticmethod
+    def run(ast):
+        checker = TypeChecker()
+        # Cada escopo (o programa e o corpo de cada função) é percorrido uma vez
+        global_scan = scan_scope(ast)
+        scans = {}
+        declarations = []
+        pending = [global_scan[1]]
+        while pending:
+            for declaration in pending.pop():
+                declarations.append(declaration)
+                scans[declaration] = scan_scope(declaration.block)
+                pending.append(scans[declaration][1])
+        checker.global_types = checker.declared_types(global_scan[0], {})
+        for declaration in declarations:
+            checker.declare_function(declaration)
+        local_types = {}
+        for declaration in declarations:
+            types = {slot: param_type for slot, (param_type, _) in zip(declaration.param_slots, declaration.params)}
+            # A cópia local de uma global (ver Resolver) tem o tipo da global
+            for local_slot, global_slot in declaration.shadow_slots:
+                if global_slot in checker.global_types:
+                    types[local_slot] = checker.global_types[global_slot]
+            local_types[declaration] = checker.declared_types(scans[declaration][0], types)
+        # As variáveis acrescidas por StrAppendNode precisam ser conhecidas
+        # antes de especializar qualquer leitura
+        checker.mark_appends(global_scan[2])
+        for declaration in declarations:
+            checker.local_types = local_types[declaration]
+            checker.function = declaration
+            checker.mark_appends(scans[declaration][2])
+        checker.local_types = None
+        checker.function = None
+        checker.check_block(ast)
+        for declaration in declarations:
+            checker.local_types = local_types[declaration]
+            checker.function = declaration
+            checker.check_block(declaration.block)
+        return ast
+
+    def storage(self, depth, slot):
+        # Identifica a variável independente de onde é acessada
+        if self.local_types is not None and depth == 0:
+            return self.function, slot
+        return None, slot
+
+    def mark_appends(self, candidates):
+        for node in candidates:
+            if self.variable_type(node.depth, node.slot) == 'STR':
+                self.appended.add(self.storage(node.depth, node.slot))
+                self.append_nodes.add(node)
+
+    def declared_types(self, variables, types):
+        for slot, name, var_type in variables:
+            self.declare(types, slot, name, var_type)
+        return types
+
+    @staticmethod
+    def declare(types, slot, name, var_type):
+        previous = types.get(slot)
+        if previous is not None and previous != var_type:
+            raise Exception(f"Variável '{name}' declarada como {previous} e como {var_type}")
+        types[slot] = var_type
+
+    def declare_function(self, declaration):
+        signature = (declaration.func_type, [param_type for param_type, _ in declaration.params])
+        previous = self.functions.get(declaration.slot)
+        if previous is not None and (previous.func_type, [t for t, _ in previous.params]) != signature:
+            raise Exception(f"Função '{declaration.func_name}' redeclarada com outra assinatura")
+        # Entre declarações iguais, prevalece uma que pode terminar sem RETORNA
+        if previous is None or not always_returns(declaration.block):
+            self.functions[declaration.slot] = declaration
+        if declaration.slot in self.global_types:
+            raise Exception(f"'{declaration.func_name}' declarada como variável e como função")
+
+    def variable_type(self, depth, slot):
+        if self.local_types is not None and depth == 0:
+            return self.local_types.get(slot)
+        return self.global_types.get(slot)
+
+    def check_target(self, expected, actual, description):
+        # Valor de tipo actual pode ser guardado onde se espera expected?
+        if expected is None or actual is None:
+            return
+        if element_type(expected) or element_type(actual):
+            # Vetores só vão para variáveis (e parâmetros) do mesmo tipo
+            if expected != actual:
+                raise Exception(f"{description}: esperado {expected}, encontrado {base(actual)}")
+        elif expected == 'STR':
+            if actual == 'STR?':
+                raise Exception(f"{description}: a função pode terminar sem RETORNA")
+            if actual != 'STR':
+                raise Exception(f"{description}: esperado STR, encontrado {base(actual)}")
+        elif not is_numeric(actual):
+            raise Exception(f"{description}: esperado {expected}, encontrado {base(actual)}")
+
+    def check_block(self, node):
+        if isinstance(node, BlockNode):
+            node.statements = [self.statement(statement) for statement in node.statements]
+            return node
+        return self.statement(node)
+
+    def statement(self, node):
+        # Retorna o comando (possivelmente especializado)
+        if isinstance(node, ArrayDecNode):
+            node.expression, value_type = self.expression(node.expression)
+            if value_type is not None and not is_numeric(value_type):
+                raise Exception(f"Tamanho do vetor '{node.name}' deve ser INT, encontrado {base(value_type)}")
+        elif isinstance(node, IndexAssignNode):
+            element = self.array_element(node)
+            node.expr, value_type = self.expression(node.expr)
+            self.check_target(element, value_type, f"Tipo incompatível na atribuição a '{node.name}[]'")
+        elif isinstance(node, ArrayOpNode):
+            node, _ = self.expression(node)
+        elif isinstance(node, VarDecNode):
+            if node.expression:
+                node.expression, value_type = self.expression(node.expression)
+                if node.argument is not None:
+                    description = "Argumento '{}' de '{}'".format(*node.argument)
+                else:
+                    description = f"Tipo incompatível na declaração de '{node.name}'"
+                self.check_target(node.var_type, value_type, description)
+        elif isinstance(node, AssignmentNode):
+            append = node in self.append_nodes
+            node.expr, value_type = self.expression(node.expr)
+            self.check_target(self.variable_type(node.depth, node.slot), value_type,
+                              f"Tipo incompatível na atribuição a '{node.var_name}'")
+            if append:
+                return StrAppendNode(node)
+        elif isinstance(node, PrintNode):
+            node.expr, value_type = self.expression(node.expr)
+            if element_type(value_type):
+                raise Exception(f"IMPRIME não aceita {value_type}")
+        elif isinstance(node, ReadNode):
+            return self.specialize_read(node)
+        elif isinstance(node, ReturnNode):
+            node.expr, value_type = self.expression(node.expr)
+            if self.function is not None:
+                self.check_target(self.function.func_type, value_type,
+                                  f"Tipo incompatível no RETORNA de '{self.function.func_name}'")
+        elif isinstance(node, BlockNode):
+            return self.check_block(node)
+        elif isinstance(node, IfNode):
+            node.condition, _ = self.expression(node.condition)
+            node.true_block = self.check_block(node.true_block)
+            if node.false_block:
+                node.false_block = self.check_block(node.false_block)
+        elif isinstance(node, WhileNode):
+            node.condition, _ = self.expression(node.condition)
+            node.block = self.check_block(node.block)
+        elif isinstance(node, ForNode):
+            for attribute in ('start_expr', 'end_expr', 'step_expr'):
+                expr = getattr(node, attribute)
+                if expr is None:
+                    continue
+                expr, value_type = self.expression(expr)
+                if value_type is not None and not is_numeric(value_type):
+                    raise Exception(f"Limites do PARA '{node.var_name}' devem ser INT, encontrado {base(value_type)}")
+                setattr(node, attribute, expr)
+            node.block = self.check_block(node.block)
+        elif isinstance(node, FuncCallNode):
+            node, _ = self.expression(node)
+        # FuncDecNode: o corpo é verificado separadamente em run
+        return node
+
+    def specialize_read(self, node):
+        var_type = self.variable_type(node.depth, node.slot)
+        if element_type(var_type):
+            raise Exception(f"LEIA não aceita {var_type}")
+        if var_type in NUMERIC:
+            specialized = ReadIntNode(node.name)
+        elif var_type == 'STR':
+            specialized = ReadStrNode(node.name)
+        else:
+            return node
+        specialized.depth, specialized.slot, specialized.var_type = node.depth, node.slot, var_type
+        specialized.position, specialized.line = node.position, node.line
+        return specialized
+
+    def expression(self, node):
+        # Retorna (nó possivelmente especializado, tipo)
+        if isinstance(node, NumberNode):
+            return node, 'INT'
+        if isinstance(node, StringNode):
+            return node, 'STR'
+        if isinstance(node, BoolNode):
+            return node, 'BOOL'
+        if isinstance(node, IdentifierNode):
+            value_type = self.variable_type(node.depth, node.slot)
+            if self.storage(node.depth, node.slot) in self.appended:
+                specialized = StrBuilderReadNode(node.name)
+                specialized.depth, specialized.slot = node.depth, node.slot
+                return specialized, value_type
+            return node, value_type
+        if isinstance(node, InvariantNode):
+            node.expr, value_type = self.expression(node.expr)
+            return node, value_type
+        if isinstance(node, BinOpNode):
+            return self.binary(node)
+        if isinstance(node, UnOpNode):
+            node.node, value_type = self.expression(node.node)
+            if element_type(value_type):
+                raise Exception(f"Operação inválida: {node.op}{value_type}")
+            if node.op == '!':
+                return node, 'BOOL'
+            if value_type is not None and not is_numeric(value_type):
+                raise Exception(f"Operação inválida: {node.op}{base(value_type)}")
+            return node, 'INT' if value_type is not None else None
+        if isinstance(node, RelationalOpNode):
+            return self.relational(node)
+        if isinstance(node, FuncCallNode):
+            return self.call(node)
+        if isinstance(node, IndexNode):
+            return node, self.array_element(node)
+        if isinstance(node, ArrayOpNode):
+            return self.array_operation(node)
+        raise Exception(f"Nó não suportado pelo verificador de tipos: {type(node).__name__}")
+
+    def binary(self, node):
+        node.left, left = self.expression(node.left)
+        node.right, right = self.expression(node.right)
+        if left is None or right is None:
+            return node, None
+        if element_type(left) or element_type(right):
+            raise Exception(f"Operação inválida: {base(left)} {node.op} {base(right)}")
+        op = node.op
+        if op == '+':
+            if left == 'STR' or right == 'STR':
+                return StrConcatNode(node.left, node.right), 'STR'
+            if is_numeric(left) and is_numeric(right):
+                return IntAddNode(node.left, node.right), 'INT'
+            # Um dos lados é 'STR?': se não falhar, o resultado é texto
+            return node, 'STR'
+        if op == '*' and (base(left) == 'STR') != (base(right) == 'STR'):
+            return node, 'STR'  # repetição de texto
+        if not (is_numeric(left) and is_numeric(right)):
+            raise Exception(f"Operação inválida: {base(left)} {op} {base(right)}")
+        if op == '-':
+            return IntSubNode(node.left, node.right), 'INT'
+        if op == '*':
+            return IntMulNode(node.left, node.right), 'INT'
+        return node, 'INT'
+
+    def relational(self, node):
+        node.left, left = self.expression(node.left)
+        node.right, right = self.expression(node.right)
+        if left is None or right is None:
+            return node, 'BOOL'
+        if element_type(left) or element_type(right):
+            raise Exception(f"Comparação inválida: {base(left)} {node.op} {base(right)}")
+        if node.op in ORDERING_OPS and is_numeric(left) != is_numeric(right):
+            raise Exception(f"Comparação inválida: {base(left)} {node.op} {base(right)}")
+        if is_numeric(left) and is_numeric(right) and node.op in INT_COMPARISONS:
+            return IntCompareNode(node.left, node.op, node.right), 'BOOL'
+        return node, 'BOOL'
+
+    def array_element(self, node):
+        # Tipo dos elementos do vetor indexado por node (IndexNode ou IndexAssignNode)
+        node.index, index_type = self.expression(node.index)
+        if index_type is not None and not is_numeric(index_type):
+            raise Exception(f"Índice do vetor '{node.name}' deve ser INT, encontrado {base(index_type)}")
+        var_type = self.variable_type(node.depth, node.slot)
+        if var_type is not None and not element_type(var_type):
+            raise Exception(f"'{node.name}' não é um vetor")
+        return element_type(var_type)
+
+    def array_operation(self, node):
+        checked = [self.expression(arg) for arg in node.args]
+        node.args = [arg for arg, _ in checked]
+        arg_types = [value_type for _, value_type in checked]
+        arrays = [0, 2] if node.op == 'COPIA' else [0]
+        for index in arrays:
+            if arg_types[index] is not None and not element_type(arg_types[index]):
+                raise Exception(f"{node.op} espera um vetor, encontrado {base(arg_types[index])}")
+        first = arg_types[0]
+        if node.op == 'TOTAL' and first is not None and element_type(first) not in NUMERIC:
+            raise Exception(f"TOTAL espera um vetor INT, encontrado {first}")
+        if node.op == 'PREENCHE':
+            self.check_target(element_type(first), arg_types[1], "Valor de PREENCHE")
+        if node.op == 'COPIA':
+            if first is not None and arg_types[2] is not None and first != arg_types[2]:
+                raise Exception(f"COPIA entre vetores de tipos diferentes: {first} e {arg_types[2]}")
+            for index in (1, 3, 4):
+                if arg_types[index] is not None and not is_numeric(arg_types[index]):
+                    raise Exception(f"Posições de COPIA devem ser INT, encontrado {base(arg_types[index])}")
+        return node, ('INT' if node.op in ('TAMANHO', 'TOTAL') else None)
+
+    def call(self, node):
+        declaration = self.functions.get(node.slot)
+        checked = [self.expression(arg) for arg in node.args]
+        node.args = [arg for arg, _ in checked]
+        arg_types = [value_type for _, value_type in checked]
+        if declaration is None:
+            return node, None
+        # Aridade errada continua sendo erro de execução
+        if len(arg_types) == len(declaration.params):
+            for (param_type, param_name), arg_type in zip(declaration.params, arg_types):
+                self.check_target(param_type, arg_type,
+                                  f"Argumento '{param_name}' de '{node.func_name}'")
+        if always_returns(declaration.block):
+            return node, declaration.func_type
+        return node, declaration.func_type + '?'
@@ -0,0 +1,519 @@
+# vm.py
+import asyncio
+from compiler import *
+from symboltable import UNDEFINED, Frame, binding_plan
+from console import Console
+
+class Function:
+    def __init__(self, name, func_type, param_slots, frame_size, code, memo=None, shadows=()):
+        self.name = name
+        self.func_type = func_type
+        self.param_slots = param_slots
+        self.frame_size = frame_size
+        self.code = code
+        self.memo = memo
+        self.shadows = shadows
+        self.padding = binding_plan(param_slots, frame_size)
+
+# Pedidos que execute() entrega a quem conduz a execução
+WRITE_REQUEST = 'escreve'  # IMPRIME: o valor vai para a saída
+READ_REQUEST = 'le'        # LEIA: a linha lida volta por send()
+PAUSE_REQUEST = 'pausa'    # fatia de passos esgotada: outras tarefas podem rodar
+
+# Passos (voltas de laço e chamadas) entre pausas no modo assíncrono
+DEFAULT_SLICE_STEPS = 1000
+
+# Chamadas aninhadas antes de "Recursão profunda demais": o bastante para
+# recursões legítimas muito fundas, mas uma recursão sem fim para antes de
+# esgotar a memória
+DEFAULT_MAX_DEPTH = 200000
+
+class VM:
+    # Frames da VM são listas simples indexadas pelos slots do Resolver.
+    # Chamadas de função não usam a pilha do Python: o estado do chamador
+    # vai para uma pilha de chamadas explícita, então a profundidade de
+    # recursão dos programas não depende da pilha do Python, só de max_depth.
+    # A execução é um gerador: run() o consome de uma vez, com IMPRIME e
+    # LEIA direto no Console atual; em run_async() eles viram pedidos
+    # atendidos por um AsyncConsole, e o controle volta ao laço de eventos
+    # a cada slice_steps passos.
+    tracer = None  # Tracer instalado (rastreia chamadas e retornos)
+
+    def __init__(self, code, max_depth=DEFAULT_MAX_DEPTH):
+        if max_depth < 1:
+            raise Exception("Profundidade máxima de chamadas deve ser positiva")
+        self.code = code
+        self.globals = [UNDEFINED] * len(code.names)
+        self.max_depth = max_depth
+
+    def run(self):
+        for _ in self.execute(self.code, self.globals, Console.current, 0):
+            pass
+
+    async def run_async(self, console, slice_steps=DEFAULT_SLICE_STEPS):
+        # Execução cooperativa: LEIA e IMPRIME aguardam os fluxos de console
+        # e laços longos cedem a vez a cada slice_steps passos
+        if slice_steps < 1:
+            raise Exception("Passos entre pausas devem ser positivos")
+        steps = self.execute(self.code, self.globals, None, slice_steps)
+        reply = None
+        while True:
+            try:
+                request, value = steps.send(reply)
+            except StopIteration as stop:
+                return stop.value
+            reply = None
+            if request is WRITE_REQUEST:
+                await console.write_line(value)
+            elif request is READ_REQUEST:
+                reply = await console.read_line()
+            else:
+                await asyncio.sleep(0)
+
+    def execute(self, code, values, console, slice_steps):
+        # Gerador. Sem console, IMPRIME e LEIA são entregues como pedidos;
+        # slice_steps 0 nunca pausa.
+        # Tudo o que o laço consulta a cada instrução fica em variáveis
+        # locais. O despacho escolhe primeiro o grupo da instrução pela faixa
+        # do código e depois a compara só com as do grupo: nenhuma instrução
+        # fica atrás de dezenas de comparações.
+        ops = code.ops
+        args = code.args
+        globals_ = self.globals
+        tracer = self.tracer
+        max_depth = self.max_depth
+        undefined = UNDEFINED
+        countdown = slice_steps
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+        # Registros dos chamadores: (code, values, stack, pc, function, memo_key)
+        calls = []
+
+        # Início de cada grupo de instruções (ver compiler.py) e os códigos
+        # do grupo mais executado, também locais
+        jumps_group, calls_group, generic_group, rare_group = JUMP_UNLESS_LOCAL_CONST, LOAD_FUNC, ADD, DECLARE
+        for_next, loop_if_local_const, assign_local_const = FOR_NEXT, LOOP_IF_LOCAL_CONST, ASSIGN_LOCAL_CONST
+        load_local, binary_local_const, load_const = LOAD_LOCAL, BINARY_LOCAL_CONST, LOAD_CONST
+        store_local, assign_local_local, binary_const = STORE_LOCAL, ASSIGN_LOCAL_LOCAL, BINARY_CONST
+        assign_const, binary_local_local, loop_if_local_local = ASSIGN_CONST, BINARY_LOCAL_LOCAL, LOOP_IF_LOCAL_LOCAL
+        assign_local_binary, loop_if_true = ASSIGN_LOCAL_BINARY, LOOP_IF_TRUE
+
+        while True:
+            op = ops[pc]
+            arg = args[pc]
+            pc += 1
+
+            if op < jumps_group:
+                # Laços e variáveis locais
+                if op == for_next:
+                    slot, body = arg
+                    step = stack[-1]
+                    value = values[slot] + step
+                    values[slot] = value
+                    if value <= stack[-2] if step > 0 else value >= stack[-2]:
+                        pc = body
+                        if countdown:
+                            countdown -= 1
+                            if not countdown:
+                                yield PAUSE_REQUEST, None
+                                countdown = slice_steps
+                    else:
+                        del stack[-2:]
+                elif op == loop_if_local_const:
+                    compare, slot, right, body = arg
+                    value = values[slot]
+                    if value is undefined:
+                        raise Exception(f"Variável '{code.names[slot]}' não definida")
+                    if compare(value, right):
+                        pc = body
+                        if countdown:
+                            countdown -= 1
+                            if not countdown:
+                                yield PAUSE_REQUEST, None
+                                countdown = slice_steps
+                elif op == assign_local_const:
+                    function, target, slot, right = arg
+                    value = values[slot]
+                    if value is undefined:
+                        raise Exception(f"Variável '{code.names[slot]}' não definida")
+                    value = function(value, right)
+                    if values[target] is undefined:
+                        raise Exception(f"Variável '{code.names[target]}' não declarada")
+                    values[target] = value
+                elif op == load_local:
+                    value = values[arg]
+                    if value is undefined:
+                        raise Exception(f"Variável '{code.names[arg]}' não definida")
+                    push(value)
+                elif op == binary_local_const:
+                    function, slot, right = arg
+                    value = values[slot]
+                    if value is undefined:
+                        raise Exception(f"Variável '{code.names[slot]}' não definida")
+                    push(function(value, right))
+                elif op == load_const:
+                    push(arg)
+                elif op == store_local:
+                    if values[arg] is undefined:
+                        raise Exception(f"Variável '{code.names[arg]}' não declarada")
+                    values[arg] = pop()
+                elif op == assign_local_local:
+                    function, target, slot, right_slot = arg
+                    value = values[slot]
+                    right = values[right_slot]
+                    if value is undefined or right is undefined:
+                        undefined_slot = slot if value is undefined else right_slot
+                        raise Exception(f"Variável '{code.names[undefined_slot]}' não definida")
+                    value = function(value, right)
+                    if values[target] is undefined:
+                        raise Exception(f"Variável '{code.names[target]}' não declarada")
+                    values[target] = value
+                elif op == binary_const:
+                    function, right = arg
+                    stack[-1] = function(stack[-1], right)
+                elif op == assign_const:
+                    function, target, right = arg
+                    value = function(pop(), right)
+                    if values[target] is undefined:
+                        raise Exception(f"Variável '{code.names[target]}' não declarada")
+                    values[target] = value
+                elif op == assign_local_binary:
+                    # Operandos conferidos na ordem da avaliação da árvore: a, b, c
+                    function, target, slot, inner, inner_slot, right, constant = arg
+                    value = values[slot]
+                    if value is undefined:
+                        raise Exception(f"Variável '{code.names[slot]}' não definida")
+                    inner_value = values[inner_slot]
+                    if inner_value is undefined:
+                        raise Exception(f"Variável '{code.names[inner_slot]}' não definida")
+                    if not constant:
+                        right_slot = right
+                        right = values[right_slot]
+                        if right is undefined:
+                            raise Exception(f"Variável '{code.names[right_slot]}' não definida")
+                    value = function(value, inner(inner_value, right))
+                    if values[target] is undefined:
+                        raise Exception(f"Variável '{code.names[target]}' não declarada")
+                    values[target] = value
+                elif op == binary_local_local:
+                    function, slot, right_slot = arg
+                    value = values[slot]
+                    right = values[right_slot]
+                    if value is undefined or right is undefined:
+                        undefined_slot = slot if value is undefined else right_slot
+                        raise Exception(f"Variável '{code.names[undefined_slot]}' não definida")
+                    push(function(value, right))
+                elif op == loop_if_local_local:
+                    compare, slot, right_slot, body = arg
+                    value = values[slot]
+                    right = values[right_slot]
+                    if value is undefined or right is undefined:
+                        undefined_slot = slot if value is undefined else right_slot
+                        raise Exception(f"Variável '{code.names[undefined_slot]}' não definida")
+                    if compare(value, right):
+                        pc = body
+                        if countdown:
+                            countdown -= 1
+                            if not countdown:
+                                yield PAUSE_REQUEST, None
+                                countdown = slice_steps
+                elif op == loop_if_true:
+                    if pop():
+                        pc = arg
+                        if countdown:
+                            countdown -= 1
+                            if not countdown:
+                                yield PAUSE_REQUEST, None
+                                countdown = slice_steps
+            elif op < calls_group:
+                # Saltos, operações especializadas, textos e vetores
+                if op == JUMP_UNLESS_LOCAL_CONST:
+                    compare, slot, right, target = arg
+                    value = values[slot]
+                    if value is undefined:
+                        raise Exception(f"Variável '{code.names[slot]}' não definida")
+                    if not compare(value, right):
+                        pc = target
+                elif op == ADD_INT:
+                    right = pop()
+                    stack[-1] = stack[-1] + right
+                elif op == JUMP:
+                    pc = arg
+                elif op == JUMP_IF_FALSE:
+                    if not pop():
+                        pc = arg
+                elif op == JUMP_UNLESS_LOCAL_LOCAL:
+                    compare, slot, right_slot, target = arg
+                    value = values[slot]
+                    right = values[right_slot]
+                    if value is undefined or right is undefined:
+                        undefined_slot = slot if value is undefined else right_slot
+                        raise Exception(f"Variável '{code.names[undefined_slot]}' não definida")
+                    if not compare(value, right):
+                        pc = target
+                elif op == APPEND_SIMPLE:
+                    # parts: (slot local, None) ou (None, texto do literal)
+                    depth, slot, parts = arg
+                    frame = values if depth == 0 else globals_
+                    current = frame[slot]
+                    if current is undefined:
+                        names = code.names if depth == 0 else self.code.names
+                        raise Exception(f"Variável '{names[slot]}' não definida")
+                    texts = []
+                    for part_slot, text in parts:
+                        if part_slot is not None:
+                            value = values[part_slot]
+                            if value is undefined:
+                                raise Exception(f"Variável '{code.names[part_slot]}' não definida")
+                            text = f"{value}"
+                        texts.append(text)
+                    if type(current) is StrBuilder:
+                        current.pieces.extend(texts)
+                    else:
+                        frame[slot] = StrBuilder([f"{current}"] + texts)
+                elif op == APPEND:
+                    depth, slot, count = arg
+                    frame = values if depth == 0 else globals_
+                    texts = [f"{value}" for value in stack[-count:]]
+                    del stack[-count:]
+                    current = frame[slot]
+                    if type(current) is StrBuilder:
+                        current.pieces.extend(texts)
+                    elif current is undefined:
+                        names = code.names if depth == 0 else self.code.names
+                        raise Exception(f"Variável '{names[slot]}' não definida")
+                    else:
+                        frame[slot] = StrBuilder([f"{current}"] + texts)
+                elif op == CONCAT:
+                    right = pop()
+                    stack[-1] = f"{stack[-1]}{right}"
+                elif op == LOAD_BUILDER:
+                    depth, slot = arg
+                    frame = values if depth == 0 else globals_
+                    value = frame[slot]
+                    if type(value) is StrBuilder:
+                        value = frame[slot] = ''.join(value.pieces)
+                    elif value is undefined:
+                        names = code.names if depth == 0 else self.code.names
+                        raise Exception(f"Variável '{names[slot]}' não definida")
+                    push(value)
+                elif op == LOAD_INDEX:
+                    depth, slot = arg
+                    names = code.names if depth == 0 else self.code.names
+                    items = array_value((values if depth == 0 else globals_)[slot], names[slot])
+                    index = stack[-1]
+                    if type(index) is not int or not 0 <= index < len(items):
+                        check_index(items, index, names[slot])
+                    stack[-1] = items[index]
+                elif op == STORE_INDEX:
+                    depth, slot = arg
+                    names = code.names if depth == 0 else self.code.names
+                    value = pop()
+                    index = pop()
+                    store_element(array_value((values if depth == 0 else globals_)[slot], names[slot]),
+                                  index, value, names[slot])
+                elif op == POP:
+                    pop()
+                elif op == LOAD_CACHED:
+                    slot, done_pc = arg
+                    value = values[slot]
+                    if value is not undefined:
+                        push(value)
+                        pc = done_pc
+            elif op < generic_group:
+                # Chamadas, variáveis globais, entrada e saída
+                if op == LOAD_FUNC:
+                    # arg = [depth, slot, argc, última função conferida aqui]
+                    depth, slot, argc, checked = arg
+                    function = values[slot] if depth == 0 else globals_[slot]
+                    if function is not checked:
+                        names = code.names if depth == 0 else self.code.names
+                        if function is undefined:
+                            raise Exception(f"Função '{names[slot]}' não definida")
+                        if not isinstance(function, Function):
+                            raise Exception(f"'{names[slot]}' não é uma função")
+                        if argc != len(function.param_slots):
+                            raise Exception("Número incorreto de argumentos")
+                        arg[3] = function
+                    push(function)
+                elif op == CALL:
+                    function = stack[-arg - 1]
+                    call_args = stack[len(stack) - arg:]
+                    del stack[-arg - 1:]
+                    memo = function.memo
+                    key = None if memo is None else memo.key(call_args)
+                    if key is not None:
+                        found, value = memo.lookup(key)
+                        if found:
+                            push(value)
+                            continue
+                    if len(calls) >= max_depth:
+                        raise Exception("Recursão profunda demais")
+                    padding = function.padding
+                    if padding is not None:
+                        local_values = call_args + padding
+                    else:
+                        local_values = [undefined] * function.frame_size
+                        for param_slot, value in zip(function.param_slots, call_args):
+                            local_values[param_slot] = value
+                    if function.shadows:
+                        bind_shadows(function.shadows, local_values, globals_)
+                    if tracer is not None:
+                        tracer.enter(function)
+                    calls.append((code, values, stack, pc, function, key))
+                    code = function.code
+                    ops = code.ops
+                    args = code.args
+                    values = local_values
+                    stack = []
+                    push = stack.append
+                    pop = stack.pop
+                    pc = 0
+                    if countdown:
+                        countdown -= 1
+                        if not countdown:
+                            yield PAUSE_REQUEST, None
+                            countdown = slice_steps
+                elif op == RETURN or op == RETURN_NONE:
+                    if not calls:
+                        if op == RETURN:
+                            raise Exception("RETORNA fora de função")
+                        return None
+                    value = pop() if op == RETURN else None
+                    code, values, stack, pc, function, key = calls.pop()
+                    ops = code.ops
+                    args = code.args
+                    push = stack.append
+                    pop = stack.pop
+                    if key is not None:
+                        function.memo.store(key, value)
+                    if tracer is not None:
+                        tracer.leave(function, value)
+                    push(value)
+                elif op == LOAD_GLOBAL:
+                    value = globals_[arg]
+                    if value is undefined:
+                        raise Exception(f"Variável '{self.code.names[arg]}' não definida")
+                    push(value)
+                elif op == STORE_GLOBAL:
+                    if globals_[arg] is undefined:
+                        raise Exception(f"Variável '{self.code.names[arg]}' não declarada")
+                    globals_[arg] = pop()
+                elif op == PRINT:
+                    if console is not None:
+                        console.write_line(pop())
+                    else:
+                        yield WRITE_REQUEST, pop()
+                elif op == READ_INT or op == READ_STR:
+                    if console is not None:
+                        value = console.read_line()
+                    else:
+                        value = yield READ_REQUEST, None
+                    depth, slot = arg
+                    frame = values if depth == 0 else globals_
+                    if frame[slot] is undefined:
+                        names = code.names if depth == 0 else self.code.names
+                        raise Exception(f"Variável '{names[slot]}' não definida")
+                    frame[slot] = int(value) if op == READ_INT else value
+                elif op == READ:
+                    if console is not None:
+                        value = console.read_line()
+                    else:
+                        value = yield READ_REQUEST, None
+                    depth, slot, var_type = arg
+                    frame = values if depth == 0 else globals_
+                    if frame[slot] is undefined:
+                        names = code.names if depth == 0 else self.code.names
+                        raise Exception(f"Variável '{names[slot]}' não definida")
+                    if var_type in ('INT', 'BOOL'):
+                        value = int(value)
+                    frame[slot] = value
+            elif op < rare_group:
+                # Operações genéricas (código sem verificação de tipos)
+                if op == ADD:
+                    right = pop()
+                    left = stack[-1]
+                    if isinstance(left, str) or isinstance(right, str):
+                        stack[-1] = str(left) + str(right)
+                    else:
+                        stack[-1] = left + right
+                elif op == SUB:
+                    right = pop()
+                    stack[-1] = stack[-1] - right
+                elif op == MUL:
+                    right = pop()
+                    stack[-1] = stack[-1] * right
+                elif op == CMP_LT:
+                    right = pop()
+                    stack[-1] = int(stack[-1] < right)
+                elif op == CMP_LE:
+                    right = pop()
+                    stack[-1] = int(stack[-1] <= right)
+                elif op == CMP_GT:
+                    right = pop()
+                    stack[-1] = int(stack[-1] > right)
+                elif op == CMP_GE:
+                    right = pop()
+                    stack[-1] = int(stack[-1] >= right)
+                elif op == CMP_EQ:
+                    right = pop()
+                    stack[-1] = int(stack[-1] == right)
+                elif op == CMP_NE:
+                    right = pop()
+                    stack[-1] = int(stack[-1] != right)
+                elif op == DIV:
+                    right = pop()
+                    if right == 0:
+                        raise Exception("Erro: Divisão por zero")
+                    stack[-1] = stack[-1] / right
+                elif op == NEG:
+                    stack[-1] = -stack[-1]
+                elif op == NOT:
+                    stack[-1] = int(not stack[-1])
+                elif op == POS:
+                    stack[-1] = +stack[-1]
+            else:
+                # Instruções executadas poucas vezes
+                if op == DECLARE:
+                    values[arg] = pop()
+                elif op == FOR_PREP:
+                    # Pilha: [..., início, fim, passo] -> [..., fim, passo]
+                    slot, exit_pc = arg
+                    value = stack.pop(-3)
+                    values[slot] = value
+                    if not (value <= stack[-2] if stack[-1] > 0 else value >= stack[-2]):
+                        del stack[-2:]
+                        pc = exit_pc
+                elif op == STORE_CACHED:
+                    values[arg] = stack[-1]
+                elif op == CLEAR_LOCAL:
+                    values[arg] = undefined
+                elif op == MAKE_FUNCTION:
+                    slot, name, func_type, param_slots, frame_size, function_code, memo, shadows = arg
+                    globals_[slot] = Function(name, func_type, param_slots, frame_size, function_code, memo, shadows)
+                elif op == CLOSED_FORM:
+                    node, exit_pc = arg
+                    if node.closed_form(self.frame_view(values)):
+                        pc = exit_pc
+                elif op == NEW_ARRAY:
+                    stack[-1] = new_array(arg, stack[-1])
+                elif op == ARRAY_OP:
+                    name, argc = arg
+                    array_args = stack[len(stack) - argc:]
+                    del stack[-argc:]
+                    push(array_operation(name, array_args))
+                else:
+                    raise Exception(f"Instrução desconhecida: {op}")
+
+    def frame_view(self, values):
+        # Frame da AST sobre as listas da VM, para os nós que avaliam
+        # expressões diretamente (laços em forma fechada)
+        global_frame = Frame(0)
+        global_frame.values = self.globals
+        if values is self.globals:
+            return global_frame
+        frame = Frame(0, global_frame)
+        frame.values = values
+        return frame